@@ -1,72 +1,128 @@
-import itertools
+from functools import lru_cache
+
+import altair as alt
 import numpy as np
 import pandas as pd
-import seaborn as sns
-import matplotlib.pyplot as plt
 import streamlit as st
 
+from models.rests import RestMetrics, matriz_descansos
+
+# Paletas de seaborn/matplotlib -> esquemas de Vega
+_ESQUEMAS = {
+    "PuBuGn": "purplebluegreen",
+    "OrRd": "orangered",
+    "YlOrRd": "yelloworangered",
+    "Blues": "blues",
+    "Purples": "purples",
+    "Reds": "reds",
+}
+
 
 def get_unique_players(fixture):
     """Devuelve lista ordenada de jugadores únicos del fixture."""
-    return sorted({p for r in fixture for m in r["partidos"] for p in (m["pareja1"] + m["pareja2"])})
+    return sorted({p for m in fixture.partidos for p in m.jugadores})
 
 
-def build_matrices(fixture, players):
-    matrix_parejas = pd.DataFrame(0, index=players, columns=players)
-    matrix_enfrentamientos = pd.DataFrame(0, index=players, columns=players)
-
-    for ronda in fixture:
-        for partido in ronda["partidos"]:
-            # IMPORTANTE: Asegúrate de que extraes las listas de jugadores
-            p1 = partido["pareja1"] # ['Jugador 1', 'Jugador 2']
-            p2 = partido["pareja2"] # ['Jugador 3', 'Jugador 4']
-
-            # Compañeros (P1)
-            matrix_parejas.loc[p1[0], p1[1]] += 1
-            matrix_parejas.loc[p1[1], p1[0]] += 1
-            # Compañeros (P2)
-            matrix_parejas.loc[p2[0], p2[1]] += 1
-            matrix_parejas.loc[p2[1], p2[0]] += 1
-
-            # Enfrentamientos
-            for a in p1:
-                for b in p2:
-                    matrix_enfrentamientos.loc[a, b] += 1
-                    matrix_enfrentamientos.loc[b, a] += 1
+# Columnas de la matriz de índices: pareja1 = (0, 1), pareja2 = (2, 3)
+_COMPANEROS = ((0, 1), (1, 0), (2, 3), (3, 2))
+_RIVALES = tuple((a, b) for a in (0, 1) for b in (2, 3)) + tuple((b, a) for a in (0, 1) for b in (2, 3))
+
+
+def _indices_partidos(fixture, players):
+    """
+    Matriz (partidos x 4) con la posición de cada jugador en ``players``
+    (-1 si no está), para acumular con ``np.add.at`` en vez de ``.loc``.
+    """
+    posicion = {p: i for i, p in enumerate(players)}
+    plano = [posicion.get(j, -1) for m in fixture.partidos for j in (*m.pareja1, *m.pareja2)]
+    return np.asarray(plano, dtype=np.intp).reshape(-1, 4)
+
 
+def _acumular(shape, filas, columnas, combinaciones):
+    conteo = np.zeros(shape, dtype=np.int64)
+    for a, b in combinaciones:
+        f, c = filas[:, a], columnas[:, b]
+        validos = (f >= 0) & (c >= 0)
+        np.add.at(conteo, (f[validos], c[validos]), 1)
+    return conteo
+
+
+def _build_matrices(fixture, players):
+    idx = _indices_partidos(fixture, players)
+    n = len(players)
+    matrix_parejas = pd.DataFrame(_acumular((n, n), idx, idx, _COMPANEROS), index=players, columns=players)
+    matrix_enfrentamientos = pd.DataFrame(_acumular((n, n), idx, idx, _RIVALES), index=players, columns=players)
     return matrix_parejas, matrix_enfrentamientos
 
 
+@lru_cache(maxsize=16)
+def _matrices_cacheadas(fixture, players):
+    return _build_matrices(fixture, list(players))
+
+
+def build_matrices(fixture, players):
+    """Matrices de parejas y enfrentamientos; memoizadas por fixture (hash del contenido)."""
+    return _matrices_cacheadas(fixture, tuple(players))
+
+
+def heatmap_chart(matrix, title, cmap, cbar_label, triangular=False, x_title=None, y_title=None,
+                  annot=True):
+    """
+    Mapa de calor como gráfico Vega-Lite (se dibuja en el navegador).
+    ``triangular`` deja solo la parte superior, como la máscara de seaborn.
+    """
+    valores = np.asarray(matrix)
+    filas, columnas = np.indices(valores.shape)
+    visibles = filas < columnas if triangular else np.ones(valores.shape, dtype=bool)
+    index = [str(v) for v in matrix.index]
+    cols = [str(v) for v in matrix.columns]
+    datos = pd.DataFrame({
+        "fila": np.asarray(index, dtype=object)[filas[visibles]],
+        "columna": np.asarray(cols, dtype=object)[columnas[visibles]],
+        "valor": valores[visibles],
+    })
+    base = alt.Chart(datos, title=title).encode(
+        x=alt.X("columna:N", sort=cols, title=x_title),
+        y=alt.Y("fila:N", sort=index, title=y_title),
+    )
+    chart = base.mark_rect().encode(
+        color=alt.Color("valor:Q", title=cbar_label, scale=alt.Scale(scheme=_ESQUEMAS.get(cmap, cmap))),
+        tooltip=[alt.Tooltip("fila:N", title=y_title or ""), alt.Tooltip("columna:N", title=x_title or ""),
+                 alt.Tooltip("valor:Q", title=cbar_label)],
+    )
+    if annot:
+        chart = chart + base.mark_text(fontSize=11).encode(text="valor:Q")
+    return chart
+
+
 def plot_heatmap(matrix, title, cmap, cbar_label):
-    """Genera y muestra un mapa de calor triangular superior."""
-    mask = np.tril(np.ones_like(matrix, dtype=bool))
-    fig, ax = plt.subplots(figsize=(8, 6))
-    sns.heatmap(matrix, mask=mask, annot=True, fmt="d", cmap=cmap, ax=ax,
-                cbar_kws={"label": cbar_label})
-    plt.title(title)
-    st.pyplot(fig)
+    """Muestra un mapa de calor triangular superior."""
+    st.altair_chart(heatmap_chart(matrix, title, cmap, cbar_label, triangular=True),
+                    use_container_width=True)
+
+
+@lru_cache(maxsize=16)
+def _matriz_descansos(fixture, players):
+    matriz = matriz_descansos(fixture, players)
+    df_desc = pd.DataFrame(matriz.astype(np.int8), index=list(players), columns=[r.ronda for r in fixture])
+    return df_desc, RestMetrics.desde_matriz(matriz, players)
 
 
 def analyze_descansos(fixture, players):
     """Analiza descansos consecutivos y genera mapa de calor."""
-    descanso_data = []
-    for p in players:
-        pattern = [1 if p in r["descansan"] else 0 for r in fixture]
-        descanso_data.append(pattern)
-
-    df_desc = pd.DataFrame(descanso_data, index=players)
-    df_desc["consec_descansos"] = df_desc.apply(
-        lambda x: max((sum(1 for _ in g) for k, g in itertools.groupby(x) if k == 1), default=0), axis=1
-    )
+    df_desc, metricas = _matriz_descansos(fixture, tuple(players))
 
-    st.dataframe(df_desc[["consec_descansos"]].rename(columns={"consec_descansos": "Descansos consecutivos"}))
+    st.dataframe(pd.DataFrame({
+        "Descansos": metricas.descansos,
+        "Descansos consecutivos": metricas.max_consecutivos,
+        "Mín. rondas entre descansos": metricas.hueco_minimo,
+    }, index=df_desc.index))
+    st.caption(f"Desbalance de descansos: {metricas.desbalance} · "
+               f"Descansos pegados: {metricas.pegados}")
 
-    fig, ax = plt.subplots(figsize=(8, 4))
-    sns.heatmap(pd.DataFrame(descanso_data, index=players), cmap="YlOrRd", cbar=False, ax=ax)
-    plt.title("Mapa de descansos por ronda (1 = descanso)")
-    plt.xlabel("Ronda")
-    plt.ylabel("Jugador")
-    st.pyplot(fig)
+    st.altair_chart(heatmap_chart(df_desc, "Mapa de descansos por ronda (1 = descanso)", "YlOrRd",
+                                  "Descanso", x_title="Ronda", y_title="Jugador", annot=False),
+                    use_container_width=True)
 
 
 def analyze_algorithm_results(fixture):
@@ -87,81 +143,43 @@ def analyze_algorithm_results(fixture):
 
 
 def heatmap_parejas_mixtas(fixture, male_players, female_players):
-    # Crear matriz mujer vs hombre
-    matrix = pd.DataFrame(0, index=female_players, columns=male_players)
-
-    for ronda in fixture:
-        for partido in ronda["partidos"]:
-            p1a, p1b = partido["pareja1"]
-            p2a, p2b = partido["pareja2"]
-
-            # --- Pareja 1 ---
-            # Detectar quién es mujer y quién es hombre
-            for f, m in [(p1a, p1b), (p1b, p1a)]:
-                if f in female_players and m in male_players:
-                    matrix.loc[f, m] += 1
-
-            # --- Pareja 2 ---
-            for f, m in [(p2a, p2b), (p2b, p2a)]:
-                if f in female_players and m in male_players:
-                    matrix.loc[f, m] += 1
+    # Crear matriz mujer vs hombre; las combinaciones que no son mujer-hombre quedan en -1 y se descartan
+    conteo = _acumular(
+        (len(female_players), len(male_players)),
+        _indices_partidos(fixture, female_players),
+        _indices_partidos(fixture, male_players),
+        _COMPANEROS,
+    )
+    matrix = pd.DataFrame(conteo, index=female_players, columns=male_players)
 
     # === Heatmap ===
-    fig, ax = plt.subplots(figsize=(6, 4))
-    sns.heatmap(matrix, annot=True, cmap="Purples", linewidths=.5, ax=ax)
-    ax.set_title("Combinaciones de Parejas Mixtas (Mujer con Hombre)")
+    chart = heatmap_chart(matrix, "Combinaciones de Parejas Mixtas (Mujer con Hombre)", "Purples",
+                          "Veces como pareja")
 
-    return matrix, fig
+    return matrix, chart
 
 
 def heatmap_descansos_por_ronda(fixture, all_players):
     # Matriz jugadores x rondas
     matrix = pd.DataFrame(
-        0,
+        matriz_descansos(fixture, all_players).astype(np.int64),
         index=all_players,
-        columns=[f"Ronda {r['ronda']}" for r in fixture]
+        columns=[f"Ronda {r.ronda}" for r in fixture]
     )
 
-    # Rellenar descansos
-    for ronda in fixture:
-        col = f"Ronda {ronda['ronda']}"
-        for p in ronda["descansan"]:
-            if p in matrix.index:
-                matrix.loc[p, col] = 1
-
-    fig, ax = plt.subplots(figsize=(10, 6))
-    sns.heatmap(matrix, cmap="Reds", linewidths=.5, ax=ax)
-    ax.set_title("Descansos por Ronda (1 = descansó)")
-    ax.set_xlabel("Ronda")
-    ax.set_ylabel("Jugador")
-
-    return matrix, fig
+    chart = heatmap_chart(matrix, "Descansos por Ronda (1 = descansó)", "Reds", "Descanso",
+                          x_title="Ronda", y_title="Jugador", annot=False)
 
-import itertools
+    return matrix, chart
 
 def heatmap_enfrentamientos(fixture, all_players):
-    # Matriz base
-    matrix = pd.DataFrame(0, index=all_players, columns=all_players)
-
     # Contabilizar enfrentamientos
-    for ronda in fixture:
-        for partido in ronda["partidos"]:
-            p1 = partido["pareja1"]
-            p2 = partido["pareja2"]
-
-            for a in p1:
-                for b in p2:
-                    matrix.loc[a, b] += 1
-                    matrix.loc[b, a] += 1
+    idx = _indices_partidos(fixture, all_players)
+    n = len(all_players)
+    matrix = pd.DataFrame(_acumular((n, n), idx, idx, _RIVALES), index=all_players, columns=all_players)
 
     # Mostrar solo parte superior para evitar duplicados
-    mask = np.tril(np.ones_like(matrix, dtype=bool))
-
-    fig, ax = plt.subplots(figsize=(10, 8))
-    sns.heatmap(matrix, mask=mask, annot=True, cmap="Blues",
-                linewidths=.5, ax=ax, square=True)
-    ax.set_title("Enfrentamientos entre Jugadores")
-    ax.set_xlabel("Jugador")
-    ax.set_ylabel("Jugador")
+    chart = heatmap_chart(matrix, "Enfrentamientos entre Jugadores", "Blues", "Enfrentamientos",
+                          triangular=True, x_title="Jugador", y_title="Jugador")
 
-    return matrix, fig
+    return matrix, chart
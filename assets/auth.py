@@ -1,6 +1,48 @@
+"""Login con bcrypt y sesiones firmadas.
+
+Verificar la contraseña con bcrypt es lento a propósito, así que se hace una
+sola vez: al ingresar se emite un token ``usuario.vencimiento.firma`` (HMAC
+SHA-256) que se guarda en la cookie ``sesion`` del navegador, nunca en la URL
+(los links que se comparten, como el del marcador, no lo llevan). Una sesión
+nueva (recarga, reconexión después de un corte de Wi-Fi, otra pestaña) valida
+el token con un HMAC y entra sin volver a pedir la contraseña. La firma incluye
+el hash guardado del usuario: cambiarle la contraseña invalida sus tokens.
+
+La tabla de usuarios se lee de ``st.secrets`` una vez por versión del archivo de
+secrets (se vuelve a leer si cambia su fecha de modificación). Los intentos
+fallidos se cuentan por usuario y cliente: después de ``INTENTOS_LIBRES`` cada
+nuevo intento espera el doble que el anterior (hasta ``RETARDO_MAX``), así que
+nadie puede bloquearle la cuenta a otro desde su propio dispositivo. La
+dirección del cliente sale de ``X-Forwarded-For`` solo si ``auth.proxy_confiable``
+está activado en los secrets; sin proxy ese encabezado lo elige el cliente.
+"""
+import base64
+import hashlib
+import hmac
+import math
+import os
+import secrets
+import threading
+import time
+from typing import Optional
+
 import streamlit as st
 import bcrypt
 
+# Duración de una sesión firmada (una jornada de torneo)
+TOKEN_TTL = 12 * 3600
+# Intentos fallidos sin espera; después la espera se duplica en cada fallo
+INTENTOS_LIBRES = 3
+RETARDO_BASE = 2
+RETARDO_MAX = 15 * 60
+# Registros de intentos que se guardan como máximo (los más viejos se descartan)
+MAX_REGISTROS = 10_000
+
+_COOKIE_SESION = "sesion"
+# Cliente de los intentos cuando no se conoce la dirección: la espera queda por usuario
+_CLIENTE_DESCONOCIDO = "desconocido"
+
+
 def inject_login_css():
     st.markdown(
         """
@@ -24,9 +66,160 @@ def inject_login_css():
     )
 
 
+def _version_secrets() -> tuple:
+    """Fechas de modificación de los archivos de secrets: cambian si se edita un usuario."""
+    return tuple(os.path.getmtime(ruta) if os.path.exists(ruta) else 0.0
+                 for ruta in st.get_option("secrets.files"))
+
+
+@st.cache_resource(show_spinner=False, max_entries=1)
+def _usuarios_de(version: tuple):
+    return {usuario: hash_.encode() for usuario, hash_ in st.secrets["auth"]["users"].items()}
+
+
+def _usuarios():
+    """Usuario -> hash bcrypt, leído de los secrets una vez por versión del archivo."""
+    return _usuarios_de(_version_secrets())
+
+
+@st.cache_resource(show_spinner=False, max_entries=1)
+def _admins_de(version: tuple):
+    return frozenset(st.secrets["auth"].get("admins", ()))
+
+
+def _admins():
+    """Usuarios con acceso a las herramientas de diagnóstico (``auth.admins`` en los secrets)."""
+    return _admins_de(_version_secrets())
+
+
+def es_admin() -> bool:
+    return st.session_state.get("user") in _admins()
+
+
+@st.cache_resource(show_spinner=False)
+def _clave_firma() -> bytes:
+    """
+    Clave del HMAC: ``auth.token_secret`` de los secrets, o una aleatoria por
+    proceso (en ese caso las sesiones no sobreviven a un reinicio del servidor).
+    """
+    clave = st.secrets["auth"].get("token_secret")
+    return clave.encode() if clave else secrets.token_bytes(32)
+
+
+@st.cache_resource(show_spinner=False)
+def _intentos():
+    """(usuario, cliente) -> (fallos, último fallo); compartido entre sesiones, del más viejo al más nuevo."""
+    return {}, threading.Lock()
+
+
+def _b64(datos: bytes) -> str:
+    return base64.urlsafe_b64encode(datos).rstrip(b"=").decode()
+
+
+def _firma(usuario: str, vence: int) -> str:
+    mensaje = f"{usuario}.{vence}.".encode() + _usuarios()[usuario]
+    return _b64(hmac.new(_clave_firma(), mensaje, hashlib.sha256).digest())
+
+
+def emitir_token(usuario: str, ttl: int = TOKEN_TTL) -> str:
+    vence = int(time.time()) + ttl
+    return f"{_b64(usuario.encode())}.{vence}.{_firma(usuario, vence)}"
+
+
+def verificar_token(token) -> Optional[str]:
+    """Usuario del token si la firma es válida y no venció; si no, None."""
+    try:
+        usuario_b64, vence, firma = token.split(".")
+        usuario = base64.urlsafe_b64decode(usuario_b64 + "=" * (-len(usuario_b64) % 4)).decode()
+        vence = int(vence)
+    except (AttributeError, ValueError):
+        return None
+    if vence < time.time() or usuario not in _usuarios():
+        return None
+    return usuario if hmac.compare_digest(firma, _firma(usuario, vence)) else None
+
+
+def _cliente() -> str:
+    """Dirección del dispositivo que intenta ingresar."""
+    if st.secrets["auth"].get("proxy_confiable"):
+        # La última entrada es la que agregó el proxy; las anteriores las manda el cliente
+        reenviada = st.context.headers.get("X-Forwarded-For", "")
+        return reenviada.split(",")[-1].strip() or _CLIENTE_DESCONOCIDO
+    ip = st.context.ip_address
+    return ip if isinstance(ip, str) and ip else _CLIENTE_DESCONOCIDO
+
+
+def _retardo(fallos: int) -> float:
+    if fallos < INTENTOS_LIBRES:
+        return 0
+    return min(RETARDO_BASE * 2 ** (fallos - INTENTOS_LIBRES), RETARDO_MAX)
+
+
+def _podar(registros: dict, ahora: float):
+    # Se recorren del más viejo al más nuevo: el primero vigente corta la poda
+    for clave, (_, ultimo) in list(registros.items()):
+        if ahora - ultimo < RETARDO_MAX:
+            break
+        del registros[clave]
+    while len(registros) > MAX_REGISTROS:
+        del registros[next(iter(registros))]
+
+
+def _espera(usuario: str, cliente: str) -> int:
+    """Segundos que faltan para poder reintentar desde este cliente (0 si no hay espera)."""
+    registros, lock = _intentos()
+    ahora = time.time()
+    with lock:
+        _podar(registros, ahora)
+        fallos, ultimo = registros.get((usuario, cliente), (0, 0.0))
+    return max(0, math.ceil(ultimo + _retardo(fallos) - ahora))
+
+
+def _registrar_fallo(usuario: str, cliente: str):
+    registros, lock = _intentos()
+    ahora = time.time()
+    with lock:
+        fallos, _ = registros.pop((usuario, cliente), (0, 0.0))
+        registros[(usuario, cliente)] = (fallos + 1, ahora)
+        _podar(registros, ahora)
+
+
+def _olvidar_fallos(usuario: str, cliente: str):
+    registros, lock = _intentos()
+    with lock:
+        registros.pop((usuario, cliente), None)
+
+
+def _iniciar_sesion(usuario: str):
+    st.session_state.authenticated = True
+    st.session_state.user = usuario
+
+
+def _guardar_cookie(token: str):
+    """Deja el token en una cookie del navegador (la lee ``st.context.cookies`` al reconectar)."""
+    st.html(
+        f"""<script>
+        document.cookie = "{_COOKIE_SESION}={token}; path=/; max-age={TOKEN_TTL}; SameSite=Strict"
+            + (location.protocol === "https:" ? "; Secure" : "");
+        </script>""",
+        unsafe_allow_javascript=True,
+    )
+
+
 def check_login():
     if st.session_state.get("authenticated"):
+        # El script de la cookie se dibuja en la corrida siguiente al login (st.rerun corta la actual)
+        token = st.session_state.pop("token_pendiente", None)
+        if token is not None:
+            _guardar_cookie(token)
         return True
+
+    # Reconexión: el token de la cookie alcanza, sin bcrypt
+    usuario = verificar_token(st.context.cookies.get(_COOKIE_SESION))
+    if usuario is not None:
+        _iniciar_sesion(usuario)
+        return True
+
     inject_login_css()
 
     st.title("Acceso restringido")
@@ -35,15 +228,21 @@ def check_login():
     password = st.text_input("Contraseña", type="password")
 
     if st.button("Ingresar"):
-        users = st.secrets["auth"]["users"]
+        cliente = _cliente()
+        espera = _espera(username, cliente)
+        if espera:
+            cuanto = f"{espera} s" if espera < 60 else f"{(espera + 59) // 60} min"
+            st.error(f"Demasiados intentos fallidos. Probá de nuevo en {cuanto}.")
+            return False
 
-        if username in users:
-            stored_hash = users[username].encode()
-            if bcrypt.checkpw(password.encode(), stored_hash):
-                st.session_state.authenticated = True
-                st.session_state.user = username
-                st.rerun()
+        users = _usuarios()
+        if username in users and bcrypt.checkpw(password.encode(), users[username]):
+            _olvidar_fallos(username, cliente)
+            _iniciar_sesion(username)
+            st.session_state.token_pendiente = emitir_token(username)
+            st.rerun()
 
+        _registrar_fallo(username, cliente)
         st.error("Credenciales incorrectas")
 
     return False
@@ -0,0 +1,47 @@
+"""Botones de descarga del fixture y los resultados (CSV, Excel, PDF).
+
+El archivo se genera recién al hacer clic (``download_button`` con un callable)
+y queda cacheado por torneo, contenido de los resultados (``ResultsStore.huella``)
+y formato: descargarlo de nuevo sin cambios en los puntajes no vuelve a
+generarlo, y dos dispositivos del mismo torneo con puntajes distintos nunca
+reciben el archivo del otro.
+"""
+from functools import partial
+
+import streamlit as st
+
+from models.export import FORMATOS
+
+
+@st.cache_data(max_entries=32, show_spinner=False)
+def archivo_exportado(torneo_id, huella, formato, unidad, _resultados):
+    """Bytes del archivo; ``torneo_id`` y ``huella`` son la clave de cache."""
+    exportador = FORMATOS[formato][0]
+    return exportador(_resultados, unidad)
+
+
+def _generar(resultados, formato, unidad):
+    # La huella se calcula al hacer clic: el puntaje puede haber cambiado desde el render
+    return archivo_exportado(resultados.torneo_id, resultados.huella(), formato, unidad, resultados)
+
+
+def botones_exportar(unidad="Puntos"):
+    """Expander con un botón de descarga por formato disponible."""
+    resultados = st.session_state.get("resultados")
+    if resultados is None:
+        return
+    with st.expander("⬇️ Exportar fixture y resultados"):
+        cols = st.columns(len(FORMATOS))
+        for col, (formato, (_, mime, etiqueta)) in zip(cols, FORMATOS.items()):
+            with col:
+                st.download_button(
+                    etiqueta,
+                    data=partial(_generar, resultados, formato, unidad),
+                    file_name=f"fixture_{resultados.torneo_id}.{formato}",
+                    mime=mime,
+                    key=f"exportar_{formato}",
+                    on_click="ignore",
+                    use_container_width=True,
+                )
+        if len(FORMATOS) < 3:
+            st.caption("Para exportar a Excel y PDF instalá openpyxl y fpdf2.")
@@ -0,0 +1,108 @@
+"""Generación de fixtures con caché compartida entre sesiones.
+
+La clave es un hash del contenido: modalidad, versión del motor, lista ordenada
+de jugadores, cantidad de canchas y semilla. Cada torneo nuevo sortea su
+semilla (``semilla_sorteo``) y la guarda en la sesión y en la configuración
+publicada, así que los dispositivos que se unen o lo retoman obtienen el mismo
+fixture sin recalcularlo, y "Volver y Reiniciar" sortea uno distinto. Cambiar un
+nombre genera uno nuevo y cambiar los puntos por partido no.
+"""
+import hashlib
+import json
+import random
+import secrets
+import threading
+
+import streamlit as st
+
+from assets.helper_funcs import generar_fixture_parejas
+from models.AllvsAll_Random_modelv4 import CompleteAmericanoTournament
+from models.AmericanoMixto.AllvsAll_MixtoV2 import generar_torneo_mixto
+from models.AmericanoParejas.AmericanoParejasv1 import FixedPairsTournament
+from models.profiling import contar, span
+
+TODOS_CONTRA_TODOS = "todos_contra_todos"
+PAREJAS_FIJAS = "parejas_fijas"
+MIXTO = "mixto"
+SETS = "sets"
+
+# Subir la versión al cambiar un motor invalida los fixtures cacheados
+VERSION_MOTOR = {
+    TODOS_CONTRA_TODOS: "americano-v4",
+    PAREJAS_FIJAS: "parejas-fijas-v1",
+    MIXTO: "mixto-v2",
+    SETS: "sets-v1",
+}
+# Semilla de los torneos publicados antes de que cada uno sorteara la suya
+SEED_DEFAULT = 42
+
+# Los motores usan el módulo random global: se genera de a uno por proceso
+_RANDOM_LOCK = threading.Lock()
+
+
+def semilla_sorteo() -> int:
+    """Semilla del torneo de esta sesión; se sortea una nueva si no hay ninguna."""
+    if "semilla" not in st.session_state:
+        st.session_state.semilla = secrets.randbelow(2 ** 31)
+    return st.session_state.semilla
+
+
+def fixture_key(modo, jugadores, num_canchas, seed=SEED_DEFAULT) -> str:
+    """Hash de la configuración que determina el fixture."""
+    if isinstance(jugadores, dict):
+        jugadores = {k: list(v) for k, v in jugadores.items()}
+    else:
+        jugadores = list(jugadores)
+    payload = json.dumps([modo, VERSION_MOTOR[modo], jugadores, num_canchas, seed],
+                         ensure_ascii=False, sort_keys=True)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+
+
+def _sortear(jugadores) -> list:
+    # Con pocos jugadores los motores son deterministas: el orden en que reciben
+    # a los participantes (sacado de la semilla) es lo que cambia el sorteo
+    return random.sample(list(jugadores), len(jugadores))
+
+
+def _generar(modo, jugadores, num_canchas):
+    if modo == TODOS_CONTRA_TODOS:
+        tournament = CompleteAmericanoTournament(_sortear(jugadores), num_canchas)
+        with span("motor.generate_tournament"):
+            schedule, stats = tournament.generate_tournament()
+        with span("motor.format_for_streamlit"):
+            return tournament.format_for_streamlit(schedule, stats)
+    if modo == PAREJAS_FIJAS:
+        with span("motor.parejas_fijas"):
+            return FixedPairsTournament(_sortear(jugadores), num_canchas).generate_schedule()
+    if modo == MIXTO:
+        # Los puntos por partido no afectan el fixture
+        with span("motor.mixto"):
+            return generar_torneo_mixto(_sortear(jugadores["hombres"]), _sortear(jugadores["mujeres"]),
+                                       num_canchas, 0)
+    if modo == SETS:
+        with span("motor.sets"):
+            return {"fixture": generar_fixture_parejas(_sortear(jugadores), num_canchas)}
+    raise ValueError(f"Modalidad desconocida: {modo}")
+
+
+@st.cache_resource(max_entries=64, show_spinner=False)
+def _fixture_cacheado(key, _modo, _jugadores, _num_canchas, _seed):
+    # Solo la clave se hashea; el resto de los argumentos ya está contenido en ella.
+    # El resultado (Fixture inmutable + resumen) se comparte entre sesiones sin copiarlo.
+    contar("fixture.generados")
+    with _RANDOM_LOCK:
+        estado = random.getstate()
+        random.seed(_seed)
+        try:
+            return _generar(_modo, _jugadores, _num_canchas)
+        finally:
+            random.setstate(estado)
+
+
+def generar_fixture(modo, jugadores, num_canchas, seed=SEED_DEFAULT):
+    """
+    Devuelve ``(key, out)``: la clave de contenido y la salida del motor
+    (``{"fixture": Fixture, ...}``), calculada una sola vez por configuración.
+    """
+    key = fixture_key(modo, jugadores, num_canchas, seed)
+    return key, _fixture_cacheado(key, modo, jugadores, num_canchas, seed)
@@ -1,7 +1,8 @@
 import streamlit as st
 import itertools,random
 import pandas as pd
-from typing import List, Dict, Tuple
+from models.fixture import Fixture, MODO_PAREJAS
+from assets.torneo_compartido import escribir_resultado
 
 #Streamlit Functions
 def initialize_vars(defaults:dict):
@@ -12,7 +13,7 @@ def initialize_vars(defaults:dict):
             pass
 
 #Tournament Logic Functions
-def generar_fixture_parejas(parejas, num_canchas):
+def generar_fixture_parejas(parejas, num_canchas) -> Fixture:
     """Genera las rondas con máximo num_canchas partidos por ronda.Parejas fijas previamente establecidas"""
     enfrentamientos = list(itertools.combinations(parejas, 2))
     random.shuffle(enfrentamientos)
@@ -31,79 +32,179 @@ def generar_fixture_parejas(parejas, num_canchas):
                     disponibles.remove(p2)
                     pendientes.remove(match)
                     break
-        rondas.append(ronda)
-    return rondas
-
-def calcular_ranking_parejas(parejas: List[str], resultados: Dict[Tuple[str,str], Tuple[int,int]]) -> pd.DataFrame:
-    """Calcula el ranking acumulado según los resultados ingresados."""
-    
-    # 1. Uniformizar los nombres de las parejas al formato usado en el fixture (' & ')
-    # Si las parejas vienen como ['serg-mari', ...], se convierten a ['serg & mari', ...]
-    nombres_uniformes = [
-        p.replace("-", " & ") if "-" in p else p
-        for p in parejas
-    ]
-    
-    # 2. Inicializar el diccionario de puntajes con los nombres uniformes
-    puntajes = {p: 0 for p in nombres_uniformes}
-    
-    # 3. Calcular los puntajes (ahora las claves p1 y p2 coincidirán)
-    for (p1, p2), (r1, r2) in resultados.items():
-        # Aquí, p1 y p2 ya están en el formato 'serg & mari', y la clave existe.
-        puntajes[p1] += r1
-        puntajes[p2] += r2
-        
-    # 4. Generar el ranking
-    ranking = pd.DataFrame(
-        sorted(puntajes.items(), key=lambda x: x[1], reverse=True),
-        columns=["Pareja", "Puntos"]
-    )
-    return ranking
-
-def calcular_ranking_individual(resultados: Dict[Tuple[str, str], Tuple[int, int]], 
-                                fixture: List[Dict] = None) -> pd.DataFrame:
-    """
-    Calcula el ranking individual acumulado según los resultados ingresados.
-    Cada jugador recibe los puntos que su pareja obtuvo en cada partido.
-    Los ayudantes NO suman puntos (verificado con valido_para).
-    """
-    puntajes = {}
-    
-    # Construir mapa de válidos si tenemos fixture
-    validos_map = {}
-    if fixture:
-        for ronda_data in fixture:
-            for partido in ronda_data["partidos"]:
-                pareja1_str = " & ".join(partido["pareja1"])
-                pareja2_str = " & ".join(partido["pareja2"])
-                validos_map[(pareja1_str, pareja2_str)] = partido.get("valido_para", 
-                                                                       partido["pareja1"] + partido["pareja2"])
-
-    for (p1, p2), (r1, r2) in resultados.items():
-        # Separar los nombres de cada jugador en la pareja
-        jugadores_p1 = p1.split(" & ")
-        jugadores_p2 = p2.split(" & ")
-        
-        # Obtener lista de jugadores válidos para este partido
-        validos = validos_map.get((p1, p2), jugadores_p1 + jugadores_p2)
-        
-        # Sumar puntos SOLO a jugadores válidos (no ayudantes)
-        for j in jugadores_p1:
-            if j in validos:
-                puntajes[j] = puntajes.get(j, 0) + r1
-        for j in jugadores_p2:
-            if j in validos:
-                puntajes[j] = puntajes.get(j, 0) + r2
-
-    # Ordenar ranking
-    ranking = pd.DataFrame(
-        sorted(puntajes.items(), key=lambda x: x[1], reverse=True),
-        columns=["Jugador", "Puntos"]
-    )
-    return ranking
+        rondas.append({
+            "partidos": [{"cancha": c_i, "pareja1": p1, "pareja2": p2}
+                         for c_i, (p1, p2) in enumerate(ronda, start=1)],
+            "descansan": [p for p in parejas if p in disponibles],
+        })
+    return Fixture.from_rounds(rondas, parejas, MODO_PAREJAS)
 
 def render_nombre(jugador, ayudantes):
     if jugador in ayudantes:
         return f"{jugador} 🛟"     # Salvavidas
     return jugador
 
+
+#Navegación de rondas
+def _objetivo_partido():
+    """
+    Meta de un partido para ``partido_completo``: los sets a ganar en el torneo
+    por sets, o los puntos totales en los torneos por puntos.
+    """
+    if st.session_state.get("page") == "torneo_sets":
+        return {"sets_partido": st.session_state.get("num_sets")}
+    return {"puntos_partido": st.session_state.get("num_pts")}
+
+def partido_completo(score, puntos_partido=None, sets_partido=None) -> bool:
+    """
+    True si el partido tiene resultado final. Por sets: hay un ganador que llegó
+    a ``sets_partido`` (6-0 cuenta). Por puntos: los dos lados suman los puntos
+    del partido, o ninguno es 0; un solo lado cargado (ej. 9-0) no lo completa.
+    """
+    s1, s2 = score
+    if sets_partido:
+        return s1 != s2 and max(s1, s2) >= sets_partido
+    if puntos_partido and s1 + s2 == puntos_partido:
+        return True
+    return s1 > 0 and s2 > 0
+
+def ronda_completa(ronda, resultados, **objetivo) -> bool:
+    """True si todos los partidos de la ronda tienen resultado final."""
+    return all(partido_completo(resultados.get(m.id), **objetivo) for m in ronda.partidos)
+
+def registrar_avance(match, anterior):
+    """
+    Llamar desde el callback de puntaje. Si el resultado recién cargado completa
+    la ronda en foco, el navegador pasa a la siguiente ronda.
+    """
+    fixture = st.session_state.fixture
+    resultados = st.session_state.resultados
+    objetivo = _objetivo_partido()
+    actual = st.session_state.get("ronda_actual", 0)
+    if st.session_state.get("ver_todas_rondas") or actual >= len(fixture) - 1:
+        return
+    # Solo avanza cuando este partido pasa de incompleto a completo
+    if partido_completo(anterior, **objetivo) or not partido_completo(resultados.get(match.id), **objetivo):
+        return
+    ronda = fixture.rondas[actual]
+    if match.ronda == ronda.ronda and ronda_completa(ronda, resultados, **objetivo):
+        st.session_state.ronda_actual = actual + 1
+        st.session_state.avanzar_ronda = True
+
+def registrar_resultado(match_id, s1, s2):
+    """
+    Camino único de carga de un puntaje: store compartido (con su versión),
+    resultados de la sesión, diferencia en el ledger y avance de ronda.
+    """
+    s1, s2, version = escribir_resultado(match_id, s1, s2)
+    anterior = st.session_state.resultados.set(match_id, s1, s2, version)
+    partido = st.session_state.fixture.partidos[match_id]
+    st.session_state.ledger.apply(partido, anterior, (s1, s2))
+    registrar_avance(partido, anterior)
+
+def _mover_ronda(paso, total):
+    st.session_state.ronda_actual = min(max(st.session_state.ronda_actual + paso, 0), total - 1)
+
+def rondas_a_mostrar(fixture, resultados):
+    """
+    Dibuja el navegador de rondas y devuelve las rondas a renderizar como
+    ``[(numero, ronda), ...]``: solo la ronda en foco, o todas si el usuario
+    activa "Ver todas las rondas".
+    """
+    st.session_state.pop("avanzar_ronda", None)
+    # Torneo nuevo: el navegador vuelve a la primera ronda
+    if st.session_state.get("ronda_torneo") != resultados.torneo_id:
+        st.session_state.ronda_torneo = resultados.torneo_id
+        st.session_state.ronda_actual = 0
+    total = len(fixture)
+    if total == 0:
+        return []
+
+    if st.toggle("Ver todas las rondas", key="ver_todas_rondas"):
+        return list(enumerate(fixture, start=1))
+
+    actual = min(st.session_state.ronda_actual, total - 1)
+    st.session_state.ronda_actual = actual
+    compactar_widgets(fixture, fixture.rondas[actual].ronda)
+    objetivo = _objetivo_partido()
+    completas = sum(ronda_completa(r, resultados, **objetivo) for r in fixture)
+
+    col_prev, col_info, col_next = st.columns([1, 2, 1])
+    with col_prev:
+        st.button("⬅️ Anterior", key="ronda_prev", use_container_width=True,
+                  disabled=actual == 0, on_click=_mover_ronda, args=(-1, total))
+    with col_info:
+        st.markdown(f"<p style='text-align:center; font-weight:600;'>Ronda {actual + 1} de {total}"
+                    f" · {completas} completas</p>", unsafe_allow_html=True)
+    with col_next:
+        st.button("Siguiente ➡️", key="ronda_next", use_container_width=True,
+                  disabled=actual == total - 1, on_click=_mover_ronda, args=(1, total))
+    return [(actual + 1, fixture.rondas[actual])]
+
+def compactar_widgets(fixture, ronda_visible):
+    """
+    Saca de la sesión los puntajes de widgets y las versiones del editor de las
+    rondas que no se muestran: sus valores ya están en ``resultados`` y los
+    inputs se vuelven a crear desde ahí si el usuario vuelve a esa ronda.
+    """
+    versiones = st.session_state.get("version_tabla")
+    if versiones:
+        for ronda in [r for r in versiones if r != ronda_visible]:
+            del versiones[ronda]
+    for ronda in fixture:
+        if ronda.ronda == ronda_visible:
+            continue
+        for match in ronda.partidos:
+            st.session_state.pop(f"score_{match.id}_p1", None)
+            st.session_state.pop(f"score_{match.id}_p2", None)
+
+#Carga rápida: una tabla (st.data_editor) por ronda
+def guardar_tabla_ronda(ronda, key):
+    """Callback del editor: aplica en un solo lote las filas editadas al store y al ledger."""
+    cambios = st.session_state[key]["edited_rows"]
+    for fila, valores in cambios.items():
+        match = ronda.partidos[int(fila)]
+        s1_old, s2_old = st.session_state.resultados.get(match.id)
+        s1 = valores.get("score1", s1_old)
+        s2 = valores.get("score2", s2_old)
+        registrar_resultado(match.id, int(s1 or 0), int(s2 or 0))
+    # Nueva versión del editor: se vuelve a armar desde el store ya actualizado
+    versiones = st.session_state.setdefault("version_tabla", {})
+    versiones[ronda.ronda] = versiones.get(ronda.ronda, 0) + 1
+
+@st.fragment
+def tabla_ronda(ronda, max_valor=None, unidad="Puntos"):
+    """Editor de resultados de una ronda: una fila por cancha y dos columnas de puntaje."""
+    resultados = st.session_state.resultados
+    filas = []
+    for match in ronda.partidos:
+        s1, s2 = resultados.get(match.id)
+        filas.append({
+            "cancha": match.cancha,
+            "pareja1": " & ".join(render_nombre(j, match.ayudantes) for j in match.pareja1),
+            "score1": s1,
+            "score2": s2,
+            "pareja2": " & ".join(render_nombre(j, match.ayudantes) for j in match.pareja2),
+        })
+    version = st.session_state.get("version_tabla", {}).get(ronda.ronda, 0)
+    key = f"tabla_ronda_{ronda.ronda}_{version}"
+    st.data_editor(
+        pd.DataFrame(filas),
+        key=key,
+        hide_index=True,
+        use_container_width=True,
+        disabled=["cancha", "pareja1", "pareja2"],
+        column_config={
+            "cancha": st.column_config.NumberColumn("Cancha", format="%d"),
+            "pareja1": st.column_config.TextColumn("Pareja 1"),
+            "score1": st.column_config.NumberColumn(f"{unidad} 1", min_value=0, max_value=max_valor, step=1),
+            "score2": st.column_config.NumberColumn(f"{unidad} 2", min_value=0, max_value=max_valor, step=1),
+            "pareja2": st.column_config.TextColumn("Pareja 2"),
+        },
+        on_change=guardar_tabla_ronda,
+        args=(ronda, key),
+    )
+    if ronda.descansan:
+        st.info(f"Descansan: {', '.join(ronda.descansan)}")
+    if st.session_state.get("avanzar_ronda"):
+        st.rerun()
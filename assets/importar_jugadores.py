@@ -0,0 +1,234 @@
+"""Importación masiva de jugadores desde texto pegado o CSV.
+
+Acepta una lista simple (un nombre por línea, o ``jugador1-jugador2`` para
+parejas) o un CSV con columnas opcionales ``nombre, genero, rating, pareja``
+(con o sin encabezado; separador coma, punto y coma o tabulación). Todo se
+procesa en una sola pasada: normaliza espacios, descarta duplicados sin
+distinguir mayúsculas ni acentos y arma las parejas. El ``rating`` queda en la
+sesión y es el Elo inicial, en el ranking del club, de quienes todavía no tienen
+partidos ahí cuando se guarda el torneo.
+"""
+import csv
+import io
+import unicodedata
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+import streamlit as st
+
+
+_GENEROS = {
+    "h": "H", "hombre": "H", "hombres": "H", "masculino": "H", "varon": "H", "male": "H",
+    "m": "M", "mujer": "M", "mujeres": "M", "f": "M", "femenino": "M", "dama": "M", "female": "M",
+}
+# Mismo mínimo que el selector de jugadores de la configuración
+MIN_JUGADORES = 8
+_COLUMNAS = ("nombre", "genero", "rating", "pareja")
+_ALIAS = {"jugador": "nombre", "name": "nombre", "sexo": "genero", "gender": "genero",
+          "elo": "rating", "nivel": "rating", "partner": "pareja", "equipo": "pareja"}
+
+
+@dataclass(frozen=True)
+class JugadorImportado:
+    nombre: str
+    genero: Optional[str] = None
+    rating: Optional[float] = None
+    pareja: Optional[str] = None
+
+
+def _limpiar(texto) -> str:
+    return " ".join(str(texto or "").split())
+
+
+def _clave(nombre: str) -> str:
+    # Comparación sin mayúsculas ni acentos: "José" y "jose" son el mismo jugador
+    sin_acentos = unicodedata.normalize("NFKD", nombre)
+    return "".join(c for c in sin_acentos if not unicodedata.combining(c)).casefold()
+
+
+def _columnas(primera: List[str]) -> Tuple[List[str], bool]:
+    """Nombres de columna y si la primera fila es un encabezado."""
+    normalizadas = [_ALIAS.get(_clave(c).strip(), _clave(c).strip()) for c in primera]
+    if "nombre" in normalizadas:
+        return normalizadas, True
+    # Sin encabezado las columnas van en el orden estándar (cada fila puede tener menos)
+    return list(_COLUMNAS), False
+
+
+def parsear_jugadores(texto: str) -> Tuple[List[JugadorImportado], List[str]]:
+    """Jugadores únicos en el orden del texto, y avisos (duplicados, datos inválidos)."""
+    lineas = [l for l in texto.splitlines() if l.strip()]
+    if not lineas:
+        return [], []
+    try:
+        dialecto = csv.Sniffer().sniff(lineas[0], delimiters=",;\t")
+        delimitador = dialecto.delimiter
+    except csv.Error:
+        delimitador = ","
+    filas = list(csv.reader(io.StringIO("\n".join(lineas)), delimiter=delimitador))
+    columnas, con_encabezado = _columnas(filas[0])
+    if con_encabezado:
+        filas = filas[1:]
+
+    jugadores, avisos, vistos = [], [], set()
+    for num, fila in enumerate(filas, start=2 if con_encabezado else 1):
+        datos = {c: _limpiar(v) for c, v in zip(columnas, fila)}
+        nombre = datos.get("nombre", "")
+        if not nombre:
+            continue
+        clave = _clave(nombre)
+        if clave in vistos:
+            avisos.append(f"Línea {num}: '{nombre}' está repetido, se omitió.")
+            continue
+        vistos.add(clave)
+
+        genero = None
+        if datos.get("genero"):
+            genero = _GENEROS.get(_clave(datos["genero"]))
+            if genero is None:
+                avisos.append(f"Línea {num}: género '{datos['genero']}' no reconocido (usar H o M).")
+        rating = None
+        if datos.get("rating"):
+            try:
+                rating = float(datos["rating"].replace(",", "."))
+            except ValueError:
+                avisos.append(f"Línea {num}: rating '{datos['rating']}' no es un número.")
+        jugadores.append(JugadorImportado(nombre, genero, rating, datos.get("pareja") or None))
+    return jugadores, avisos
+
+
+def armar_parejas(jugadores: List[JugadorImportado]) -> Tuple[List[str], List[str]]:
+    """
+    Parejas ``jugador1-jugador2`` para Parejas Fijas. La columna ``pareja`` puede
+    ser el nombre del compañero o una etiqueta de equipo compartida; sin ella,
+    un nombre con guion ya es una pareja y los demás se agrupan de a dos en orden.
+
+    Primero se resuelven todos los vínculos explícitos y recién después se
+    emparejan los que quedaron libres, así nadie termina en dos parejas.
+    """
+    por_clave = {_clave(j.nombre): j for j in jugadores}
+    usados, parejas, avisos = set(), [], []
+
+    # 1) Compañero por nombre
+    for j in jugadores:
+        if not j.pareja or _clave(j.nombre) in usados:
+            continue
+        companero = por_clave.get(_clave(j.pareja))
+        if companero is None or companero is j or _clave(companero.nombre) in usados:
+            continue
+        parejas.append(f"{j.nombre}-{companero.nombre}")
+        usados.update({_clave(j.nombre), _clave(companero.nombre)})
+
+    # 2) Etiqueta de equipo compartida (entre los que siguen libres)
+    grupos: Dict[str, List[str]] = {}
+    for j in jugadores:
+        if j.pareja and _clave(j.nombre) not in usados and _clave(j.pareja) not in por_clave:
+            grupos.setdefault(_clave(j.pareja), []).append(j.nombre)
+    for etiqueta, miembros in grupos.items():
+        if len(miembros) == 2:
+            parejas.append("-".join(miembros))
+            usados.update(_clave(m) for m in miembros)
+        else:
+            avisos.append(f"La pareja '{etiqueta}' tiene {len(miembros)} jugadores; se agrupan con los sueltos.")
+
+    # 3) Los que quedan: nombres con guion ya son pareja, el resto va de a dos en orden
+    sueltos = []
+    for j in jugadores:
+        if _clave(j.nombre) in usados:
+            continue
+        if "-" in j.nombre and not j.pareja:
+            parejas.append(j.nombre)
+        else:
+            if j.pareja and _clave(j.pareja) in por_clave:
+                avisos.append(f"'{j.pareja}' ya tiene pareja; '{j.nombre}' se agrupa con los sueltos.")
+            sueltos.append(j.nombre)
+    for i in range(0, len(sueltos) - 1, 2):
+        parejas.append(f"{sueltos[i]}-{sueltos[i + 1]}")
+    if len(sueltos) % 2:
+        avisos.append(f"'{sueltos[-1]}' quedó sin pareja.")
+    return parejas, avisos
+
+
+def _ratings_parejas(parejas: List[str], jugadores: List[JugadorImportado]) -> Dict[str, float]:
+    """Rating inicial de cada pareja: el promedio de los ratings importados de sus integrantes."""
+    por_nombre = {j.nombre: j.rating for j in jugadores}
+    ratings = {}
+    for pareja in parejas:
+        if por_nombre.get(pareja) is not None:
+            ratings[pareja] = por_nombre[pareja]
+            continue
+        # La etiqueta es "nombre1-nombre2" y los nombres pueden tener guiones
+        for i, c in enumerate(pareja):
+            if c == "-" and pareja[:i] in por_nombre and pareja[i + 1:] in por_nombre:
+                valores = [r for r in (por_nombre[pareja[:i]], por_nombre[pareja[i + 1:]]) if r is not None]
+                if valores:
+                    ratings[pareja] = sum(valores) / len(valores)
+                break
+    return ratings
+
+
+def _texto_importado(key_texto, key_archivo) -> str:
+    archivo = st.session_state.get(key_archivo)
+    if archivo is not None:
+        return archivo.getvalue().decode("utf-8-sig", errors="replace")
+    return st.session_state.get(key_texto, "")
+
+
+def _importar(destino, key_texto, key_archivo):
+    jugadores, avisos = parsear_jugadores(_texto_importado(key_texto, key_archivo))
+    if not jugadores:
+        st.session_state.avisos_importacion = ["No se encontraron nombres para importar."]
+        return
+
+    if destino == "mixto":
+        hombres = [j.nombre for j in jugadores if j.genero == "H"]
+        mujeres = [j.nombre for j in jugadores if j.genero == "M"]
+        sin_genero = [j.nombre for j in jugadores if j.genero is None]
+        if sin_genero:
+            avisos.append(f"Sin género (no importados): {', '.join(sin_genero)}.")
+        n = max(len(hombres), len(mujeres))
+        st.session_state.hombres = hombres + [""] * (n - len(hombres))
+        st.session_state.mujeres = mujeres + [""] * (n - len(mujeres))
+        st.session_state.num_players = 2 * n
+        claves = [f"hombre_{i}" for i in range(n)] + [f"mujer_{i}" for i in range(n)]
+        importados = set(hombres + mujeres)
+        ratings = {j.nombre: j.rating for j in jugadores if j.rating is not None and j.nombre in importados}
+    elif st.session_state.get("mod") == "Parejas Fijas":
+        parejas, avisos_parejas = armar_parejas(jugadores)
+        avisos += avisos_parejas
+        st.session_state.players = parejas
+        st.session_state.num_players = 2 * len(parejas)
+        claves = [f"player_{i}" for i in range(len(parejas))]
+        ratings = _ratings_parejas(parejas, jugadores)
+    else:
+        st.session_state.players = [j.nombre for j in jugadores]
+        st.session_state.num_players = len(jugadores)
+        claves = [f"player_{i}" for i in range(len(jugadores))]
+        ratings = {j.nombre: j.rating for j in jugadores if j.rating is not None}
+
+    if st.session_state.num_players < MIN_JUGADORES:
+        avisos.append(f"Se importaron {st.session_state.num_players} jugadores; el mínimo es {MIN_JUGADORES}.")
+    else:
+        # Que "Volver a Configuración" muestre la cantidad importada. El input de la
+        # portada lo toma antes de dibujarse (no se puede escribir su key después).
+        st.session_state.select_players_pendiente = st.session_state.num_players
+    # Los inputs se vuelven a crear con los nombres importados
+    for clave in claves:
+        st.session_state.pop(clave, None)
+    # Elo inicial en el ranking del club: se usa recién al guardar el torneo ahí
+    st.session_state.ratings_importados = ratings
+    st.session_state.avisos_importacion = avisos
+
+
+def importar_jugadores(destino="individual"):
+    """Expander de importación; ``destino`` es "individual" (jugadores o parejas) o "mixto"."""
+    key_texto, key_archivo = f"importar_texto_{destino}", f"importar_csv_{destino}"
+    with st.expander("📋 Importar lista (pegar o CSV)"):
+        st.caption("Un jugador por línea, o CSV con columnas nombre, genero (H/M), rating, pareja.")
+        st.text_area("Lista de jugadores", key=key_texto, height=150,
+                     placeholder="nombre,genero,rating,pareja\nAna,M,1520,Beto\nBeto,H,1480,Ana")
+        st.file_uploader("o subí un CSV", type=["csv", "txt"], key=key_archivo)
+        st.button("Importar", key=f"importar_{destino}", use_container_width=True,
+                  on_click=_importar, args=(destino, key_texto, key_archivo))
+        for aviso in st.session_state.pop("avisos_importacion", []):
+            st.warning(aviso)
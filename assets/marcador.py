@@ -0,0 +1,80 @@
+"""Marcador público de solo lectura (``?marcador=<código del torneo>``).
+
+Los espectadores no inician sesión ni ejecutan la página del torneo: la tabla
+sale del ledger del diario del torneo (ya actualizado por cada resultado) y el
+HTML se arma una sola vez por número de secuencia del diario. Mientras no
+cambie un resultado, cada espectador recibe el mismo HTML cacheado.
+"""
+from html import escape
+
+import streamlit as st
+
+from assets.mi_horario import mi_horario
+from assets.show_rankings import _compactar
+from assets.torneo_compartido import diario_de, get_shared_store
+
+# Cada cuánto el marcador de un espectador mira si hubo resultados nuevos
+INTERVALO_MARCADOR = "5s"
+
+_ESTILO = _compactar("""
+<style>
+.marcador {width:100%; max-width:720px; margin:0 auto; border-collapse:collapse; font-size:17px;}
+.marcador th {background:#5E3187; color:white; padding:8px; text-align:center;}
+.marcador td {padding:8px; text-align:center; border-bottom:1px solid #e5e5e5;}
+.marcador td.nombre {text-align:left; font-weight:600; color:#002d4e;}
+.marcador tr:nth-child(-n+4) td {background:#f6f0fb;}
+.marcador-pie {text-align:center; color:#777; font-size:13px; margin-top:8px;}
+</style>
+""")
+
+
+@st.cache_data(max_entries=64, show_spinner=False)
+def marcador_html(torneo_id, seq):
+    """Tabla del marcador para la secuencia ``seq`` del diario (``seq`` es solo clave de cache)."""
+    diario = diario_de(torneo_id)
+    _, ranking = diario.standings()
+    sets = "Diferencia de Sets" in ranking.columns
+    nombre_col = ranking.columns[0]
+    if sets:
+        encabezado = ("#", nombre_col, "PG", "PJ", "DS")
+        columnas = ("Puntos", "Partidos Jugados", "Diferencia de Sets")
+    else:
+        encabezado = ("#", nombre_col, "Puntos", "PJ", "Dif.")
+        columnas = ("Puntos", "Partidos Jugados", "Diferencia")
+
+    filas = "".join(
+        f"<tr><td>{pos}</td><td class='nombre'>{escape(str(fila[nombre_col]))}</td>"
+        + "".join(f"<td>{fila[c]}</td>" for c in columnas) + "</tr>"
+        for pos, (_, fila) in enumerate(ranking.iterrows(), start=1)
+    )
+    cargados = len(diario.resultados)
+    total = len(diario.fixture.partidos)
+    return (
+        _ESTILO
+        + "<table class='marcador'><tr>" + "".join(f"<th>{escape(h)}</th>" for h in encabezado) + "</tr>"
+        + filas + "</table>"
+        + f"<div class='marcador-pie'>{cargados} de {total} partidos cargados</div>"
+    )
+
+
+@st.fragment(run_every=INTERVALO_MARCADOR)
+def _tabla(torneo_id):
+    diario = diario_de(torneo_id)
+    if diario is None:
+        # El diario se crea con el primer resultado
+        st.info("Todavía no hay resultados cargados.")
+        return
+    st.markdown(marcador_html(torneo_id, diario.seq), unsafe_allow_html=True)
+
+
+def mostrar_marcador(torneo_id):
+    """Página completa del marcador (sin login ni estado de torneo en la sesión)."""
+    diario = diario_de(torneo_id)
+    if diario is None and get_shared_store().load(torneo_id) is None:
+        st.error("No se encontró un torneo con ese código.")
+        return
+    st.markdown('<div style="text-align:center;font-size:32px;font-weight:700;color:#5E3187;">'
+                '🏆 Marcador en vivo</div>', unsafe_allow_html=True)
+    _tabla(torneo_id)
+    if diario is not None:
+        mi_horario(diario.resultados, key="mi_horario_marcador")
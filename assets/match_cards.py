@@ -0,0 +1,50 @@
+"""Tarjetas de partido renderizadas en un único bloque HTML por ronda.
+
+Cada tarjeta sale de una plantilla fija y se memoiza por (partido, resultado):
+al cargar un puntaje solo se reconstruye la tarjeta de ese partido y la ronda
+se envía como un solo elemento en vez de uno por cancha.
+"""
+from functools import lru_cache
+from html import escape
+
+_TARJETA = (
+    '<div class="match-card">'
+    '<div class="match-title">Cancha {cancha}</div>'
+    '<div class="team-name">{pareja1}</div>'
+    '<div class="vs">VS</div>'
+    '<div class="team-name">{pareja2}</div>'
+    '{resultado}{ayudantes}'
+    '</div>'
+)
+_RESULTADO = "<div style='font-size:15px;font-weight:700;margin-top:6px;'>{s1} - {s2}</div>"
+_AYUDANTES = "<div style='font-size:14px;color:#6C13BF;margin-top:5px;'>Ayudantes: {lista}</div>"
+_GRILLA = ('<div style="display:grid;grid-template-columns:repeat({n}, minmax(0, 1fr));'
+           'gap:1rem;">{tarjetas}</div>')
+
+
+def _nombre(jugador, ayudantes):
+    # Mismo ícono que helper_funcs.render_nombre
+    return f"{escape(jugador)} 🛟" if jugador in ayudantes else escape(jugador)
+
+
+@lru_cache(maxsize=4096)
+def tarjeta_html(match, score=(0, 0), mostrar_ayudantes=False) -> str:
+    """HTML de la tarjeta de un partido; memoizado por (partido, resultado)."""
+    ayudantes = match.ayudantes
+    resultado = _RESULTADO.format(s1=score[0], s2=score[1]) if score != (0, 0) else ""
+    extra = ""
+    if mostrar_ayudantes and ayudantes:
+        extra = _AYUDANTES.format(lista=", ".join(_nombre(a, ayudantes) for a in ayudantes))
+    return _TARJETA.format(
+        cancha=match.cancha,
+        pareja1=" & ".join(_nombre(j, ayudantes) for j in match.pareja1),
+        pareja2=" & ".join(_nombre(j, ayudantes) for j in match.pareja2),
+        resultado=resultado,
+        ayudantes=extra,
+    )
+
+
+def tarjetas_html(partidos, resultados, mostrar_ayudantes=False) -> str:
+    """Grilla con las tarjetas de los partidos dados, alineada con ``st.columns(len(partidos))``."""
+    tarjetas = "".join(tarjeta_html(m, resultados.get(m.id), mostrar_ayudantes) for m in partidos)
+    return _GRILLA.format(n=max(len(partidos), 1), tarjetas=tarjetas)
@@ -0,0 +1,60 @@
+"""Reporte de memoria de la sesión: bytes por clave de ``st.session_state``.
+
+El fixture y la salida del motor (``out``) salen de la cache del proceso y los
+comparten todas las sesiones con la misma configuración, así que no se cuentan
+como memoria de la sesión (ni tampoco lo que otros objetos referencian de ellos).
+"""
+import sys
+from typing import Dict, List, Tuple
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+# Claves que apuntan a objetos compartidos entre sesiones (cache_resource)
+COMPARTIDAS = ("fixture", "out")
+
+
+def _slots(tipo) -> Tuple[str, ...]:
+    return tuple(nombre for clase in tipo.__mro__ for nombre in getattr(clase, "__slots__", ()))
+
+
+def tamano(obj, vistos: set) -> int:
+    """Tamaño profundo aproximado en bytes; ``vistos`` evita contar dos veces lo compartido."""
+    if id(obj) in vistos:
+        return 0
+    vistos.add(id(obj))
+    if isinstance(obj, pd.DataFrame):
+        return int(obj.memory_usage(deep=True).sum())
+    if isinstance(obj, pd.Series):
+        return int(obj.memory_usage(deep=True))
+    if isinstance(obj, np.ndarray):
+        return obj.nbytes + sys.getsizeof(obj) if obj.base is None else sys.getsizeof(obj)
+
+    total = sys.getsizeof(obj)
+    if isinstance(obj, (str, bytes, int, float, bool)) or obj is None:
+        return total
+    if isinstance(obj, dict):
+        total += sum(tamano(k, vistos) + tamano(v, vistos) for k, v in obj.items())
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        total += sum(tamano(v, vistos) for v in obj)
+    else:
+        if hasattr(obj, "__dict__"):
+            total += tamano(vars(obj), vistos)
+        for nombre in _slots(type(obj)):
+            if hasattr(obj, nombre):
+                total += tamano(getattr(obj, nombre), vistos)
+    return total
+
+
+def reporte_memoria() -> Tuple[int, List[Dict]]:
+    """``(bytes totales, filas)`` con una fila por clave, de mayor a menor."""
+    estado = st.session_state
+    vistos = {id(estado[clave]) for clave in COMPARTIDAS if clave in estado}
+    filas = []
+    for clave in list(estado.keys()):
+        compartida = clave in COMPARTIDAS
+        filas.append({"clave": clave, "bytes": 0 if compartida else tamano(estado[clave], vistos),
+                      "compartido": compartida})
+    filas.sort(key=lambda f: -f["bytes"])
+    return sum(f["bytes"] for f in filas), filas
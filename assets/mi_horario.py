@@ -0,0 +1,60 @@
+"""Vista "Mi horario": los partidos y descansos de un solo participante.
+
+Se arma con los índices del fixture (``matches_of`` y ``rests_of``), así que
+cada consulta recorre solo los k partidos del participante y no todas las
+rondas. Corre en un fragment: elegir otro nombre no vuelve a dibujar la página.
+"""
+from typing import Dict, List
+
+import streamlit as st
+
+from models.fixture import MODO_PAREJAS
+from models.results import ResultsStore
+
+
+def horario_de(resultados: ResultsStore, participante: str) -> List[Dict]:
+    """Filas del horario (partidos y descansos) ordenadas por ronda."""
+    fixture = resultados.fixture
+    filas = []
+    for m in fixture.matches_of(participante):
+        lado = m.lado_de(participante)
+        propios, rivales = (m.pareja1, m.pareja2) if lado == 0 else (m.pareja2, m.pareja1)
+        companeros = [p for p in propios if p != participante]
+        s1, s2 = resultados.get(m.id)
+        a_favor, en_contra = (s1, s2) if lado == 0 else (s2, s1)
+        jugado = (s1, s2) != (0, 0)
+        filas.append({
+            "Ronda": m.ronda,
+            "Cancha": str(m.cancha) if m.turno == 1 else f"{m.cancha} (turno {m.turno})",
+            "Compañero": " & ".join(companeros) or "—",
+            "Rivales": " & ".join(rivales),
+            "Resultado": f"{a_favor} - {en_contra}" if jugado else "",
+            "Nota": "🛟 Ayudante (no suma)" if participante in m.ayudantes else "",
+            "_jugado": jugado,
+        })
+    for ronda in fixture.rests_of(participante):
+        filas.append({"Ronda": ronda, "Cancha": "Descansa", "Compañero": "", "Rivales": "",
+                      "Resultado": "", "Nota": "😴", "_jugado": None})
+    filas.sort(key=lambda f: f["Ronda"])
+    return filas
+
+
+@st.fragment
+def mi_horario(resultados: ResultsStore, key: str = "mi_horario"):
+    """Selector de nombre y tabla con su horario."""
+    fixture = resultados.fixture
+    with st.expander("🗓️ Mi horario"):
+        etiqueta = "Tu pareja" if fixture.modo == MODO_PAREJAS else "Tu nombre"
+        participante = st.selectbox(etiqueta, fixture.participantes, index=None,
+                                    placeholder="Elegí tu nombre", key=key)
+        if participante is None:
+            return
+        filas = horario_de(resultados, participante)
+        proximo = next((f for f in filas if f["_jugado"] is False), None)
+        if proximo is not None:
+            st.info(f"Próximo partido: **ronda {proximo['Ronda']}**, cancha {proximo['Cancha']} "
+                    f"contra {proximo['Rivales']}.")
+        else:
+            st.success("Ya jugaste todos tus partidos.")
+        st.dataframe([{k: v for k, v in f.items() if not k.startswith("_")} for f in filas],
+                     hide_index=True, use_container_width=True)
@@ -0,0 +1,80 @@
+"""Registro estático de páginas.
+
+Las páginas se declaran una vez acá (sin listar la carpeta ``pages`` en cada
+rerun). Al arrancar el proceso se valida que todas existan; los módulos se
+importan la primera vez que se piden y quedan guardados en el registro. Después
+del login, ``precargar_torneo`` importa en segundo plano las páginas del
+torneo, así el clic en "Empezar Torneo" no paga el import de los motores.
+"""
+import importlib
+import importlib.util
+import threading
+from types import ModuleType
+
+import streamlit as st
+
+HOME = "home"
+
+# id de página (valor de st.session_state.page) -> módulo con app()
+PAGINAS = {
+    "players_setup": "pages.players_setup",
+    "players_setupMixto": "pages.players_setupMixto",
+    "torneo": "pages.torneo",
+    "torneo_mixto": "pages.torneo_mixto",
+    "torneo_sets": "pages.torneo_sets",
+    "z_ranking": "pages.z_ranking",
+}
+
+# Las que se precargan después del login (las de setup son livianas)
+PAGINAS_TORNEO = ("torneo", "torneo_mixto", "torneo_sets", "z_ranking")
+
+
+class _Registro:
+    def __init__(self):
+        faltantes = [m for m in PAGINAS.values() if importlib.util.find_spec(m) is None]
+        if faltantes:
+            raise ImportError(f"Páginas registradas que no existen: {', '.join(faltantes)}")
+        self.modulos = {}
+        self.lock = threading.Lock()
+        self.precarga = None
+
+
+@st.cache_resource(show_spinner=False)
+def _registro() -> _Registro:
+    """Una vez por proceso: valida el registro al arrancar."""
+    return _Registro()
+
+
+def cargar_pagina(page_id: str) -> ModuleType:
+    """Módulo de la página; lo importa solo la primera vez en el proceso."""
+    registro = _registro()
+    modulo = registro.modulos.get(page_id)
+    if modulo is None:
+        with registro.lock:
+            modulo = registro.modulos.get(page_id)
+            if modulo is None:
+                modulo = importlib.import_module(PAGINAS[page_id])
+                if not callable(getattr(modulo, "app", None)):
+                    raise AttributeError(f"La página {page_id} no define app()")
+                registro.modulos[page_id] = modulo
+    return modulo
+
+
+def _precargar(ids):
+    for page_id in ids:
+        try:
+            cargar_pagina(page_id)
+        except Exception:
+            # Si falla, el error aparece al abrir la página, no en el hilo
+            pass
+
+
+def precargar_torneo():
+    """Importa las páginas del torneo en un hilo de fondo (una sola vez por proceso)."""
+    registro = _registro()
+    if registro.precarga is None:
+        with registro.lock:
+            if registro.precarga is None:
+                registro.precarga = threading.Thread(target=_precargar, args=(PAGINAS_TORNEO,),
+                                                     name="precarga_paginas", daemon=True)
+                registro.precarga.start()
@@ -0,0 +1,37 @@
+"""Expander de diagnóstico (solo administradores): memoria de la sesión y tiempos de ``models.profiling``."""
+import streamlit as st
+
+import models.profiling as profiling
+from assets.auth import es_admin
+from assets.memoria_sesion import reporte_memoria
+
+
+def panel_profiling():
+    if not es_admin():
+        return
+    with st.expander("🛠️ Diagnóstico de rendimiento"):
+        total, filas = reporte_memoria()
+        st.markdown(f"**Memoria de esta sesión:** {total / 1024:.1f} KB "
+                    f"({len(filas)} claves; fixture y salida del motor compartidos entre sesiones)")
+        st.dataframe(filas[:10], hide_index=True, use_container_width=True)
+
+        col1, col2 = st.columns(2)
+        with col1:
+            activo = st.toggle("Medir tiempos", value=profiling.ACTIVO, key="profiling_activo")
+        with col2:
+            log = st.toggle("Guardar en JSONL", value=profiling.logueando(), key="profiling_log",
+                            help=f"Una línea por span en {profiling.LOG_PATH}")
+        if activo != profiling.ACTIVO or (activo and log != profiling.logueando()):
+            profiling.activar(activo, profiling.LOG_PATH if log else None)
+
+        datos = profiling.resumen()
+        if not datos["spans"] and not datos["contadores"]:
+            st.caption("Sin mediciones todavía. Los motores se miden solo al generar un fixture nuevo "
+                       "(los cacheados no se vuelven a calcular).")
+            return
+        st.dataframe([{"span": nombre, **valores} for nombre, valores in datos["spans"].items()],
+                     hide_index=True, use_container_width=True)
+        if datos["contadores"]:
+            st.dataframe([{"contador": nombre, "valor": valor} for nombre, valor in datos["contadores"].items()],
+                         hide_index=True, use_container_width=True)
+        st.button("Reiniciar mediciones", key="profiling_reiniciar", on_click=profiling.reiniciar)
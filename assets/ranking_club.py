@@ -0,0 +1,11 @@
+"""Ranking Elo del club: una escala para jugadores y otra para parejas fijas."""
+import streamlit as st
+
+from models.fixture import MODO_INDIVIDUAL
+from models.ratings import DB_PATHS, RatingStore
+
+
+@st.cache_resource
+def get_rating_store(modo=MODO_INDIVIDUAL):
+    # Una sola conexión por escala, compartida por todas las sesiones
+    return RatingStore(DB_PATHS[modo])
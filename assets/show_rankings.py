@@ -1,5 +1,64 @@
 import streamlit as st
 import pandas as pd
+from functools import lru_cache
+from html import escape
+
+def _compactar(html):
+    # Sin líneas en blanco ni sangría: dentro de un solo st.markdown una línea en
+    # blanco cortaría el bloque HTML y el resto se mostraría como código.
+    return "".join(linea.strip() for linea in html.splitlines())
+
+
+_FILA_SETS = _compactar("""
+                <div style="background-color:white;
+                                width:80%;
+                                max-width:600px;
+                                border-radius:15px;
+                                margin:10px auto;
+                                padding:10px 20px;
+                                box-shadow:0 2px 6px rgba(0,0,0,0.1);
+                                display:flex;
+                                justify-content:space-between;
+                                align-items:center;">
+
+                <span style="font-weight:600; color:#002d4e; min-width: 100px;">
+                    {pos}ᵗʰ — {nombre}
+                </span>
+
+                <div style="text-align: right;">
+                    <span style="font-weight:600; color:#333; display:block; font-size:14px;">
+                        PG: {puntos}
+                    </span>
+                    <span style="font-weight:400; color:#777; font-size: 12px; display:block;">
+                        DS: {ds}
+                    </span>
+                </div>
+                    </div>
+""")
+
+_FILA_PUNTOS = _compactar("""
+                <div style="background-color:white;
+                                width:60%;
+                                max-width:600px;
+                                border-radius:15px;
+                                margin:10px auto;
+                                padding:10px 20px;
+                                box-shadow:0 2px 6px rgba(0,0,0,0.1);
+                                display:flex;
+                                justify-content:space-between;
+                                align-items:center;">
+                    <span style="font-weight:600; color:#002d4e;">{pos}ᵗʰ — {nombre}</span>
+                    <span style="font-weight:500; color:#333;">{puntos} pts</span>
+                    </div>
+""")
+
+
+@lru_cache(maxsize=1024)
+def fila_ranking_html(sets_flag, pos, nombre, puntos, ds=None):
+    """Fila de "Otros Participantes"; memoizada porque la mayoría no cambia entre reruns."""
+    plantilla = _FILA_SETS if sets_flag else _FILA_PUNTOS
+    return plantilla.format(pos=pos, nombre=escape(str(nombre)), puntos=puntos, ds=ds)
+
 
 def podium_card(place, player, points, gradient, height):
     """Genera la tarjeta visual para los puestos del podio (Torneo por Puntos)."""
@@ -23,7 +82,7 @@ def podium_card(place, player, points, gradient, height):
                         padding: 5px 15px; border-radius: 10px; display: inline-block;">
                 {place}
             </div>
-            <h2 style="margin-top: 15px; margin-bottom: 10px;">{player}</h2>
+            <h2 style="margin-top: 15px; margin-bottom: 10px;">{escape(str(player))}</h2>
             <p style="font-size:16px;">{points} Puntos</p>
         </div>
     """, unsafe_allow_html=True)
@@ -61,7 +120,7 @@ def podium_card_sets(place,player,points,diff,gradient,height, status_label=None
                         padding: 5px 15px; border-radius: 10px; display: inline-block;">
                 {place}
             </div>
-            <h2 style="margin-top: 15px; margin-bottom: 10px;">{player}</h2>
+            <h2 style="margin-top: 15px; margin-bottom: 10px;">{escape(str(player))}</h2>
             {points_html}
             {diff_html}
 
@@ -184,58 +243,18 @@ def define_ranking_items(df_group_ranking, col1, col2, col3):
                 row = final_podium_df.iloc[2]
                 podium_card("🥉 3er Puesto", row[name_column], row["Puntos"], bronze_gradient, 230)
 
-    # Others rendering (for both sets and points)
+    # Others rendering (for both sets and points): un solo bloque HTML para toda la lista
     if not others.empty:
-        st.markdown("""
+        filas = "".join(
+            fila_ranking_html(sets_flag, rank_position, row[name_column], row['Puntos'],
+                              row['Diferencia de Sets'] if sets_flag else None)
+            for rank_position, (idx, row) in enumerate(others.iterrows(), start=len(final_podium_df) + 1)
+        )
+        st.markdown(f"""
             <div style="text-align:center; margin-top:60px;">
                 <h4 style="font-weight:400;"> Otros Participantes</h4>
                 <div style="display:flex; flex-direction:column; align-items:center; justify-content:center;">
-        """, unsafe_allow_html=True)
-        
-        for rank_position, (idx, row) in enumerate(others.iterrows(), start=len(final_podium_df) + 1):            
-            if sets_flag:
-                st.markdown(f"""
-                <div style="background-color:white;
-                                width:80%;
-                                max-width:600px;
-                                border-radius:15px;
-                                margin:10px auto;
-                                padding:10px 20px;
-                                box-shadow:0 2px 6px rgba(0,0,0,0.1);
-                                display:flex;
-                                justify-content:space-between;
-                                align-items:center;">
-
-                <span style="font-weight:600; color:#002d4e; min-width: 100px;">
-                    {rank_position}ᵗʰ — {row[name_column]}
-                </span>
-
-                <div style="text-align: right;">
-                    <span style="font-weight:600; color:#333; display:block; font-size:14px;">
-                        PG: {row['Puntos']}
-                    </span>
-                    <span style="font-weight:400; color:#777; font-size: 12px; display:block;">
-                        DS: {row['Diferencia de Sets']}
-                    </span>
+                {filas}
                 </div>
-                    </div>
-                """, unsafe_allow_html=True)
-                
-            else:
-                st.markdown(f"""
-                <div style="background-color:white;
-                                width:60%;
-                                max-width:600px;
-                                border-radius:15px;
-                                margin:10px auto;
-                                padding:10px 20px;
-                                box-shadow:0 2px 6px rgba(0,0,0,0.1);
-                                display:flex;
-                                justify-content:space-between;
-                                align-items:center;">
-                    <span style="font-weight:600; color:#002d4e;">{rank_position}ᵗʰ — {row[name_column]}</span>
-                    <span style="font-weight:500; color:#333;">{row['Puntos']} pts</span>
-                    </div>
-                """, unsafe_allow_html=True)
-        
-        st.markdown("</div></div>", unsafe_allow_html=True)
\ No newline at end of file
+            </div>
+        """, unsafe_allow_html=True)
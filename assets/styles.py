@@ -1,3 +1,7 @@
+import html
+import re
+from functools import lru_cache
+
 import streamlit as st
 
 # ============================================
@@ -225,9 +229,45 @@ CLUB_THEME = {
 DEFAULT_THEME = CLUB_THEME
 
 
-def apply_custom_css_main(config=None):
+# ============================================
+# 📦 COMPILACIÓN E INYECCIÓN DE CSS
+# ============================================
+# Cada hoja se compila una sola vez por (función, tema) y queda minificada en
+# el proceso. Streamlit saca del DOM los elementos que un rerun no vuelve a
+# dibujar, así que la hoja se envía en cada rerun (ya armada, sin recalcularla).
+
+def _minificar(css: str) -> str:
+    css = re.sub(r"</?style>", "", css)
+    css = re.sub(r"/\*.*?\*/", "", css, flags=re.S)
+    css = re.sub(r"\s+", " ", css)
+    css = re.sub(r"\s*([{};,>])\s*", r"\1", css)
+    css = re.sub(r":\s+", ":", css)
+    return css.replace(";}", "}").strip()
+
+
+@lru_cache(maxsize=64)
+def _compilar(builder, tema: tuple) -> str:
+    return _minificar(builder(dict(tema)))
+
+
+def compiled_css(builder, config=None) -> str:
+    """CSS minificado de una hoja de estilos para un tema."""
+    config = config or DEFAULT_THEME
+    return _compilar(builder, tuple(sorted(config.items())))
+
+
+def inject_css(builder, config=None):
+    """
+    Inserta la hoja de estilos de ``builder`` para el tema dado. El CSS vive en
+    el árbol de elementos de la página: al cambiar de página deja de enviarse y
+    Streamlit lo saca, sin scripts sobre el documento.
+    """
+    st.html(f"<style>{compiled_css(builder, config)}</style>")
+
+
+def _css_main(config=None):
     """
-    Aplica los estilos CSS personalizados para la página principal.
+    Devuelve los estilos CSS personalizados para la página principal.
     
     Args:
         config (dict, optional): Diccionario de configuración de estilos.
@@ -413,12 +453,17 @@ def apply_custom_css_main(config=None):
     </style>
     """
     
-    st.markdown(css, unsafe_allow_html=True)
+    return css
 
 
-def apply_custom_css_player_setup(config=None):
+def apply_custom_css_main(config=None):
+    """Aplica el CSS de la página principal."""
+    inject_css(_css_main, config)
+
+
+def _css_player_setup(config=None):
     """
-    Aplica los estilos CSS personalizados para la página de organización de jugadores.
+    Devuelve los estilos CSS personalizados para la página de organización de jugadores.
     
     Args:
         config (dict, optional): Diccionario de configuración de estilos.
@@ -530,12 +575,17 @@ def apply_custom_css_player_setup(config=None):
     </style>
     """
     
-    st.markdown(css, unsafe_allow_html=True)
+    return css
 
 
-def apply_custom_css_setup_mixto(config=None):
+def apply_custom_css_player_setup(config=None):
+    """Aplica el CSS del registro de jugadores."""
+    inject_css(_css_player_setup, config)
+
+
+def _css_setup_mixto(config=None):
     """
-    Aplica los estilos CSS personalizados para la página de configuración de categorías.
+    Devuelve los estilos CSS personalizados para la página de configuración de categorías.
     
     Args:
         config (dict, optional): Diccionario de configuración de estilos.
@@ -651,12 +701,17 @@ def apply_custom_css_setup_mixto(config=None):
     </style>
     """
     
-    st.markdown(css, unsafe_allow_html=True)
+    return css
 
 
-def apply_custom_css_torneo(config=None):
+def apply_custom_css_setup_mixto(config=None):
+    """Aplica el CSS del registro de jugadores mixto."""
+    inject_css(_css_setup_mixto, config)
+
+
+def _css_torneo(config=None):
     """
-    Aplica los estilos CSS personalizados para la página de torneo de parejas.
+    Devuelve los estilos CSS personalizados para la página de torneo de parejas.
     
     Args:
         config (dict, optional): Diccionario de configuración de estilos.
@@ -765,11 +820,16 @@ def apply_custom_css_torneo(config=None):
     </style>
     """
     
-    st.markdown(css, unsafe_allow_html=True)
+    return css
 
-def apply_custom_css_torneo_mixto(config=None):
+
+def apply_custom_css_torneo(config=None):
+    """Aplica el CSS de la página de torneo."""
+    inject_css(_css_torneo, config)
+
+def _css_torneo_mixto(config=None):
     """
-    Aplica los estilos CSS personalizados para la página de torneo mixto.
+    Devuelve los estilos CSS personalizados para la página de torneo mixto.
     
     Args:
         config (dict, optional): Diccionario de configuración de estilos.
@@ -863,12 +923,17 @@ def apply_custom_css_torneo_mixto(config=None):
     </style>
     """
     
-    st.markdown(css, unsafe_allow_html=True)
+    return css
 
 
-def apply_custom_css_torneo_sets(config=None):
+def apply_custom_css_torneo_mixto(config=None):
+    """Aplica el CSS de la página de torneo mixto."""
+    inject_css(_css_torneo_mixto, config)
+
+
+def _css_torneo_sets(config=None):
     """
-    Aplica los estilos CSS personalizados para la página de torneo por sets.
+    Devuelve los estilos CSS personalizados para la página de torneo por sets.
     
     Args:
         config (dict, optional): Diccionario de configuración de estilos.
@@ -1014,46 +1079,19 @@ def apply_custom_css_torneo_sets(config=None):
     </style>
     """
     
-    st.markdown(css, unsafe_allow_html=True)
+    return css
 
 
-def display_ranking_table(ranking_df, config, ranking_type='individual'):
-    """
-    Muestra una tabla de ranking estilizada usando la configuración del club.
-    """
-    name_col = 'Jugador' if ranking_type == 'individual' else 'Pareja'
-    points_col = 'Puntos'
-    
-    if name_col not in ranking_df.columns or points_col not in ranking_df.columns:
-        st.error(f"El DataFrame debe contener las columnas '{name_col}' y '{points_col}'")
-        return
-    
-    # Generar las filas HTML
-    rows_html = ""
-    for idx, row in ranking_df.iterrows():
-        position = idx + 1
-        name = row[name_col]
-        points = row[points_col]
-        
-        if position == 1:
-            position_display = '<span class="rank-medal">🥇</span>'
-        elif position == 2:
-            position_display = '<span class="rank-medal">🥈</span>'
-        elif position == 3:
-            position_display = '<span class="rank-medal">🥉</span>'
-        else:
-            position_display = str(position)
-        
-        rows_html += f"""
-        <div class="ranking-row">
-            <div class="rank-position">{position_display}</div>
-            <div class="player-name">{name}</div>
-            <div class="player-points">{points}</div>
-        </div>
-        """
-    
-    # Renderizar la tabla con los colores del logo
-    st.markdown(f"""
+def apply_custom_css_torneo_sets(config=None):
+    """Aplica el CSS de la página de torneo por sets."""
+    inject_css(_css_torneo_sets, config)
+
+
+def _css_ranking_table(config=None):
+    """Devuelve los estilos CSS de la tabla de ranking."""
+    if config is None:
+        config = DEFAULT_THEME
+    css = f"""
         <style>
             .ranking-table {{
                 width: 100%;
@@ -1119,6 +1157,48 @@ def display_ranking_table(ranking_df, config, ranking_type='individual'):
                 font-size: 22px;
             }}
         </style>
+    """
+    return css
+
+
+def display_ranking_table(ranking_df, config, ranking_type='individual'):
+    """
+    Muestra una tabla de ranking estilizada usando la configuración del club.
+    """
+    name_col = 'Jugador' if ranking_type == 'individual' else 'Pareja'
+    points_col = 'Puntos'
+    
+    if name_col not in ranking_df.columns or points_col not in ranking_df.columns:
+        st.error(f"El DataFrame debe contener las columnas '{name_col}' y '{points_col}'")
+        return
+    
+    # Generar las filas HTML
+    rows_html = ""
+    for idx, row in ranking_df.iterrows():
+        position = idx + 1
+        name = row[name_col]
+        points = row[points_col]
+        
+        if position == 1:
+            position_display = '<span class="rank-medal">🥇</span>'
+        elif position == 2:
+            position_display = '<span class="rank-medal">🥈</span>'
+        elif position == 3:
+            position_display = '<span class="rank-medal">🥉</span>'
+        else:
+            position_display = str(position)
+        
+        rows_html += f"""
+        <div class="ranking-row">
+            <div class="rank-position">{position_display}</div>
+            <div class="player-name">{html.escape(str(name))}</div>
+            <div class="player-points">{points}</div>
+        </div>
+        """
+    
+    # Renderizar la tabla con los colores del logo
+    inject_css(_css_ranking_table, config)
+    st.markdown(f"""
         
         <div class="ranking-table">
             <div class="ranking-header">
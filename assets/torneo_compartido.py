@@ -0,0 +1,334 @@
+"""Carga de resultados desde varios dispositivos sobre el mismo torneo.
+
+Cada torneo nuevo se publica en el ``SharedTournamentStore`` del proceso con su
+``torneo_id`` como código. Otro dispositivo se une con ese código y recibe el
+mismo fixture y el resumen del motor guardado al publicarlo (sin volver a
+correr el motor) más los resultados ya cargados.
+
+En cada rerun la sesión compara su revisión con la del store (lectura en
+memoria) y solo trae los partidos que cambiaron; las escrituras llevan la
+versión leída del partido y, si otro dispositivo se adelantó, se adopta el
+resultado guardado y se avisa.
+
+Además cada resultado aceptado se anota en el diario en disco del torneo
+(``models.journal``): si se cae el servidor, se refresca el navegador o se
+vuelve a la configuración, la portada ofrece retomar el torneo tal como estaba.
+El diario se crea con el primer resultado, así que un fixture generado y
+abandonado no deja nada en disco. Los torneos terminados o sin actividad por
+``INACTIVIDAD`` segundos se sacan de la memoria del proceso.
+"""
+import re
+import threading
+import time
+from datetime import datetime
+from urllib.parse import urlencode
+
+import pandas as pd
+import streamlit as st
+
+from models.journal import TournamentJournal, podar_diarios, torneos_activos
+from models.ledger import StandingsLedger, MODO_PUNTOS, MODO_SETS
+from models.results import ResultsStore
+from models.rests import RestMetrics
+from models.shared_store import SharedTournamentStore, VersionConflict
+
+# Configuración de sesión que necesita otro dispositivo para abrir el mismo torneo
+_CLAVES_CONFIG = ("page", "mod", "mixto_op", "num_fields", "num_pts", "num_sets", "num_players",
+                  "players", "hombres", "mujeres", "parejas", "code_play", "tournament_key",
+                  "semilla")
+
+# Cada cuánto las sesiones abiertas miran si hubo cambios de otros dispositivos
+INTERVALO_SYNC = "3s"
+# Sin lecturas ni resultados por este tiempo, un torneo deja la memoria del proceso
+INACTIVIDAD = 6 * 3600
+
+
+@st.cache_resource
+def get_shared_store():
+    # Un solo store por proceso: todas las sesiones ven las mismas revisiones
+    return SharedTournamentStore()
+
+
+@st.cache_resource
+def get_journals():
+    # Un diario por torneo y por proceso: las sesiones del mismo torneo escriben en el mismo log
+    return {}
+
+
+_JOURNALS_LOCK = threading.Lock()
+# Los códigos llegan de inputs y query params: nada que pueda salir de data/torneos/
+_CODIGO_VALIDO = re.compile(r"[A-Za-z0-9_-]{1,64}")
+
+
+def diario_de(torneo_id):
+    """Diario del torneo (abriéndolo desde disco si hace falta), o None si no existe."""
+    if not isinstance(torneo_id, str) or not _CODIGO_VALIDO.fullmatch(torneo_id):
+        return None
+    diarios = get_journals()
+    with _JOURNALS_LOCK:
+        if torneo_id not in diarios:
+            try:
+                diarios[torneo_id] = TournamentJournal.open(torneo_id)
+            except FileNotFoundError:
+                return None
+        return diarios[torneo_id]
+
+
+def _config_sesion() -> dict:
+    config = {}
+    for clave in _CLAVES_CONFIG:
+        if clave in st.session_state:
+            valor = st.session_state[clave]
+            config[clave] = list(valor) if isinstance(valor, (list, tuple)) else valor
+    return config
+
+
+def _resumen_motor(out):
+    """
+    Lo que las páginas muestran de la salida del motor (resumen de participación
+    y mínimo de partidos), en JSON para guardarlo con la configuración del torneo.
+    """
+    if not out or "resumen" not in out:
+        return None
+    resumen = out["resumen"]
+    if isinstance(resumen, pd.DataFrame):
+        resumen = resumen.to_dict("records")
+    minimo = out["stats"]["minimum_games"] if "stats" in out else out.get("min_matches")
+    return {"resumen": resumen, "min_matches": None if minimo is None else int(minimo)}
+
+
+@st.cache_resource(show_spinner=False, max_entries=16)
+def _salida_motor(torneo_id, _fixture, _motor):
+    """
+    ``out`` de un torneo unido o retomado, armado desde lo guardado (sin volver a
+    correr el motor); los descansos se calculan del fixture. Uno por torneo y proceso.
+    """
+    minimo = _motor["min_matches"]
+    descansos = RestMetrics.desde_fixture(_fixture).resumen()
+    return {
+        "fixture": _fixture,
+        "resumen": pd.DataFrame(_motor["resumen"]),
+        "min_matches": minimo,
+        "descansos": descansos,
+        "stats": {"minimum_games": minimo, "descansos": descansos},
+    }
+
+
+def _podar_inactivos():
+    """Libera la memoria de los torneos sin actividad y borra los diarios viejos del disco."""
+    get_shared_store().evict_idle(INACTIVIDAD)
+    limite = time.time() - INACTIVIDAD
+    with _JOURNALS_LOCK:
+        diarios = get_journals()
+        for torneo_id in [t for t, diario in diarios.items() if diario.actualizado < limite]:
+            del diarios[torneo_id]
+    podar_diarios()
+
+
+def _olvidar_torneo(torneo_id):
+    # Torneo terminado o descartado: si alguien lo vuelve a pedir se recarga de disco
+    with _JOURNALS_LOCK:
+        get_journals().pop(torneo_id, None)
+    get_shared_store().evict(torneo_id)
+
+
+def publicar_torneo():
+    """Registra el torneo recién generado de esta sesión en el store compartido."""
+    _podar_inactivos()
+    resultados = st.session_state.resultados
+    store = get_shared_store()
+    config = _config_sesion()
+    config["motor"] = _resumen_motor(st.session_state.get("out"))
+    store.create(resultados.torneo_id, st.session_state.fixture, config)
+    st.session_state.revision_compartida = store.revision(resultados.torneo_id)
+
+
+def _diario_para_escribir(torneo_id):
+    """Diario del torneo; lo crea si es el primer resultado que se carga."""
+    diario = diario_de(torneo_id)
+    if diario is not None:
+        return diario
+    fixture, config = get_shared_store().load(torneo_id)
+    with _JOURNALS_LOCK:
+        diarios = get_journals()
+        if torneo_id not in diarios:
+            diarios[torneo_id] = TournamentJournal.create(torneo_id, fixture, config,
+                                                          st.session_state.ledger.modo)
+        return diarios[torneo_id]
+
+
+def _olvidar_widgets(match_id, ronda):
+    # Los inputs y el editor de la ronda se vuelven a crear con el valor del store
+    for lado in ("p1", "p2"):
+        st.session_state.pop(f"score_{match_id}_{lado}", None)
+    versiones = st.session_state.setdefault("version_tabla", {})
+    versiones[ronda] = versiones.get(ronda, 0) + 1
+
+
+def _aplicar(match_id, s1, s2, version):
+    anterior = st.session_state.resultados.set(match_id, s1, s2, version)
+    partido = st.session_state.fixture.partidos[match_id]
+    st.session_state.ledger.apply(partido, anterior, (s1, s2))
+    _olvidar_widgets(match_id, partido.ronda)
+
+
+def sincronizar():
+    """Trae los resultados que otros dispositivos cargaron desde la última revisión vista."""
+    vista = st.session_state.get("revision_compartida")
+    resultados = st.session_state.get("resultados")
+    if vista is None or resultados is None:
+        return
+    store = get_shared_store()
+    if store.revision(resultados.torneo_id) == vista:
+        return
+    revision, cambios = store.changes_since(resultados.torneo_id, vista)
+    for match_id, s1, s2, version in cambios:
+        if resultados.version(match_id) != version:
+            _aplicar(match_id, s1, s2, version)
+    st.session_state.revision_compartida = revision
+
+
+def escribir_resultado(match_id, s1, s2):
+    """
+    Guarda el resultado en el store compartido con la versión que vio esta sesión.
+    Devuelve ``(s1, s2, version)`` a aplicar localmente: el propio o, si otro
+    dispositivo lo cambió antes, el que quedó guardado.
+    """
+    resultados = st.session_state.resultados
+    if st.session_state.get("revision_compartida") is None:
+        return s1, s2, None
+    store = get_shared_store()
+    try:
+        version, _ = store.set_result(resultados.torneo_id, match_id, s1, s2, resultados.version(match_id))
+    except VersionConflict as e:
+        _olvidar_widgets(match_id, st.session_state.fixture.partidos[match_id].ronda)
+        st.toast(f"Otro dispositivo ya cargó {e.actual[0]} - {e.actual[1]} en ese partido. "
+                 "Revisalo y volvé a cargarlo si hace falta.", icon="⚠️")
+        return e.actual[0], e.actual[1], e.version
+    _diario_para_escribir(resultados.torneo_id).append(match_id, s1, s2, version)
+    return s1, s2, version
+
+
+def unirse_torneo(torneo_id) -> bool:
+    """Abre en esta sesión un torneo publicado por otro dispositivo."""
+    store = get_shared_store()
+    torneo = store.load(torneo_id)
+    if torneo is None:
+        return False
+    fixture, config = torneo
+    motor = config.get("motor")
+    for clave, valor in config.items():
+        if clave != "motor":
+            st.session_state[clave] = valor
+    if "semilla" not in config:
+        from assets.fixture_cache import SEED_DEFAULT  # fixture_cache importa este módulo
+        st.session_state.semilla = SEED_DEFAULT
+
+    resultados = ResultsStore(fixture, torneo_id=torneo_id)
+    ledger = StandingsLedger(resultados, MODO_SETS if config.get("page") == "torneo_sets" else MODO_PUNTOS)
+    revision, cambios = store.changes_since(torneo_id, 0)
+    for match_id, s1, s2, version in cambios:
+        anterior = resultados.set(match_id, s1, s2, version)
+        ledger.apply(fixture.partidos[match_id], anterior, (s1, s2))
+
+    st.session_state.fixture = fixture
+    st.session_state.resultados = resultados
+    st.session_state.ledger = ledger
+    st.session_state.revision_compartida = revision
+
+    # Resumen del motor: el que se guardó al publicar el torneo, nunca una búsqueda nueva
+    if motor is not None:
+        st.session_state.out = _salida_motor(torneo_id, fixture, motor)
+    else:
+        st.session_state.pop("out", None)
+    return True
+
+
+def retomar_torneo(torneo_id) -> bool:
+    """
+    Abre un torneo desde su diario en disco (snapshot + cola del log), por
+    ejemplo después de reiniciar el servidor. El fixture no se regenera.
+    """
+    diario = diario_de(torneo_id)
+    if diario is None:
+        return False
+    store = get_shared_store()
+    store.create(torneo_id, diario.fixture, diario.config)
+    try:
+        store.import_results(torneo_id, [(m.id, s1, s2, diario.resultados.version(m.id))
+                                         for m, (s1, s2) in diario.resultados.items()])
+    except VersionConflict:
+        # El torneo sigue abierto en este proceso con resultados más nuevos que el diario
+        pass
+    return unirse_torneo(torneo_id)
+
+
+def cerrar_torneo():
+    """El torneo de la sesión terminó: deja de ofrecerse para retomar."""
+    resultados = st.session_state.get("resultados")
+    if resultados is None:
+        return
+    diario = diario_de(resultados.torneo_id)
+    if diario is not None:
+        diario.close()
+    _olvidar_torneo(resultados.torneo_id)
+
+
+def _descripcion(config) -> str:
+    if config.get("page") == "torneo_mixto":
+        jugadores = len(config.get("hombres", ())) + len(config.get("mujeres", ()))
+    else:
+        jugadores = len(config.get("players", ()))
+    return f"{config.get('mod', 'Torneo')} · {jugadores} participantes · {config.get('num_fields', '?')} canchas"
+
+
+def ofrecer_retomar():
+    """En la portada: torneos sin terminar que se pueden retomar."""
+    if "resultados" in st.session_state:
+        return
+    activos = torneos_activos()
+    if not activos:
+        return
+    st.markdown("#### ⏯️ Torneos en curso")
+    for torneo in activos:
+        cuando = datetime.fromtimestamp(torneo["actualizado"]).strftime("%d/%m %H:%M")
+        col_a, col_b, col_c = st.columns([4, 1, 1])
+        col_a.markdown(f"**{_descripcion(torneo['config'])}** — {torneo['resultados']} resultados "
+                       f"cargados (último cambio {cuando})")
+        if col_b.button("Retomar", key=f"retomar_{torneo['torneo_id']}", use_container_width=True):
+            if retomar_torneo(torneo["torneo_id"]):
+                st.rerun()
+            st.error("No se pudo abrir ese torneo.")
+        if col_c.button("Descartar", key=f"descartar_{torneo['torneo_id']}", use_container_width=True):
+            diario = diario_de(torneo["torneo_id"])
+            if diario is not None:
+                diario.close()
+            _olvidar_torneo(torneo["torneo_id"])
+            st.rerun()
+
+
+def _link_marcador(torneo_id: str) -> str:
+    """Link del marcador público: solo la dirección de la app y el código, sin otros parámetros."""
+    base = st.context.url  # sin query string ni anclas
+    consulta = urlencode({"marcador": torneo_id})
+    return f"{base}?{consulta}" if isinstance(base, str) and base else f"?{consulta}"
+
+
+def mostrar_codigo():
+    """Código para que otro dispositivo se una al torneo."""
+    resultados = st.session_state.get("resultados")
+    if resultados is not None and st.session_state.get("revision_compartida") is not None:
+        st.caption(f"📲 Código del torneo: **{resultados.torneo_id}** — ingresalo en otro dispositivo "
+                   "para cargar resultados en paralelo. Marcador público (sin login): "
+                   f"`{_link_marcador(resultados.torneo_id)}`")
+
+
+@st.fragment(run_every=INTERVALO_SYNC)
+def vigilar_cambios():
+    """Redibuja la página solo cuando otro dispositivo cargó un resultado."""
+    resultados = st.session_state.get("resultados")
+    vista = st.session_state.get("revision_compartida")
+    if resultados is None or vista is None:
+        return
+    if get_shared_store().revision(resultados.torneo_id) != vista:
+        st.rerun()
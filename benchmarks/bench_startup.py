@@ -0,0 +1,102 @@
+"""Benchmark de arranque en frío.
+
+Mide, cada vez en un proceso nuevo (sin módulos ya importados):
+
+- servidor: desde ``streamlit run`` hasta que ``/_stcore/health`` responde.
+- home / torneo: desde que arranca el intérprete hasta terminar la primera
+  ejecución completa de la página (imports incluidos), usando AppTest.
+
+Uso:  python benchmarks/bench_startup.py [--repeticiones 3]
+"""
+import argparse
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+import urllib.request
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Se ejecuta en un proceso nuevo; imprime JSON con los tiempos medidos adentro
+_PAGINA = r"""
+import json, os, sys, time
+t0 = time.perf_counter()
+os.chdir({root!r}); sys.path.insert(0, {root!r})
+from streamlit.testing.v1 import AppTest
+at = AppTest.from_file(os.path.join({root!r}, "streamlit_app.py"), default_timeout=120)
+at.secrets["auth"] = {{"users": {{}}}}
+at.session_state["authenticated"] = True
+for k, v in {estado!r}.items():
+    at.session_state[k] = v
+t1 = time.perf_counter()
+at.run()
+t2 = time.perf_counter()
+mods = [m for m in ("seaborn", "matplotlib", "assets.analyze_funcs") if m in sys.modules]
+print(json.dumps({{"import": t1 - t0, "primera_ejecucion": t2 - t1,
+                   "errores": [str(e.value) for e in at.exception], "plotting": mods}}))
+"""
+
+PAGINAS = {
+    "home": {"page": "home"},
+    "torneo": {"page": "torneo", "num_fields": 3, "num_pts": 16, "mod": "Todos Contra Todos",
+               "mixto_op": "Aleatorio", "players": [f"Jugador {i}" for i in range(14)]},
+}
+
+
+def medir_pagina(estado):
+    codigo = _PAGINA.format(root=ROOT, estado=estado)
+    t0 = time.perf_counter()
+    out = subprocess.run([sys.executable, "-c", codigo], capture_output=True, text=True, check=True)
+    total = time.perf_counter() - t0
+    datos = json.loads(out.stdout.strip().splitlines()[-1])
+    datos["total"] = total
+    return datos
+
+
+def _puerto_libre():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def medir_servidor(timeout=60.0):
+    puerto = _puerto_libre()
+    cmd = [sys.executable, "-m", "streamlit", "run", "streamlit_app.py", "--server.headless", "true",
+           "--server.port", str(puerto), "--browser.gatherUsageStats", "false"]
+    t0 = time.perf_counter()
+    proc = subprocess.Popen(cmd, cwd=ROOT, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        while time.perf_counter() - t0 < timeout:
+            try:
+                with urllib.request.urlopen(f"http://127.0.0.1:{puerto}/_stcore/health", timeout=1) as r:
+                    if r.status == 200:
+                        return time.perf_counter() - t0
+            except OSError:
+                time.sleep(0.05)
+        raise TimeoutError("el servidor no respondió")
+    finally:
+        proc.terminate()
+        proc.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeticiones", type=int, default=3)
+    args = parser.parse_args()
+
+    servidor = [medir_servidor() for _ in range(args.repeticiones)]
+    print(f"{'servidor':<10} {statistics.median(servidor) * 1000:8.0f} ms  (health OK)")
+    for nombre, estado in PAGINAS.items():
+        medidas = [medir_pagina(estado) for _ in range(args.repeticiones)]
+        total = statistics.median(m["total"] for m in medidas)
+        ejecucion = statistics.median(m["primera_ejecucion"] for m in medidas)
+        ultimo = medidas[-1]
+        print(f"{nombre:<10} {total * 1000:8.0f} ms  (primera ejecución {ejecucion * 1000:.0f} ms, "
+              f"plotting cargado: {ultimo['plotting'] or 'no'}, errores: {len(ultimo['errores'])})")
+
+
+if __name__ == "__main__":
+    main()
@@ -3,7 +3,10 @@ import random
 from itertools import combinations
 from collections import defaultdict
 import pandas as pd
-from typing import List, Dict, Any, Tuple, Set
+from typing import List, Dict, Any, Optional, Tuple, Set
+from models.fixture import Fixture, Round, Match, MODO_INDIVIDUAL
+from models.profiling import contar, span
+from models.rests import RestMetrics
 
 class CompleteAmericanoTournament:
     def __init__(self, players: List[str], num_fields: int):
@@ -101,6 +104,7 @@ class CompleteAmericanoTournament:
         Score a potential match based on complete coverage priority
         Lower score is better
         """
+        contar("get_match_score")
         p1, p2, p3, p4 = match
         score = 0.0
         
@@ -156,35 +160,65 @@ class CompleteAmericanoTournament:
             if len(remaining) < 4:
                 break
             
-            # Prioritize players who haven't reached minimum games
-            players_needing_games = [p for p in remaining if self.games_played[p] < min_games]
+            with span("motor.busqueda_cancha"):
+                match = self._search_field_match(round_num, field_idx, remaining, min_games)
+            if match:
+                matches.append(match)
+                remaining.difference_update(match["players"])
+        
+        resting = list(remaining)
+        return matches, resting
+    
+    def _search_field_match(self, round_num: int, field_idx: int, remaining: Set[str],
+                            min_games: int) -> Optional[Dict]:
+        """Find the best match for one field among the remaining players (None if no match fits)"""
+        # Prioritize players who haven't reached minimum games
+        players_needing_games = [p for p in remaining if self.games_played[p] < min_games]
+        
+        if len(players_needing_games) >= 4:
+            # Regular match - no helpers needed
+            best_match = None
+            best_score = float('inf')
             
-            if len(players_needing_games) >= 4:
-                # Regular match - no helpers needed
-                best_match = None
-                best_score = float('inf')
-                
-                # Strategy 1: Prioritize players with most uncovered matchups
-                players_by_need = sorted(
-                    players_needing_games,
-                    key=lambda p: (
-                        -(len(self.get_uncovered_opponents(p)) + len(self.get_uncovered_partners(p))),
-                        self.games_played[p]
-                    )
+            # Strategy 1: Prioritize players with most uncovered matchups
+            players_by_need = sorted(
+                players_needing_games,
+                key=lambda p: (
+                    -(len(self.get_uncovered_opponents(p)) + len(self.get_uncovered_partners(p))),
+                    self.games_played[p]
                 )
+            )
+            
+            # Try combinations of players who most need coverage
+            search_pool = players_by_need[:min(12, len(players_by_need))]
+            tried = 0
+            max_tries = min(200, len(list(combinations(search_pool, 4))))
+            
+            for combo in combinations(search_pool, 4):
+                if tried >= max_tries:
+                    break
+                tried += 1
                 
-                # Try combinations of players who most need coverage
-                search_pool = players_by_need[:min(12, len(players_by_need))]
-                tried = 0
-                max_tries = min(200, len(list(combinations(search_pool, 4))))
+                # Try different team configurations
+                p1, p2, p3, p4 = combo
+                configurations = [
+                    (p1, p2, p3, p4),
+                    (p1, p3, p2, p4),
+                    (p1, p4, p2, p3),
+                ]
                 
-                for combo in combinations(search_pool, 4):
-                    if tried >= max_tries:
-                        break
-                    tried += 1
-                    
-                    # Try different team configurations
+                for config in configurations:
+                    score = self.get_match_score(config, round_num, False)
+                    if score < best_score:
+                        best_score = score
+                        best_match = config
+            
+            # Random sampling for diversity
+            if len(players_needing_games) > 12:
+                for _ in range(150):
+                    combo = tuple(random.sample(players_needing_games, 4))
                     p1, p2, p3, p4 = combo
+                    
                     configurations = [
                         (p1, p2, p3, p4),
                         (p1, p3, p2, p4),
@@ -196,87 +230,64 @@ class CompleteAmericanoTournament:
                         if score < best_score:
                             best_score = score
                             best_match = config
+            
+            if best_match:
+                return {
+                    "players": best_match,
+                    "helpers": [],
+                    "field": field_idx
+                }
                 
-                # Random sampling for diversity
-                if len(players_needing_games) > 12:
-                    for _ in range(150):
-                        combo = tuple(random.sample(players_needing_games, 4))
-                        p1, p2, p3, p4 = combo
-                        
-                        configurations = [
-                            (p1, p2, p3, p4),
-                            (p1, p3, p2, p4),
-                            (p1, p4, p2, p3),
-                        ]
-                        
-                        for config in configurations:
-                            score = self.get_match_score(config, round_num, False)
-                            if score < best_score:
-                                best_score = score
-                                best_match = config
-                
-                if best_match:
-                    matches.append({
-                        "players": best_match,
-                        "helpers": [],
-                        "field": field_idx
-                    })
-                    remaining -= set(best_match)
-                    
-            elif len(players_needing_games) > 0:
-                # Only use helpers if we have 1-3 players needing games left
-                # This minimizes helper usage
-                need_helpers = 4 - len(players_needing_games)
-                
-                # Select helpers: players who have complete coverage
+        elif len(players_needing_games) > 0:
+            # Only use helpers if we have 1-3 players needing games left
+            # This minimizes helper usage
+            need_helpers = 4 - len(players_needing_games)
+            
+            # Select helpers: players who have complete coverage
+            potential_helpers = [
+                p for p in remaining 
+                if p not in players_needing_games and self.is_complete_coverage(p)
+            ]
+            
+            # If not enough with complete coverage, use those with most games
+            if len(potential_helpers) < need_helpers:
                 potential_helpers = [
-                    p for p in remaining 
-                    if p not in players_needing_games and self.is_complete_coverage(p)
+                    p for p in remaining if p not in players_needing_games
                 ]
+                potential_helpers.sort(key=lambda p: -self.games_played[p])
+            
+            helpers = potential_helpers[:need_helpers]
+            
+            if len(helpers) == need_helpers:
+                all_players = players_needing_games + helpers
                 
-                # If not enough with complete coverage, use those with most games
-                if len(potential_helpers) < need_helpers:
-                    potential_helpers = [
-                        p for p in remaining if p not in players_needing_games
-                    ]
-                    potential_helpers.sort(key=lambda p: -self.games_played[p])
-                
-                helpers = potential_helpers[:need_helpers]
+                # Optimize configuration even with helpers
+                best_config = None
+                best_score = float('inf')
                 
-                if len(helpers) == need_helpers:
-                    all_players = players_needing_games + helpers
-                    
-                    # Optimize configuration even with helpers
-                    best_config = None
-                    best_score = float('inf')
-                    
-                    import itertools
-                    for perm in itertools.permutations(all_players, 4):
-                        p1, p2, p3, p4 = perm
-                        configurations = [
-                            (p1, p2, p3, p4),
-                            (p1, p3, p2, p4),
-                            (p1, p4, p2, p3),
-                        ]
-                        
-                        for config in configurations:
-                            score = self.get_match_score(config, round_num, True)
-                            if score < best_score:
-                                best_score = score
-                                best_config = config
+                import itertools
+                for perm in itertools.permutations(all_players, 4):
+                    p1, p2, p3, p4 = perm
+                    configurations = [
+                        (p1, p2, p3, p4),
+                        (p1, p3, p2, p4),
+                        (p1, p4, p2, p3),
+                    ]
                     
-                    if best_config:
-                        matches.append({
-                            "players": best_config,
-                            "helpers": helpers,
-                            "field": field_idx
-                        })
-                        for p in best_config:
-                            if p in remaining:
-                                remaining.discard(p)
+                    for config in configurations:
+                        score = self.get_match_score(config, round_num, True)
+                        if score < best_score:
+                            best_score = score
+                            best_config = config
+                
+                if best_config:
+                    return {
+                        "players": best_config,
+                        "helpers": helpers,
+                        "field": field_idx
+                    }
         
-        resting = list(remaining)
-        return matches, resting
+        return None
     
     def update_statistics(self, match: Dict, round_num: int):
         """Update tracking statistics after a match"""
@@ -324,7 +335,8 @@ class CompleteAmericanoTournament:
         
         for round_num in range(num_rounds):
             # Check if everyone has complete coverage
-            coverage_status = self.check_coverage_status()
+            with span("motor.cobertura"):
+                coverage_status = self.check_coverage_status()
             all_complete = all(status["complete"] for status in coverage_status.values())
             
             if all_complete:
@@ -341,7 +353,8 @@ class CompleteAmericanoTournament:
                 )
             )
             
-            matches, resting = self.generate_round_matches(round_num, available)
+            with span("motor.ronda"):
+                matches, resting = self.generate_round_matches(round_num, available)
             
             if not matches:
                 break
@@ -388,36 +401,31 @@ class CompleteAmericanoTournament:
                 "coverage_status": self.check_coverage_status()
             }
         rondas = []
-        
+        match_id = 0
+
         for round_num, matches in enumerate(tournament_schedule, 1):
             playing = set()
             for match in matches:
                 playing.update(match["players"])
-            descansan = [p for p in self.players if p not in playing]
-            
+            descansan = tuple(p for p in self.players if p not in playing)
+
             partidos = []
             for match in matches:
                 p1, p2, p3, p4 = match["players"]
-                helpers = match["helpers"]
-                
-                valido_para = [p for p in [p1, p2, p3, p4] if p not in helpers]
-                
-                partido = {
-                    "cancha": match["field"] + 1,
-                    "pareja1": [p1, p2],
-                    "pareja2": [p3, p4],
-                    "ayudantes": helpers,
-                    "valido_para": valido_para
-                }
-                partidos.append(partido)
-            
-            ronda_data = {
-                "ronda": round_num,
-                "partidos": partidos,
-                "descansan": descansan
-            }
-            rondas.append(ronda_data)
-        
+                partidos.append(Match(
+                    id=match_id,
+                    ronda=round_num,
+                    cancha=match["field"] + 1,
+                    pareja1=(p1, p2),
+                    pareja2=(p3, p4),
+                    ayudantes=tuple(match["helpers"]),
+                ))
+                match_id += 1
+
+            rondas.append(Round(round_num, tuple(partidos), descansan))
+
+        fixture = Fixture(tuple(rondas), tuple(self.players), MODO_INDIVIDUAL)
+
         # Create summary DataFrame
         resumen_data = []
         for player in self.players:
@@ -440,7 +448,7 @@ class CompleteAmericanoTournament:
         resumen_df = pd.DataFrame(resumen_data)
         
         output = {
-            "rondas": rondas,
+            "fixture": fixture,
             "resumen": resumen_df,
             "stats": {
                 "total_rounds": len(rondas),
@@ -449,7 +457,8 @@ class CompleteAmericanoTournament:
                 "minimum_games": stats["minimum_games"],
                 "games_distribution": stats["games_played"],
                 "helper_distribution": stats["helper_games"],
-                "coverage_status": stats["coverage_status"]
+                "coverage_status": stats["coverage_status"],
+                "descansos": RestMetrics.desde_fixture(fixture).resumen()
             }
         }
         
@@ -470,7 +479,7 @@ def generar_torneo_cobertura_completa(jugadores: List[str], num_canchas: int,
         seed: Random seed (optional, for reproducibility)
     
     Returns:
-        Dictionary with 'rondas', 'resumen', and 'stats'
+        Dictionary with 'fixture', 'resumen', and 'stats'
     """
     if seed:
         random.seed(seed)
@@ -1,11 +1,8 @@
 import streamlit as st
 from collections import defaultdict
 import random
-import pandas as pd
-import seaborn as sns
-import matplotlib.pyplot as plt
-import numpy as np
-import itertools
+from models.fixture import Fixture, Round, Match, MODO_INDIVIDUAL
+from models.rests import RestMetrics
 
 class AmericanoPadelTournament:
     """Mixed Americano Tournament - Men & Women pairs with helper logic"""
@@ -227,6 +224,7 @@ class AmericanoPadelTournament:
         final_min_matches = min(min_matches_played, self.target_matches)
         
         player_current_counts = defaultdict(int)
+        match_id = 0
 
         for round_num, round_data in enumerate(self.rounds, 1):
             partidos = []
@@ -236,32 +234,27 @@ class AmericanoPadelTournament:
                 all_players_in_match = list(team1) + list(team2)
                 
                 helpers = []
-                valido_para = []
                 
                 for player in all_players_in_match:
                     matches_before_this = player_current_counts[player]
                     
+                    # Match.valido_para excluye a los ayudantes
                     if matches_before_this >= final_min_matches:
                         helpers.append(player)
-                    else:
-                        valido_para.append(player)
                         
                     player_current_counts[player] += 1 
 
-                partido = {
-                    "cancha": cancha_num,
-                    "pareja1": list(team1),
-                    "pareja2": list(team2),
-                    "ayudantes": helpers,
-                    "valido_para": valido_para if valido_para else all_players_in_match
-                }
-                partidos.append(partido)
+                partidos.append(Match(
+                    id=match_id,
+                    ronda=round_num,
+                    cancha=cancha_num,
+                    pareja1=tuple(team1),
+                    pareja2=tuple(team2),
+                    ayudantes=tuple(helpers),
+                ))
+                match_id += 1
             
-            formatted_rounds.append({
-                "ronda": round_num,
-                "partidos": partidos,
-                "descansan": round_data['resting']
-            })
+            formatted_rounds.append(Round(round_num, tuple(partidos), tuple(round_data['resting'])))
         
         # Generate summary with valid vs helper games
         resumen_data = []
@@ -278,10 +271,12 @@ class AmericanoPadelTournament:
                 "Descansos": len(self.rounds) - total_matches
             })
         
+        fixture = Fixture(tuple(formatted_rounds), tuple(all_players), MODO_INDIVIDUAL)
         return {
-            "rondas": formatted_rounds,
+            "fixture": fixture,
             "resumen": resumen_data,
-            "min_matches": final_min_matches
+            "min_matches": final_min_matches,
+            "descansos": RestMetrics.desde_fixture(fixture).resumen()
         }
 
 
@@ -297,102 +292,36 @@ def generar_torneo_mixto(male_players, female_players, num_canchas, puntos_parti
     
 def get_unique_players(fixture):
     """Devuelve lista ordenada de jugadores únicos del fixture."""
-    return sorted({p for r in fixture for m in r["partidos"] for p in (m["pareja1"] + m["pareja2"])})
+    return sorted({p for m in fixture.partidos for p in m.jugadores})
 
 def plot_heatmap(matrix, title, cmap, cbar_label):
-    """Genera y muestra un mapa de calor triangular superior."""
-    mask = np.tril(np.ones_like(matrix, dtype=bool))
-    fig, ax = plt.subplots(figsize=(8, 6))
-    sns.heatmap(matrix, mask=mask, annot=True, fmt="d", cmap=cmap, ax=ax,
-                cbar_kws={"label": cbar_label})
-    plt.title(title)
-    st.pyplot(fig)
+    """Genera y muestra un mapa de calor triangular superior (gráfico del lado del cliente)."""
+    from assets.analyze_funcs import plot_heatmap as _plot_heatmap
+    _plot_heatmap(matrix, title, cmap, cbar_label)
 
 def analyze_descansos(fixture, players):
     """Analiza descansos consecutivos y genera mapa de calor."""
-    descanso_data = []
-    for p in players:
-        pattern = [1 if p in r["descansan"] else 0 for r in fixture]
-        descanso_data.append(pattern)
-
-    df_desc = pd.DataFrame(descanso_data, index=players)
-    df_desc["consec_descansos"] = df_desc.apply(
-        lambda x: max((sum(1 for _ in g) for k, g in itertools.groupby(x) if k == 1), default=0), axis=1
-    )
-
-    st.dataframe(df_desc[["consec_descansos"]].rename(columns={"consec_descansos": "Descansos consecutivos"}))
-
-    fig, ax = plt.subplots(figsize=(8, 4))
-    sns.heatmap(pd.DataFrame(descanso_data, index=players), cmap="YlOrRd", cbar=False, ax=ax)
-    plt.title("Mapa de descansos por ronda (1 = descanso)")
-    plt.xlabel("Ronda")
-    plt.ylabel("Jugador")
-    st.pyplot(fig)
+    from assets.analyze_funcs import analyze_descansos as _analyze_descansos
+    _analyze_descansos(fixture, players)
 
 def build_matrices(fixture, players):
     """Construye matrices de parejas y enfrentamientos."""
-    matrix_parejas = pd.DataFrame(0, index=players, columns=players)
-    matrix_enfrentamientos = pd.DataFrame(0, index=players, columns=players)
-
-    for ronda in fixture:
-        for partido in ronda["partidos"]:
-            p1, p2 = partido["pareja1"], partido["pareja2"]
-
-            # compañeros
-            for a, b in itertools.combinations(p1, 2):
-                matrix_parejas.loc[a, b] += 1
-                matrix_parejas.loc[b, a] += 1
-            for a, b in itertools.combinations(p2, 2):
-                matrix_parejas.loc[a, b] += 1
-                matrix_parejas.loc[b, a] += 1
-
-            # enfrentamientos
-            for a in p1:
-                for b in p2:
-                    matrix_enfrentamientos.loc[a, b] += 1
-                    matrix_enfrentamientos.loc[b, a] += 1
-
-    return matrix_parejas, matrix_enfrentamientos
+    from assets.analyze_funcs import build_matrices as _build_matrices
+    return _build_matrices(fixture, players)
 
 
 def heatmap_parejas_mixtas_visualizar(matrix, male_players, female_players):
     """
     Toma la matriz Hombre-Mujer y la grafica en Streamlit.
     """
-    fig, ax = plt.subplots(figsize=(len(male_players) * 1.5, len(female_players) * 1.5))
-    sns.heatmap(matrix, annot=True, fmt="d", cmap="Purples", linewidths=.5, linecolor='black', ax=ax,
-                cbar_kws={"label": "Veces como Pareja Mixta"})
-    ax.set_title("Combinaciones de Parejas Mixtas (Hombre vs. Mujer) 🤝")
-    ax.set_xlabel("Hombres")
-    ax.set_ylabel("Mujeres")
-    st.pyplot(fig)
+    from assets.analyze_funcs import heatmap_chart
+    chart = heatmap_chart(matrix, "Combinaciones de Parejas Mixtas (Hombre vs. Mujer) 🤝", "Purples",
+                          "Veces como Pareja Mixta", x_title="Hombres", y_title="Mujeres")
+    st.altair_chart(chart, use_container_width=True)
 
 def heatmap_parejas_mixtas(fixture, male_players, female_players):
-    # Crear matriz mujer vs hombre
-    matrix = pd.DataFrame(0, index=female_players, columns=male_players)
-
-    for ronda in fixture:
-        for partido in ronda["partidos"]:
-            p1a, p1b = partido["pareja1"]
-            p2a, p2b = partido["pareja2"]
-
-            # --- Pareja 1 ---
-            # Detectar quién es mujer y quién es hombre
-            for f, m in [(p1a, p1b), (p1b, p1a)]:
-                if f in female_players and m in male_players:
-                    matrix.loc[f, m] += 1
-
-            # --- Pareja 2 ---
-            for f, m in [(p2a, p2b), (p2b, p2a)]:
-                if f in female_players and m in male_players:
-                    matrix.loc[f, m] += 1
-
-    # === Heatmap ===
-    fig, ax = plt.subplots(figsize=(6, 4))
-    sns.heatmap(matrix, annot=True, cmap="Purples", linewidths=.5, ax=ax)
-    ax.set_title("Combinaciones de Parejas Mixtas (Mujer con Hombre)")
-
-    return matrix, fig
+    from assets.analyze_funcs import heatmap_parejas_mixtas as _heatmap_parejas_mixtas
+    return _heatmap_parejas_mixtas(fixture, male_players, female_players)
 
 
 def analyze_algorithm_results(fixture, male_players, female_players):
@@ -3,6 +3,7 @@ from typing import List, Dict, Any, Tuple
 from collections import deque
 import math
 import itertools
+from models.fixture import Fixture, MODO_PAREJAS
 
 class FixedPairsTournament:
     def __init__(self, pairs: List[str], num_fields: int):
@@ -141,7 +142,7 @@ class FixedPairsTournament:
         ])
         
         return {
-            "rondas": rounds,
+            "fixture": Fixture.from_rounds(rounds, self.team_names, MODO_PAREJAS),
             "resumen": resumen_df,
             "stats": {
                 "total_rounds": len(rounds),
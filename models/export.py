@@ -0,0 +1,128 @@
+"""Exportación del fixture y los resultados: CSV, XLSX y planilla PDF por cancha.
+
+Cada formato recorre el fixture una sola vez y escribe fila por fila (CSV con
+``csv.writer``, XLSX con un libro ``write_only`` de openpyxl, PDF con fpdf2),
+sin armar DataFrames por ronda. openpyxl y fpdf2 son opcionales: si no están
+instalados solo se ofrece CSV (``FORMATOS`` tiene los disponibles).
+"""
+import csv
+import io
+from typing import Iterator, Tuple
+
+from models.results import ResultsStore
+
+try:
+    from openpyxl import Workbook
+except ImportError:  # pragma: no cover - dependencia opcional
+    Workbook = None
+
+try:
+    from fpdf import FPDF
+except ImportError:  # pragma: no cover - dependencia opcional
+    FPDF = None
+
+
+def columnas(unidad: str = "Puntos") -> Tuple[str, ...]:
+    return ("Ronda", "Turno", "Cancha", "Pareja 1", "Pareja 2",
+            f"{unidad} 1", f"{unidad} 2", "Ayudantes", "Descansan")
+
+
+def _marcador(resultados: ResultsStore, match_id: int):
+    """Puntaje del partido, o None si todavía no se jugó (0-0 cuenta como no jugado)."""
+    score = resultados.get(match_id)
+    return None if score == (0, 0) else score
+
+
+def filas(resultados: ResultsStore) -> Iterator[tuple]:
+    """
+    Una fila por partido en el orden de ``columnas``. Los que descansan van en
+    la primera fila de cada ronda (o en una fila sin partido si la ronda no tiene).
+    """
+    for ronda in resultados.fixture:
+        descansan = ", ".join(ronda.descansan)
+        if not ronda.partidos:
+            yield (ronda.ronda, "", "", "", "", "", "", "", descansan)
+            continue
+        for m in ronda.partidos:
+            score = _marcador(resultados, m.id) or ("", "")
+            yield (m.ronda, m.turno, m.cancha, m.etiqueta1, m.etiqueta2,
+                   score[0], score[1], ", ".join(m.ayudantes), descansan)
+            descansan = ""
+
+
+def exportar_csv(resultados: ResultsStore, unidad: str = "Puntos") -> bytes:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(columnas(unidad))
+    writer.writerows(filas(resultados))
+    # BOM para que Excel reconozca los acentos
+    return buffer.getvalue().encode("utf-8-sig")
+
+
+def exportar_xlsx(resultados: ResultsStore, unidad: str = "Puntos") -> bytes:
+    libro = Workbook(write_only=True)
+    hoja = libro.create_sheet("Fixture")
+    hoja.append(columnas(unidad))
+    for fila in filas(resultados):
+        hoja.append(fila)
+    buffer = io.BytesIO()
+    libro.save(buffer)
+    return buffer.getvalue()
+
+
+def _latin1(texto) -> str:
+    # Las fuentes base del PDF solo cubren latin-1 (acentos y ñ incluidos)
+    return str(texto).encode("latin-1", "replace").decode("latin-1")
+
+
+def exportar_pdf(resultados: ResultsStore, unidad: str = "Puntos") -> bytes:
+    """Planilla imprimible: un bloque por ronda (nunca partido entre páginas) con casilleros de resultado."""
+    pdf = FPDF(format="A4")
+    pdf.set_auto_page_break(True, margin=15)
+    pdf.set_title(f"Fixture {resultados.torneo_id}")
+    pdf.add_page()
+    pdf.set_font("Helvetica", "B", 16)
+    pdf.cell(0, 10, _latin1(f"Fixture - torneo {resultados.torneo_id}"), new_x="LMARGIN", new_y="NEXT", align="C")
+    pdf.ln(2)
+
+    anchos = (18, 68, 68, 36)  # Cancha, Pareja 1, Pareja 2, resultado
+    for ronda in resultados.fixture:
+        with pdf.unbreakable() as doc:
+            doc.set_font("Helvetica", "B", 12)
+            doc.set_fill_color(94, 49, 135)
+            doc.set_text_color(255, 255, 255)
+            doc.cell(sum(anchos), 8, _latin1(f"Ronda {ronda.ronda}"), fill=True, new_x="LMARGIN", new_y="NEXT")
+            doc.set_text_color(0, 0, 0)
+            doc.set_font("Helvetica", "B", 9)
+            for ancho, titulo in zip(anchos, ("Cancha", "Pareja 1", "Pareja 2", unidad)):
+                doc.cell(ancho, 7, titulo, border=1, align="C")
+            doc.ln()
+
+            doc.set_font("Helvetica", "", 10)
+            for m in ronda.partidos:
+                score = _marcador(resultados, m.id)
+                resultado = f"{score[0]}  -  {score[1]}" if score else "____  -  ____"
+                cancha = str(m.cancha) if m.turno == 1 else f"{m.cancha} (T{m.turno})"
+                celdas = (cancha, m.etiqueta1, m.etiqueta2, resultado)
+                for ancho, texto in zip(anchos, celdas):
+                    doc.cell(ancho, 9, _latin1(texto), border=1, align="C")
+                doc.ln()
+                if m.ayudantes:
+                    doc.set_font("Helvetica", "I", 8)
+                    doc.cell(sum(anchos), 5, _latin1("Ayudantes: " + ", ".join(m.ayudantes)),
+                             new_x="LMARGIN", new_y="NEXT")
+                    doc.set_font("Helvetica", "", 10)
+            if ronda.descansan:
+                doc.set_font("Helvetica", "I", 9)
+                doc.multi_cell(sum(anchos), 6, _latin1("Descansan: " + ", ".join(ronda.descansan)),
+                               new_x="LMARGIN", new_y="NEXT")
+            doc.ln(4)
+    return bytes(pdf.output())
+
+
+# formato -> (exportador, mime, etiqueta del botón); solo los que se pueden generar
+FORMATOS = {"csv": (exportar_csv, "text/csv", "CSV")}
+if Workbook is not None:
+    FORMATOS["xlsx"] = (exportar_xlsx, "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet", "Excel")
+if FPDF is not None:
+    FORMATOS["pdf"] = (exportar_pdf, "application/pdf", "PDF (planillas)")
@@ -0,0 +1,158 @@
+"""Modelo común de fixture para todos los motores de torneo.
+
+Todos los generadores (todos contra todos, mixto, parejas fijas y sets) emiten
+un ``Fixture`` compuesto por ``Round`` y ``Match``. Las páginas y los rankings
+solo consumen este modelo, así que no hace falta reconstruir strings como
+``" & ".join(pareja)`` para identificar un partido.
+
+Un "participante" es la unidad que suma puntos en el ranking: un jugador en los
+modos individuales y una pareja (equipo) en los modos de parejas fijas.
+"""
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, Iterator, Optional, Sequence, Tuple
+
+MODO_INDIVIDUAL = "individual"
+MODO_PAREJAS = "parejas"
+
+
+@dataclass(frozen=True, slots=True)
+class Match:
+    """Un partido en una cancha. ``id`` es estable dentro de su fixture."""
+    id: int
+    ronda: int
+    cancha: int
+    pareja1: Tuple[str, ...]
+    pareja2: Tuple[str, ...]
+    ayudantes: Tuple[str, ...] = ()
+    turno: int = 1
+    etiqueta1: str = field(init=False, repr=False, compare=False)
+    etiqueta2: str = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        object.__setattr__(self, "etiqueta1", " & ".join(self.pareja1))
+        object.__setattr__(self, "etiqueta2", " & ".join(self.pareja2))
+
+    @property
+    def jugadores(self) -> Tuple[str, ...]:
+        return self.pareja1 + self.pareja2
+
+    @property
+    def valido_para(self) -> Tuple[str, ...]:
+        """Participantes cuyo resultado cuenta (todos menos los ayudantes)."""
+        if not self.ayudantes:
+            return self.jugadores
+        # Si todos son ayudantes el partido cuenta para todos (igual que en los motores).
+        return tuple(p for p in self.jugadores if p not in self.ayudantes) or self.jugadores
+
+    def lado_de(self, participante: str) -> Optional[int]:
+        """Devuelve 0 si juega en la pareja 1, 1 si juega en la pareja 2."""
+        if participante in self.pareja1:
+            return 0
+        if participante in self.pareja2:
+            return 1
+        return None
+
+
+@dataclass(frozen=True, slots=True)
+class Round:
+    ronda: int
+    partidos: Tuple[Match, ...]
+    descansan: Tuple[str, ...] = ()
+
+
+@dataclass(frozen=True, slots=True)
+class Fixture:
+    """Fixture completo: rondas en orden y la lista ordenada de participantes."""
+    rondas: Tuple[Round, ...]
+    participantes: Tuple[str, ...]
+    modo: str = MODO_INDIVIDUAL
+    partidos: Tuple[Match, ...] = field(init=False, repr=False, compare=False)
+    indice: Dict[str, Tuple[int, ...]] = field(init=False, repr=False, compare=False)
+    descansos: Dict[str, Tuple[int, ...]] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        # Los ids son consecutivos, así que partidos[match_id] es el partido.
+        partidos = tuple(m for r in self.rondas for m in r.partidos)
+        object.__setattr__(self, "partidos", partidos)
+
+        # Índice invertido participante -> ids de sus partidos (en orden de ronda)
+        indice = {p: [] for p in self.participantes}
+        for m in partidos:
+            for p in m.jugadores:
+                indice.setdefault(p, []).append(m.id)
+        object.__setattr__(self, "indice", {p: tuple(ids) for p, ids in indice.items()})
+
+        # Participante -> números de ronda en que descansa
+        descansos = {p: [] for p in self.participantes}
+        for r in self.rondas:
+            for p in r.descansan:
+                descansos.setdefault(p, []).append(r.ronda)
+        object.__setattr__(self, "descansos", {p: tuple(rs) for p, rs in descansos.items()})
+
+    def __iter__(self) -> Iterator[Round]:
+        return iter(self.rondas)
+
+    def __len__(self) -> int:
+        return len(self.rondas)
+
+    def matches_of(self, participante: str) -> Tuple[Match, ...]:
+        """Partidos de un participante, O(k) para sus k partidos."""
+        return tuple(self.partidos[i] for i in self.indice.get(participante, ()))
+
+    def rests_of(self, participante: str) -> Tuple[int, ...]:
+        """Rondas en que descansa un participante."""
+        return self.descansos.get(participante, ())
+
+    @property
+    def has_helpers(self) -> bool:
+        return any(m.ayudantes for m in self.partidos)
+
+    @classmethod
+    def from_rounds(cls, rondas: Iterable[dict], participantes: Sequence[str],
+                    modo: str = MODO_INDIVIDUAL) -> "Fixture":
+        """
+        Construye el fixture a partir de rondas en el formato de los motores:
+        ``{"ronda", "partidos": [{"cancha", "pareja1", "pareja2", ...}], "descansan"}``.
+
+        ``pareja1``/``pareja2`` pueden ser listas de jugadores o el nombre de un
+        equipo (parejas fijas); ``ayudantes`` y ``turno`` son opcionales.
+        """
+        built = []
+        next_id = 0
+        for num, ronda in enumerate(rondas, start=1):
+            num_ronda = ronda.get("ronda", num)
+            partidos = []
+            for partido in ronda["partidos"]:
+                partidos.append(Match(
+                    id=next_id,
+                    ronda=num_ronda,
+                    cancha=partido["cancha"],
+                    pareja1=_as_side(partido["pareja1"]),
+                    pareja2=_as_side(partido["pareja2"]),
+                    ayudantes=tuple(partido.get("ayudantes") or ()),
+                    turno=partido.get("turno", 1),
+                ))
+                next_id += 1
+            built.append(Round(num_ronda, tuple(partidos), tuple(ronda.get("descansan", ()))))
+        return cls(tuple(built), tuple(participantes), modo)
+
+    def to_rounds(self) -> list:
+        """Inversa de ``from_rounds`` (serializable a JSON); los ids se reconstruyen iguales."""
+        return [
+            {
+                "ronda": r.ronda,
+                "partidos": [
+                    {"cancha": m.cancha, "pareja1": list(m.pareja1), "pareja2": list(m.pareja2),
+                     "ayudantes": list(m.ayudantes), "turno": m.turno}
+                    for m in r.partidos
+                ],
+                "descansan": list(r.descansan),
+            }
+            for r in self.rondas
+        ]
+
+
+def _as_side(pareja) -> Tuple[str, ...]:
+    if isinstance(pareja, str):
+        return (pareja,)
+    return tuple(pareja)
@@ -0,0 +1,216 @@
+"""Diario en disco de un torneo en curso: log de resultados + snapshots.
+
+Cada resultado se agrega como una línea JSON a ``log.jsonl`` (append + fsync)
+antes de considerarse guardado, así que un refresh del navegador, un reinicio
+del servidor o "Volver y Reiniciar" no pierden nada.
+
+Cada ``SNAPSHOT_CADA`` resultados se escribe ``snapshot.json`` de forma atómica
+(archivo temporal + ``os.replace``) con el fixture, la configuración, los
+resultados con su versión y las estadísticas del ledger; después el log se
+vacía. Retomar lee el snapshot y aplica solo la cola del log (las líneas con
+``seq`` mayor a la del snapshot), sin regenerar el fixture ni recalcular el
+ranking desde cero. Una última línea cortada por un corte de luz se ignora.
+
+Los diarios sin cambios hace más de ``RETENCION_DIAS`` (terminados o
+abandonados) se borran con ``podar_diarios``.
+"""
+import json
+import os
+import shutil
+import threading
+import time
+from typing import Dict, List
+
+from models.fixture import Fixture
+from models.ledger import StandingsLedger
+from models.results import ResultsStore
+from models.tiebreak import MODO_PUNTOS
+
+JOURNAL_DIR = os.path.join("data", "torneos")
+SNAPSHOT_CADA = 50
+RETENCION_DIAS = 14
+
+_SNAPSHOT = "snapshot.json"
+_LOG = "log.jsonl"
+_CERRADO = "cerrado"
+
+
+def _escribir_atomico(path: str, texto: str):
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(texto)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+class TournamentJournal:
+    """
+    Estado materializado de un torneo (resultados + ledger) respaldado en disco.
+    Una instancia por torneo y por proceso; ``append`` es seguro entre hilos.
+    """
+
+    def __init__(self, torneo_id: str, fixture: Fixture, config: dict,
+                 modo: str = MODO_PUNTOS, base: str = JOURNAL_DIR):
+        self.torneo_id = torneo_id
+        self.dir = os.path.join(base, torneo_id)
+        self.fixture = fixture
+        self.config = config
+        self.modo = modo
+        self.resultados = ResultsStore(fixture, torneo_id=torneo_id)
+        self.ledger = StandingsLedger(self.resultados, modo)
+        self.seq = 0
+        self._seq_snapshot = 0
+        self._lock = threading.Lock()
+        # Último resultado registrado (o apertura) en este proceso
+        self.actualizado = time.time()
+
+    @classmethod
+    def create(cls, torneo_id: str, fixture: Fixture, config: dict,
+               modo: str = MODO_PUNTOS, base: str = JOURNAL_DIR) -> "TournamentJournal":
+        """Diario nuevo; si ya hay uno en disco para ese torneo lo abre."""
+        if os.path.exists(os.path.join(base, torneo_id, _SNAPSHOT)):
+            return cls.open(torneo_id, base)
+        diario = cls(torneo_id, fixture, config, modo, base)
+        os.makedirs(diario.dir, exist_ok=True)
+        diario.snapshot()
+        return diario
+
+    @classmethod
+    def open(cls, torneo_id: str, base: str = JOURNAL_DIR) -> "TournamentJournal":
+        """Reconstruye el estado desde el snapshot más la cola del log."""
+        directorio = os.path.join(base, torneo_id)
+        with open(os.path.join(directorio, _SNAPSHOT), encoding="utf-8") as f:
+            snap = json.load(f)
+        fixture = Fixture.from_rounds(snap["rondas"], snap["participantes"], snap["modo_fixture"])
+        diario = cls(torneo_id, fixture, snap["config"], snap["modo"], base)
+        for match_id, s1, s2, version in snap["resultados"]:
+            diario.resultados.set(match_id, s1, s2, version)
+        diario.ledger.restore(snap["standings"])
+        diario.seq = diario._seq_snapshot = snap["seq"]
+
+        for entrada in _leer_entradas(os.path.join(directorio, _LOG)):
+            if entrada["seq"] <= diario.seq:
+                continue
+            diario._aplicar(entrada["match_id"], entrada["s1"], entrada["s2"], entrada["version"])
+            diario.seq = entrada["seq"]
+        # Compacta: la cola pasa al snapshot y se descarta una posible línea cortada
+        diario.snapshot()
+        return diario
+
+    def _aplicar(self, match_id: int, s1: int, s2: int, version: int):
+        anterior = self.resultados.set(match_id, s1, s2, version)
+        self.ledger.apply(self.fixture.partidos[match_id], anterior, (s1, s2))
+
+    def append(self, match_id: int, s1: int, s2: int, version: int) -> int:
+        """Registra un resultado (durable al volver) y devuelve su número de secuencia."""
+        with self._lock:
+            self.seq += 1
+            entrada = {"seq": self.seq, "match_id": match_id, "s1": s1, "s2": s2,
+                       "version": version, "t": round(time.time(), 3)}
+            with open(os.path.join(self.dir, _LOG), "a", encoding="utf-8") as f:
+                f.write(json.dumps(entrada) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+            self._aplicar(match_id, s1, s2, version)
+            self.actualizado = entrada["t"]
+            if self.seq - self._seq_snapshot >= SNAPSHOT_CADA:
+                self._snapshot_locked()
+            return self.seq
+
+    def standings(self):
+        """Ranking actual (``StandingsLedger.to_dataframe``) y la secuencia a la que corresponde."""
+        with self._lock:
+            return self.seq, self.ledger.to_dataframe()
+
+    def snapshot(self):
+        with self._lock:
+            self._snapshot_locked()
+
+    def _snapshot_locked(self):
+        snap = {
+            "torneo_id": self.torneo_id,
+            "seq": self.seq,
+            "config": self.config,
+            "modo": self.modo,
+            "modo_fixture": self.fixture.modo,
+            "participantes": list(self.fixture.participantes),
+            "rondas": self.fixture.to_rounds(),
+            "resultados": [[m.id, s1, s2, self.resultados.version(m.id)] for m, (s1, s2) in self.resultados.items()],
+            "standings": self.ledger.snapshot(),
+            "actualizado": time.time(),
+        }
+        _escribir_atomico(os.path.join(self.dir, _SNAPSHOT), json.dumps(snap, ensure_ascii=False))
+        # Todo lo del log ya está en el snapshot
+        _escribir_atomico(os.path.join(self.dir, _LOG), "")
+        self._seq_snapshot = self.seq
+
+    def close(self):
+        """Marca el torneo como terminado: deja de ofrecerse para retomar."""
+        with self._lock:
+            self._snapshot_locked()
+            _escribir_atomico(os.path.join(self.dir, _CERRADO), str(time.time()))
+
+
+def torneos_activos(base: str = JOURNAL_DIR, limite: int = 5) -> List[Dict]:
+    """
+    Torneos con diario abierto, del más reciente al más antiguo:
+    ``{"torneo_id", "config", "resultados", "actualizado"}``.
+    """
+    if not os.path.isdir(base):
+        return []
+    activos = []
+    for torneo_id in os.listdir(base):
+        directorio = os.path.join(base, torneo_id)
+        snap = os.path.join(directorio, _SNAPSHOT)
+        if not os.path.exists(snap) or os.path.exists(os.path.join(directorio, _CERRADO)):
+            continue
+        log = os.path.join(directorio, _LOG)
+        actualizado = max(os.path.getmtime(snap), os.path.getmtime(log) if os.path.exists(log) else 0)
+        activos.append((actualizado, torneo_id, directorio))
+    activos.sort(reverse=True)
+
+    out = []
+    for actualizado, torneo_id, directorio in activos[:limite]:
+        try:
+            with open(os.path.join(directorio, _SNAPSHOT), encoding="utf-8") as f:
+                snap = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            continue
+        partidos = {fila[0] for fila in snap["resultados"]}
+        partidos.update(e["match_id"] for e in _leer_entradas(os.path.join(directorio, _LOG)))
+        out.append({"torneo_id": torneo_id, "config": snap["config"],
+                    "resultados": len(partidos), "actualizado": actualizado})
+    return out
+
+
+def podar_diarios(base: str = JOURNAL_DIR, dias: int = RETENCION_DIAS) -> int:
+    """Borra los diarios sin cambios hace más de ``dias`` días; devuelve cuántos borró."""
+    if not os.path.isdir(base):
+        return 0
+    limite = time.time() - dias * 24 * 3600
+    borrados = 0
+    for torneo_id in os.listdir(base):
+        directorio = os.path.join(base, torneo_id)
+        try:
+            ultimo = max((os.path.getmtime(os.path.join(directorio, nombre)) for nombre in os.listdir(directorio)),
+                         default=os.path.getmtime(directorio))
+        except OSError:
+            continue
+        if ultimo < limite:
+            shutil.rmtree(directorio, ignore_errors=True)
+            borrados += 1
+    return borrados
+
+
+def _leer_entradas(path: str) -> List[dict]:
+    if not os.path.exists(path):
+        return []
+    entradas = []
+    with open(path, encoding="utf-8") as f:
+        for linea in f:
+            try:
+                entradas.append(json.loads(linea))
+            except json.JSONDecodeError:
+                break  # escritura interrumpida: el resto no llegó a guardarse
+    return entradas
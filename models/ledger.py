@@ -0,0 +1,114 @@
+"""Tabla de posiciones incremental.
+
+Los callbacks de carga de puntaje aplican solo la diferencia entre el resultado
+anterior y el nuevo, así el ranking está siempre al día sin recalcularlo desde
+todos los resultados. Las claves de orden se mantienen en una lista ordenada
+(``bisect``): la posición de cualquier participante se obtiene en O(log n) y el
+top N en O(N).
+
+El orden usa los criterios de ``models.tiebreak``; el enfrentamiento directo
+solo se resuelve al armar el DataFrame y únicamente si quedan empates.
+"""
+from bisect import bisect_left, insort
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from models.fixture import Match, MODO_PAREJAS
+from models.results import ResultsStore
+from models.tiebreak import (MODO_PUNTOS, MODO_SETS, criterios_por_defecto, formatear,
+                             ordenar, tabla_estadisticas, tabla_larga)
+
+# Índices de las estadísticas por participante
+PF, PC, PJ, PG = range(4)
+
+_VALOR_CRITERIO = {
+    "puntos": lambda s: s[PF],
+    "a_favor": lambda s: s[PF],
+    "victorias": lambda s: s[PG],
+    "diferencia": lambda s: s[PF] - s[PC],
+    "promedio": lambda s: s[PF] / s[PJ] if s[PJ] else 0.0,
+}
+
+
+class StandingsLedger:
+    """
+    Estadísticas acumuladas por participante: puntos (o sets) a favor y en
+    contra, partidos jugados y ganados. Un resultado 0-0 cuenta como no jugado.
+    """
+    __slots__ = ("resultados", "fixture", "modo", "criterios", "_valores", "_stats", "_pos", "_orden")
+
+    def __init__(self, resultados: ResultsStore, modo: str = MODO_PUNTOS,
+                 criterios: Optional[Sequence[str]] = None):
+        self.resultados = resultados
+        self.fixture = fixture = resultados.fixture
+        self.modo = modo
+        self.criterios = tuple(criterios or criterios_por_defecto(modo))
+        self._valores = [_VALOR_CRITERIO[c] for c in self.criterios if c in _VALOR_CRITERIO]
+        self._stats: Dict[str, List[int]] = {p: [0, 0, 0, 0] for p in fixture.participantes}
+        # Desempate estable por orden de inscripción
+        self._pos = {p: i for i, p in enumerate(fixture.participantes)}
+        self._orden: List[Tuple[int, ...]] = sorted(self._key(p) for p in fixture.participantes)
+
+    def _key(self, participante: str) -> Tuple[float, ...]:
+        stats = self._stats[participante]
+        return tuple(-valor(stats) for valor in self._valores) + (self._pos[participante],)
+
+    def _acumular(self, stats: List[int], propio: int, rival: int, signo: int):
+        if propio == 0 and rival == 0:
+            return
+        stats[PF] += signo * propio
+        stats[PC] += signo * rival
+        stats[PJ] += signo
+        if propio > rival:
+            stats[PG] += signo
+
+    def apply(self, match: Match, old: Tuple[int, int], new: Tuple[int, int]):
+        """Aplica el cambio de resultado ``old`` -> ``new`` de un partido."""
+        if old == new:
+            return
+        for p in match.valido_para:
+            if p not in self._stats:
+                continue
+            lado = match.lado_de(p)
+            del self._orden[bisect_left(self._orden, self._key(p))]
+            stats = self._stats[p]
+            if lado == 0:
+                self._acumular(stats, old[0], old[1], -1)
+                self._acumular(stats, new[0], new[1], +1)
+            else:
+                self._acumular(stats, old[1], old[0], -1)
+                self._acumular(stats, new[1], new[0], +1)
+            insort(self._orden, self._key(p))
+
+    def snapshot(self) -> Dict[str, List[int]]:
+        """Estadísticas acumuladas por participante (serializable a JSON)."""
+        return {p: list(stats) for p, stats in self._stats.items()}
+
+    def restore(self, stats: Dict[str, Sequence[int]]):
+        """Carga estadísticas guardadas con ``snapshot`` sin volver a aplicar los resultados."""
+        for p, valores in stats.items():
+            if p in self._stats:
+                self._stats[p] = [int(v) for v in valores]
+        self._orden = sorted(self._key(p) for p in self.fixture.participantes)
+
+    def rank_of(self, participante: str) -> int:
+        """Posición (1 = primero) del participante, sin aplicar enfrentamiento directo."""
+        return bisect_left(self._orden, self._key(participante)) + 1
+
+    def top(self, n: int) -> List[str]:
+        participantes = self.fixture.participantes
+        return [participantes[key[-1]] for key in self._orden[:n]]
+
+    def stats_of(self, participante: str) -> Dict[str, int]:
+        pf, pc, pj, pg = self._stats[participante]
+        return {"a_favor": pf, "en_contra": pc, "jugados": pj, "ganados": pg}
+
+    def to_dataframe(self) -> pd.DataFrame:
+        """Ranking con desempates completos, con las columnas de models.tiebreak.formatear."""
+        participantes = self.fixture.participantes
+        tabla = tabla_estadisticas(participantes, np.array([self._stats[p] for p in participantes]))
+        tabla = ordenar(tabla, self.criterios, lambda: tabla_larga(self.resultados))
+        name_col = "Pareja" if self.fixture.modo == MODO_PAREJAS else "Jugador"
+        return formatear(tabla, self.modo, name_col)
@@ -0,0 +1,104 @@
+"""Instrumentación liviana: spans de tiempo y contadores.
+
+Apagada por defecto. Mientras ``ACTIVO`` es False, ``span`` devuelve un context
+manager vacío compartido y ``contar`` vuelve en la primera línea, así que el
+costo en el camino caliente es una llamada y una lectura de variable global.
+Los contadores se incrementan donde ocurre lo que cuentan (por ejemplo cada
+evaluación de ``get_match_score`` del motor v4).
+
+Los tiempos se acumulan por nombre (cantidad, total y máximo) para todo el
+proceso. Con ``activar(log=ruta)`` cada span cerrado se agrega además como una
+línea JSON al archivo.
+"""
+import json
+import os
+import threading
+import time
+from contextlib import nullcontext
+from typing import Dict, List, Optional
+
+ACTIVO = os.environ.get("PADEL_PROFILING") == "1"
+LOG_PATH = os.path.join("data", "profiling.jsonl")
+
+_NULO = nullcontext()
+_lock = threading.Lock()
+# nombre -> [cantidad, total_s, max_s]
+_spans: Dict[str, List[float]] = {}
+_contadores: Dict[str, int] = {}
+_log = None
+
+
+class _Span:
+    __slots__ = ("nombre", "inicio")
+
+    def __init__(self, nombre: str):
+        self.nombre = nombre
+
+    def __enter__(self):
+        self.inicio = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        duracion = time.perf_counter() - self.inicio
+        with _lock:
+            acumulado = _spans.get(self.nombre)
+            if acumulado is None:
+                _spans[self.nombre] = [1, duracion, duracion]
+            else:
+                acumulado[0] += 1
+                acumulado[1] += duracion
+                if duracion > acumulado[2]:
+                    acumulado[2] = duracion
+            if _log is not None:
+                _log.write(json.dumps({"t": round(time.time(), 3), "span": self.nombre,
+                                       "ms": round(duracion * 1000, 3)}) + "\n")
+        return False
+
+
+def span(nombre: str):
+    """``with span("motor.ronda"):`` mide el bloque si la instrumentación está activa."""
+    if not ACTIVO:
+        return _NULO
+    return _Span(nombre)
+
+
+def contar(nombre: str, n: int = 1):
+    if not ACTIVO:
+        return
+    with _lock:
+        _contadores[nombre] = _contadores.get(nombre, 0) + n
+
+
+def activar(activo: bool = True, log: Optional[str] = None):
+    """Prende o apaga la instrumentación; ``log`` es la ruta del JSONL (None = sin archivo)."""
+    global ACTIVO, _log
+    with _lock:
+        if _log is not None:
+            _log.close()
+            _log = None
+        if activo and log:
+            os.makedirs(os.path.dirname(log) or ".", exist_ok=True)
+            # Con buffer de línea: cada span queda escrito al cerrarse
+            _log = open(log, "a", encoding="utf-8", buffering=1)
+        ACTIVO = activo
+
+
+def reiniciar():
+    with _lock:
+        _spans.clear()
+        _contadores.clear()
+
+
+def resumen() -> Dict[str, Dict]:
+    """``{"spans": {nombre: {cantidad, total_ms, prom_ms, max_ms}}, "contadores": {...}}``."""
+    with _lock:
+        spans = {
+            nombre: {"cantidad": int(n), "total_ms": round(total * 1000, 2),
+                     "prom_ms": round(total * 1000 / n, 3), "max_ms": round(maximo * 1000, 2)}
+            for nombre, (n, total, maximo) in sorted(_spans.items(), key=lambda kv: -kv[1][1])
+        }
+        return {"spans": spans, "contadores": dict(_contadores)}
+
+
+def logueando() -> bool:
+    return _log is not None
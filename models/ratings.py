@@ -0,0 +1,268 @@
+"""Rating Elo persistente entre torneos (SQLite local).
+
+Cada torneo se aplica como un único lote: todos los partidos del evento se
+evalúan con los ratings previos al evento y los cambios se acumulan con
+``np.add.at``. Guardar dos veces el mismo evento (por ejemplo tras corregir un
+resultado) revierte primero los cambios anteriores de ese evento, así que no se
+cuenta doble. ``recompute`` rehace toda la historia desde los partidos guardados
+(y desde los ratings iniciales cargados con ``seed``).
+
+El rating de un lado es el promedio de sus participantes; el resultado esperado
+es el Elo clásico y el real es la proporción de puntos (o sets) ganados. Los
+ayudantes aportan a la fuerza de su lado pero su rating no cambia. Las parejas
+fijas son otra escala: se guardan en su propia base (``DB_PATHS[MODO_PAREJAS]``)
+y no se mezclan con los jugadores individuales.
+"""
+import os
+import sqlite3
+import threading
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from models.fixture import MODO_INDIVIDUAL, MODO_PAREJAS
+
+DB_PATH = os.path.join("data", "ratings.sqlite3")
+# Una escala de ratings por tipo de participante
+DB_PATHS = {MODO_INDIVIDUAL: DB_PATH, MODO_PAREJAS: os.path.join("data", "ratings_parejas.sqlite3")}
+RATING_INICIAL = 1500.0
+K_FACTOR = 32.0
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jugadores (
+    nombre TEXT PRIMARY KEY,
+    rating REAL NOT NULL,
+    partidos INTEGER NOT NULL DEFAULT 0,
+    actualizado TEXT
+);
+CREATE TABLE IF NOT EXISTS eventos (
+    event_id TEXT PRIMARY KEY,
+    fecha TEXT NOT NULL,
+    nombre TEXT
+);
+CREATE TABLE IF NOT EXISTS partidos (
+    event_id TEXT NOT NULL,
+    match_id INTEGER NOT NULL,
+    lado INTEGER NOT NULL,
+    jugador TEXT NOT NULL,
+    valido INTEGER NOT NULL,
+    puntos INTEGER NOT NULL,
+    PRIMARY KEY (event_id, match_id, lado, jugador)
+);
+CREATE TABLE IF NOT EXISTS cambios (
+    event_id TEXT NOT NULL,
+    jugador TEXT NOT NULL,
+    delta REAL NOT NULL,
+    partidos INTEGER NOT NULL,
+    PRIMARY KEY (event_id, jugador)
+);
+CREATE TABLE IF NOT EXISTS semillas (
+    nombre TEXT PRIMARY KEY,
+    rating REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_partidos_jugador ON partidos (jugador);
+CREATE INDEX IF NOT EXISTS idx_cambios_jugador ON cambios (jugador);
+CREATE INDEX IF NOT EXISTS idx_jugadores_rating ON jugadores (rating DESC);
+"""
+
+# Fila de partido: (match_id, lado, jugador, valido, puntos del lado)
+FilaPartido = Tuple[int, int, str, int, int]
+
+
+def filas_desde_resultados(resultados) -> List[FilaPartido]:
+    """Convierte un ResultsStore en filas de partido (solo partidos jugados)."""
+    filas = []
+    for partido, (s1, s2) in resultados.items():
+        if s1 == 0 and s2 == 0:
+            continue
+        validos = partido.valido_para
+        for lado, (pareja, puntos) in enumerate(((partido.pareja1, s1), (partido.pareja2, s2))):
+            for p in pareja:
+                filas.append((partido.id, lado, p, int(p in validos), puntos))
+    return filas
+
+
+def calcular_deltas(filas: List[FilaPartido], ratings: Dict[str, float],
+                    k: float = K_FACTOR) -> Dict[str, Tuple[float, int]]:
+    """
+    Cambios de rating de un evento en lote: ``{jugador: (delta, partidos_validos)}``.
+    Todos los partidos usan los ratings previos al evento.
+    """
+    if not filas:
+        return {}
+    match_ids = np.array([f[0] for f in filas])
+    lados = np.array([f[1] for f in filas])
+    nombres = [f[2] for f in filas]
+    validos = np.array([f[3] for f in filas], dtype=bool)
+    puntos = np.array([f[4] for f in filas], dtype=float)
+
+    jugadores, j_idx = np.unique(np.array(nombres, dtype=object), return_inverse=True)
+    r = np.array([ratings.get(j, RATING_INICIAL) for j in jugadores])
+
+    partidos, m_idx = np.unique(match_ids, return_inverse=True)
+    n = len(partidos)
+    # Fuerza (promedio) y puntos de cada lado
+    suma = np.zeros((n, 2))
+    cuenta = np.zeros((n, 2))
+    pts = np.zeros((n, 2))
+    np.add.at(suma, (m_idx, lados), r[j_idx])
+    np.add.at(cuenta, (m_idx, lados), 1)
+    pts[m_idx, lados] = puntos
+    fuerza = suma / np.maximum(cuenta, 1)
+
+    esperado = 1.0 / (1.0 + 10 ** ((fuerza[:, 1] - fuerza[:, 0]) / 400.0))
+    total = pts.sum(axis=1)
+    real = np.divide(pts[:, 0], total, out=np.full(n, 0.5), where=total > 0)
+    delta_lado0 = k * (real - esperado)
+
+    delta_fila = np.where(lados == 0, delta_lado0[m_idx], -delta_lado0[m_idx]) * validos
+    deltas = np.zeros(len(jugadores))
+    jugados = np.zeros(len(jugadores), dtype=int)
+    np.add.at(deltas, j_idx, delta_fila)
+    np.add.at(jugados, j_idx, validos.astype(int))
+    return {j: (float(d), int(c)) for j, d, c in zip(jugadores, deltas, jugados) if c > 0}
+
+
+class RatingStore:
+    """Ratings por jugador con historial de eventos. Seguro para usar entre sesiones."""
+
+    def __init__(self, path: str = DB_PATH):
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock, self._conn:
+            self._conn.executescript(_SCHEMA)
+
+    def ratings(self, jugadores: Iterable[str]) -> Dict[str, float]:
+        """Rating actual de cada jugador (RATING_INICIAL si no tiene historial)."""
+        jugadores = list(jugadores)
+        out = {j: RATING_INICIAL for j in jugadores}
+        if not jugadores:
+            return out
+        marcas = ",".join("?" * len(jugadores))
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT nombre, rating FROM jugadores WHERE nombre IN ({marcas})", jugadores
+            ).fetchall()
+        out.update(dict(rows))
+        return out
+
+    def ladder(self, limit: int = 50) -> List[Tuple[str, float, int]]:
+        """
+        Tabla del club: ``(nombre, rating, partidos)`` de mayor a menor rating. Solo
+        quienes jugaron: un rating sembrado sin partidos no aparece.
+        """
+        with self._lock:
+            return self._conn.execute(
+                "SELECT nombre, rating, partidos FROM jugadores WHERE partidos > 0 "
+                "ORDER BY rating DESC LIMIT ?", (limit,)
+            ).fetchall()
+
+    def has_event(self, event_id: str) -> bool:
+        with self._lock:
+            return self._conn.execute(
+                "SELECT 1 FROM eventos WHERE event_id = ?", (event_id,)).fetchone() is not None
+
+    def seed(self, ratings: Dict[str, float]) -> List[str]:
+        """
+        Rating inicial de participantes nuevos (por ejemplo importado con la lista
+        de jugadores). Los que ya tienen partidos en el ranking no se tocan.
+        Devuelve los nombres sembrados.
+        """
+        ahora = datetime.now().isoformat(timespec="seconds")
+        with self._lock, self._conn:
+            jugadores = list(ratings)
+            con_partidos = set()
+            for i in range(0, len(jugadores), 500):
+                chunk = jugadores[i:i + 500]
+                marcas = ",".join("?" * len(chunk))
+                con_partidos.update(j for (j,) in self._conn.execute(
+                    f"SELECT nombre FROM jugadores WHERE partidos > 0 AND nombre IN ({marcas})", chunk))
+            nuevos = [(j, float(r)) for j, r in ratings.items() if j not in con_partidos]
+            self._conn.executemany("INSERT OR REPLACE INTO semillas (nombre, rating) VALUES (?, ?)", nuevos)
+            self._conn.executemany(
+                """INSERT INTO jugadores (nombre, rating, partidos, actualizado) VALUES (?, ?, 0, ?)
+                   ON CONFLICT(nombre) DO UPDATE SET rating = excluded.rating, actualizado = excluded.actualizado""",
+                [(j, r, ahora) for j, r in nuevos])
+        return [j for j, _ in nuevos]
+
+    def remove_event(self, event_id: str):
+        """Deshace un evento guardado (sus cambios de rating y sus partidos)."""
+        with self._lock, self._conn:
+            self._revert(event_id)
+
+    def apply_event(self, event_id: str, filas: List[FilaPartido],
+                    nombre: Optional[str] = None) -> Dict[str, Tuple[float, int]]:
+        """
+        Aplica (o vuelve a aplicar) un evento completo en una transacción.
+        Solo se leen y escriben las filas de los jugadores del evento.
+        """
+        ahora = datetime.now().isoformat(timespec="seconds")
+        with self._lock, self._conn:
+            self._revert(event_id)
+            jugadores = sorted({f[2] for f in filas})
+            ratings = self._ratings_locked(jugadores)
+            deltas = calcular_deltas(filas, ratings)
+
+            self._conn.execute("INSERT INTO eventos (event_id, fecha, nombre) VALUES (?, ?, ?)",
+                               (event_id, ahora, nombre))
+            self._conn.executemany(
+                "INSERT INTO partidos (event_id, match_id, lado, jugador, valido, puntos) VALUES (?, ?, ?, ?, ?, ?)",
+                [(event_id,) + tuple(f) for f in filas])
+            self._conn.executemany(
+                "INSERT INTO cambios (event_id, jugador, delta, partidos) VALUES (?, ?, ?, ?)",
+                [(event_id, j, d, c) for j, (d, c) in deltas.items()])
+            self._conn.executemany(
+                """INSERT INTO jugadores (nombre, rating, partidos, actualizado) VALUES (?, ?, ?, ?)
+                   ON CONFLICT(nombre) DO UPDATE SET rating = rating + ?, partidos = partidos + ?, actualizado = ?""",
+                [(j, RATING_INICIAL + d, c, ahora, d, c, ahora) for j, (d, c) in deltas.items()])
+        return deltas
+
+    def _ratings_locked(self, jugadores: List[str]) -> Dict[str, float]:
+        out = {j: RATING_INICIAL for j in jugadores}
+        for i in range(0, len(jugadores), 500):
+            chunk = jugadores[i:i + 500]
+            marcas = ",".join("?" * len(chunk))
+            out.update(dict(self._conn.execute(
+                f"SELECT nombre, rating FROM jugadores WHERE nombre IN ({marcas})", chunk).fetchall()))
+        return out
+
+    def _revert(self, event_id: str):
+        cambios = self._conn.execute(
+            "SELECT jugador, delta, partidos FROM cambios WHERE event_id = ?", (event_id,)).fetchall()
+        self._conn.executemany(
+            "UPDATE jugadores SET rating = rating - ?, partidos = partidos - ? WHERE nombre = ?",
+            [(d, c, j) for j, d, c in cambios])
+        for tabla in ("cambios", "partidos", "eventos"):
+            self._conn.execute(f"DELETE FROM {tabla} WHERE event_id = ?", (event_id,))
+
+    def recompute(self) -> int:
+        """
+        Recalcula todos los ratings rehaciendo los eventos en orden cronológico
+        (por ejemplo si la tabla quedó inconsistente). Devuelve cuántos eventos rehizo.
+        """
+        with self._lock, self._conn:
+            eventos = [e for (e,) in self._conn.execute("SELECT event_id FROM eventos ORDER BY fecha, rowid")]
+            filas_por_evento = {e: [] for e in eventos}
+            for row in self._conn.execute(
+                    "SELECT event_id, match_id, lado, jugador, valido, puntos FROM partidos ORDER BY event_id, match_id"):
+                filas_por_evento[row[0]].append(tuple(row[1:]))
+
+            ratings: Dict[str, float] = dict(self._conn.execute("SELECT nombre, rating FROM semillas"))
+            partidos: Dict[str, int] = {j: 0 for j in ratings}
+            self._conn.execute("DELETE FROM cambios")
+            for e in eventos:
+                deltas = calcular_deltas(filas_por_evento[e], ratings)
+                for j, (d, c) in deltas.items():
+                    ratings[j] = ratings.get(j, RATING_INICIAL) + d
+                    partidos[j] = partidos.get(j, 0) + c
+                self._conn.executemany(
+                    "INSERT INTO cambios (event_id, jugador, delta, partidos) VALUES (?, ?, ?, ?)",
+                    [(e, j, d, c) for j, (d, c) in deltas.items()])
+            self._conn.execute("DELETE FROM jugadores")
+            self._conn.executemany(
+                "INSERT INTO jugadores (nombre, rating, partidos) VALUES (?, ?, ?)",
+                [(j, r, partidos[j]) for j, r in ratings.items()])
+        return len(eventos)
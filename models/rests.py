@@ -0,0 +1,105 @@
+"""Análisis vectorizado de descansos.
+
+El patrón de descansos es una matriz booleana (participantes x rondas) armada
+en una sola pasada por el fixture. Las rachas de descansos consecutivos y los
+huecos entre descansos salen de diferencias sobre esa matriz (run-length con
+NumPy), sin ``groupby`` por fila ni búsquedas en listas.
+
+``RestMetrics`` resume el reparto de descansos de un fixture; ``penalizacion``
+es un único número (menor es mejor) para que los motores puedan comparar
+fixtures candidatos.
+"""
+from dataclasses import dataclass
+from typing import Dict, Optional, Sequence
+
+import numpy as np
+
+# Pesos de la penalización: un descanso pegado a otro pesa más que el desbalance
+PESO_PEGADOS = 100
+PESO_DESBALANCE = 10
+
+
+def matriz_descansos(fixture, participantes: Optional[Sequence[str]] = None) -> np.ndarray:
+    """Matriz booleana ``[participante, ronda]``; True si descansa en esa ronda."""
+    if participantes is None:
+        participantes = fixture.participantes
+    posicion = {p: i for i, p in enumerate(participantes)}
+    filas, columnas = [], []
+    for col, ronda in enumerate(fixture):
+        for p in ronda.descansan:
+            i = posicion.get(p)
+            if i is not None:
+                filas.append(i)
+                columnas.append(col)
+    matriz = np.zeros((len(participantes), len(fixture)), dtype=bool)
+    matriz[filas, columnas] = True
+    return matriz
+
+
+def rachas_maximas(matriz: np.ndarray) -> np.ndarray:
+    """Racha más larga de descansos consecutivos por fila."""
+    bordes = np.diff(np.pad(matriz.astype(np.int8), ((0, 0), (1, 1))), axis=1)
+    # En orden fila-mayor, cada inicio (+1) se empareja con su fin (-1)
+    filas, inicios = np.nonzero(bordes == 1)
+    _, fines = np.nonzero(bordes == -1)
+    rachas = np.zeros(matriz.shape[0], dtype=np.int64)
+    np.maximum.at(rachas, filas, fines - inicios)
+    return rachas
+
+
+def huecos_minimos(matriz: np.ndarray) -> np.ndarray:
+    """
+    Menor cantidad de rondas jugadas entre dos descansos de la misma fila
+    (0 = descansos pegados). Con menos de dos descansos queda el total de rondas.
+    """
+    filas, rondas = np.nonzero(matriz)
+    huecos = np.full(matriz.shape[0], matriz.shape[1], dtype=np.int64)
+    misma_fila = filas[1:] == filas[:-1]
+    np.minimum.at(huecos, filas[1:][misma_fila], (rondas[1:] - rondas[:-1] - 1)[misma_fila])
+    return huecos
+
+
+@dataclass(frozen=True)
+class RestMetrics:
+    """Métricas de descanso por participante y su resumen."""
+    participantes: tuple
+    descansos: np.ndarray
+    max_consecutivos: np.ndarray
+    hueco_minimo: np.ndarray
+    pegados: int
+
+    @classmethod
+    def desde_matriz(cls, matriz: np.ndarray, participantes: Sequence[str]) -> "RestMetrics":
+        descansos = matriz.sum(axis=1)
+        # Cada ronda de una racha después de la primera es un descanso pegado
+        pegados = int(np.count_nonzero(matriz[:, 1:] & matriz[:, :-1]))
+        return cls(tuple(participantes), descansos, rachas_maximas(matriz), huecos_minimos(matriz), pegados)
+
+    @classmethod
+    def desde_fixture(cls, fixture, participantes: Optional[Sequence[str]] = None) -> "RestMetrics":
+        if participantes is None:
+            participantes = fixture.participantes
+        return cls.desde_matriz(matriz_descansos(fixture, participantes), participantes)
+
+    @property
+    def desbalance(self) -> int:
+        """Diferencia entre el que más y el que menos descansó."""
+        return int(self.descansos.max() - self.descansos.min()) if self.descansos.size else 0
+
+    @property
+    def desviacion(self) -> float:
+        return float(self.descansos.std()) if self.descansos.size else 0.0
+
+    @property
+    def penalizacion(self) -> int:
+        """Costo del reparto de descansos para comparar fixtures (menor es mejor)."""
+        return PESO_PEGADOS * self.pegados + PESO_DESBALANCE * self.desbalance
+
+    def resumen(self) -> Dict[str, float]:
+        return {
+            "max_consecutivos": int(self.max_consecutivos.max()) if self.max_consecutivos.size else 0,
+            "descansos_pegados": self.pegados,
+            "desbalance": self.desbalance,
+            "desviacion": round(self.desviacion, 3),
+            "penalizacion": self.penalizacion,
+        }
@@ -0,0 +1,105 @@
+"""Resultados de un torneo indexados por id de partido.
+
+Reemplaza el diccionario ``{(" & ".join(pareja1), " & ".join(pareja2)): (s1, s2)}``:
+los nombres ya no forman parte de la clave, así que jugadores con "&" o "-" en
+el nombre no rompen el ranking, y las consultas por jugador usan el índice
+invertido del fixture en vez de recorrer todos los partidos.
+
+Los puntajes y versiones viven en arreglos de enteros preasignados (``array``)
+de largo fijo por fixture: 12 bytes por partido en lugar de un dict de tuplas.
+La versión 0 indica que el partido nunca se cargó.
+"""
+import hashlib
+import uuid
+from array import array
+from typing import Iterator, List, Optional, Tuple
+
+from models.fixture import Fixture, Match
+
+Score = Tuple[int, int]
+
+
+class ResultsStore:
+    """
+    Puntajes por lado de cada partido, con acceso por jugador vía ``fixture.indice``.
+    ``torneo_id`` identifica el evento (por ejemplo al guardarlo en el ranking del club).
+    Cada partido lleva un número de versión para la escritura optimista en el store compartido;
+    ``revision`` cuenta las escrituras de esta sesión; ``huella()`` identifica el contenido
+    y es la clave de cache de lo que se comparte entre sesiones.
+    """
+    __slots__ = ("fixture", "torneo_id", "revision", "_scores", "_versiones", "_cargados")
+
+    def __init__(self, fixture: Fixture, torneo_id: Optional[str] = None):
+        self.fixture = fixture
+        self.torneo_id = torneo_id or uuid.uuid4().hex[:12]
+        self.revision = 0
+        n = len(fixture.partidos)
+        # s1 y s2 del partido i en las posiciones 2i y 2i+1
+        self._scores = array("i", bytes(8 * n))
+        self._versiones = array("i", bytes(4 * n))
+        self._cargados = 0
+
+    def __len__(self) -> int:
+        return self._cargados
+
+    def __contains__(self, match_id: int) -> bool:
+        return self._versiones[match_id] > 0
+
+    def get(self, match_id: int, default: Score = (0, 0)) -> Score:
+        if not self._versiones[match_id]:
+            return default
+        i = 2 * match_id
+        return self._scores[i], self._scores[i + 1]
+
+    def version(self, match_id: int) -> int:
+        """Versión del resultado del partido (0 si nunca se cargó)."""
+        return self._versiones[match_id]
+
+    def set(self, match_id: int, s1: int, s2: int, version: Optional[int] = None) -> Score:
+        """
+        Guarda el resultado y devuelve el anterior ((0, 0) si no había).
+        ``version`` es la que asignó el store compartido; sin ella se incrementa la local.
+        """
+        old = self.get(match_id)
+        anterior = self._versiones[match_id]
+        if not anterior:
+            self._cargados += 1
+        i = 2 * match_id
+        self._scores[i] = s1
+        self._scores[i + 1] = s2
+        self._versiones[match_id] = anterior + 1 if version is None else version
+        self.revision += 1
+        return old
+
+    def huella(self) -> str:
+        """Hash de puntajes y versiones: igual en dos sesiones solo si tienen los mismos resultados."""
+        h = hashlib.blake2b(self._scores.tobytes(), digest_size=16)
+        h.update(self._versiones.tobytes())
+        return h.hexdigest()
+
+    def items(self) -> Iterator[Tuple[Match, Score]]:
+        """Partidos con resultado cargado, en orden de id."""
+        partidos, scores = self.fixture.partidos, self._scores
+        for match_id, version in enumerate(self._versiones):
+            if version:
+                yield partidos[match_id], (scores[2 * match_id], scores[2 * match_id + 1])
+
+    def is_valid(self, match_id: int, participante: str) -> bool:
+        """True si el resultado del partido cuenta para el participante (no es ayudante)."""
+        return participante in self.fixture.partidos[match_id].valido_para
+
+    def results_of(self, participante: str) -> List[Tuple[Match, int, int]]:
+        """
+        Partidos jugados por un participante como ``(partido, puntos_a_favor, puntos_en_contra)``.
+        Solo incluye partidos con resultado y en los que no fue ayudante. O(k).
+        """
+        out = []
+        for match in self.fixture.matches_of(participante):
+            if not self._versiones[match.id] or participante not in match.valido_para:
+                continue
+            s1, s2 = self.get(match.id)
+            if match.lado_de(participante) == 0:
+                out.append((match, s1, s2))
+            else:
+                out.append((match, s2, s1))
+        return out
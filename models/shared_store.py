@@ -0,0 +1,207 @@
+"""Store de torneos compartido entre sesiones (SQLite local).
+
+Permite que varios dispositivos (por ejemplo un árbitro por cancha) carguen
+puntajes del mismo evento. El fixture se guarda una sola vez por torneo y las
+sesiones lo leen de la memoria del proceso, sin regenerarlo.
+
+Cada partido tiene un número de versión. Una escritura indica la versión que
+leyó la sesión y se rechaza con ``VersionConflict`` si otro dispositivo lo
+cambió mientras tanto (control optimista, sin bloqueos entre sesiones).
+
+Cada escritura sube la ``revision`` del torneo. Consultarla es una lectura en
+memoria, así que las sesiones pueden chequearla en cada rerun y pedir solo los
+partidos cambiados (``changes_since``). Los contadores en memoria asumen un
+único proceso de Streamlit (el caso de la app). Los torneos terminados o sin
+actividad se sacan de memoria con ``evict``/``evict_idle``; siguen en la base y
+se vuelven a cargar si alguien los pide.
+"""
+import json
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from models.fixture import Fixture
+
+DB_PATH = os.path.join("data", "torneos.sqlite3")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS torneos (
+    torneo_id TEXT PRIMARY KEY,
+    fixture TEXT NOT NULL,
+    config TEXT NOT NULL,
+    revision INTEGER NOT NULL DEFAULT 0,
+    creado TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS resultados (
+    torneo_id TEXT NOT NULL,
+    match_id INTEGER NOT NULL,
+    s1 INTEGER NOT NULL,
+    s2 INTEGER NOT NULL,
+    version INTEGER NOT NULL,
+    revision INTEGER NOT NULL,
+    actualizado TEXT NOT NULL,
+    PRIMARY KEY (torneo_id, match_id)
+);
+CREATE INDEX IF NOT EXISTS idx_resultados_revision ON resultados (torneo_id, revision);
+"""
+
+# Cambio de un partido: (match_id, s1, s2, version)
+Cambio = Tuple[int, int, int, int]
+
+
+class VersionConflict(Exception):
+    """Otro dispositivo guardó el partido después de la versión leída."""
+
+    def __init__(self, match_id: int, actual: Tuple[int, int], version: int):
+        super().__init__(f"El partido {match_id} ya está en la versión {version}")
+        self.match_id = match_id
+        self.actual = actual
+        self.version = version
+
+
+def fixture_a_json(fixture: Fixture) -> str:
+    return json.dumps({"rondas": fixture.to_rounds(), "participantes": list(fixture.participantes),
+                       "modo": fixture.modo}, ensure_ascii=False)
+
+
+def fixture_desde_json(texto: str) -> Fixture:
+    data = json.loads(texto)
+    return Fixture.from_rounds(data["rondas"], data["participantes"], data["modo"])
+
+
+class SharedTournamentStore:
+    """Fixtures y resultados por ``torneo_id``; una instancia por proceso."""
+
+    def __init__(self, path: str = DB_PATH):
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        self._revisiones: Dict[str, int] = {}
+        self._torneos: Dict[str, Tuple[Fixture, dict]] = {}
+        # Último acceso de cada torneo cargado en memoria (para evict_idle)
+        self._accesos: Dict[str, float] = {}
+        with self._lock, self._conn:
+            if path != ":memory:":
+                self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.executescript(_SCHEMA)
+
+    def create(self, torneo_id: str, fixture: Fixture, config: dict):
+        """Registra el torneo; si ya existe no hace nada."""
+        ahora = datetime.now().isoformat(timespec="seconds")
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR IGNORE INTO torneos (torneo_id, fixture, config, creado) VALUES (?, ?, ?, ?)",
+                (torneo_id, fixture_a_json(fixture), json.dumps(config, ensure_ascii=False), ahora))
+            self._cargar_locked(torneo_id)
+
+    def load(self, torneo_id: str) -> Optional[Tuple[Fixture, dict]]:
+        """``(fixture, config)`` del torneo, o None si no existe."""
+        with self._lock:
+            return self._cargar_locked(torneo_id)
+
+    def _cargar_locked(self, torneo_id: str) -> Optional[Tuple[Fixture, dict]]:
+        if torneo_id not in self._torneos:
+            row = self._conn.execute(
+                "SELECT fixture, config, revision FROM torneos WHERE torneo_id = ?", (torneo_id,)).fetchone()
+            if row is None:
+                return None
+            self._torneos[torneo_id] = (fixture_desde_json(row[0]), json.loads(row[1]))
+            self._revisiones[torneo_id] = row[2]
+        self._accesos[torneo_id] = time.time()
+        return self._torneos[torneo_id]
+
+    def evict(self, torneo_id: str):
+        """Saca el torneo de la memoria del proceso (queda en la base)."""
+        with self._lock:
+            self._torneos.pop(torneo_id, None)
+            self._revisiones.pop(torneo_id, None)
+            self._accesos.pop(torneo_id, None)
+
+    def evict_idle(self, segundos: float) -> int:
+        """Saca de memoria los torneos sin lecturas ni escrituras en los últimos ``segundos``."""
+        limite = time.time() - segundos
+        with self._lock:
+            viejos = [t for t, acceso in self._accesos.items() if acceso < limite]
+            for torneo_id in viejos:
+                del self._torneos[torneo_id], self._revisiones[torneo_id], self._accesos[torneo_id]
+        return len(viejos)
+
+    def revision(self, torneo_id: str) -> int:
+        """Revisión actual del torneo (lectura en memoria)."""
+        return self._revisiones.get(torneo_id, 0)
+
+    def changes_since(self, torneo_id: str, revision: int) -> Tuple[int, List[Cambio]]:
+        """Partidos modificados después de ``revision`` y la revisión actual."""
+        with self._lock:
+            cambios = self._conn.execute(
+                "SELECT match_id, s1, s2, version FROM resultados WHERE torneo_id = ? AND revision > ? "
+                "ORDER BY match_id", (torneo_id, revision)).fetchall()
+            return self._revisiones.get(torneo_id, 0), cambios
+
+    def set_result(self, torneo_id: str, match_id: int, s1: int, s2: int,
+                   expected_version: int) -> Tuple[int, int]:
+        """
+        Guarda el resultado si el partido sigue en ``expected_version``.
+        Devuelve ``(version, revision)`` nuevas; si no, lanza ``VersionConflict``.
+        """
+        ahora = datetime.now().isoformat(timespec="seconds")
+        with self._lock, self._conn:
+            if self._cargar_locked(torneo_id) is None:
+                raise KeyError(torneo_id)
+            row = self._conn.execute(
+                "SELECT s1, s2, version FROM resultados WHERE torneo_id = ? AND match_id = ?",
+                (torneo_id, match_id)).fetchone()
+            actual_version = row[2] if row else 0
+            if actual_version != expected_version:
+                raise VersionConflict(match_id, (row[0], row[1]) if row else (0, 0), actual_version)
+
+            revision = self._revisiones[torneo_id] + 1
+            version = actual_version + 1
+            self._conn.execute(
+                """INSERT INTO resultados (torneo_id, match_id, s1, s2, version, revision, actualizado)
+                   VALUES (?, ?, ?, ?, ?, ?, ?)
+                   ON CONFLICT(torneo_id, match_id) DO UPDATE SET
+                       s1 = excluded.s1, s2 = excluded.s2, version = excluded.version,
+                       revision = excluded.revision, actualizado = excluded.actualizado""",
+                (torneo_id, match_id, s1, s2, version, revision, ahora))
+            self._conn.execute("UPDATE torneos SET revision = ? WHERE torneo_id = ?", (revision, torneo_id))
+            self._revisiones[torneo_id] = revision
+        return version, revision
+
+    def import_results(self, torneo_id: str, cambios: List[Cambio]):
+        """
+        Agrega resultados ya versionados (por ejemplo al retomar un torneo desde
+        disco). Un partido se escribe solo si su versión es más nueva que la del
+        store; si el store ya tiene una versión igual con otro puntaje, o una más
+        nueva, lanza ``VersionConflict`` y no se importa nada.
+        """
+        ahora = datetime.now().isoformat(timespec="seconds")
+        with self._lock, self._conn:
+            if self._cargar_locked(torneo_id) is None:
+                raise KeyError(torneo_id)
+            guardados = {m: (s1, s2, v) for m, s1, s2, v in self._conn.execute(
+                "SELECT match_id, s1, s2, version FROM resultados WHERE torneo_id = ?", (torneo_id,))}
+            nuevos = []
+            for m, s1, s2, v in cambios:
+                actual = guardados.get(m)
+                if actual is None or actual[2] < v:
+                    nuevos.append((m, s1, s2, v))
+                elif actual[2] > v or actual[:2] != (s1, s2):
+                    raise VersionConflict(m, actual[:2], actual[2])
+            if not nuevos:
+                return
+            revision = self._revisiones[torneo_id] + 1
+            self._conn.executemany(
+                """INSERT INTO resultados (torneo_id, match_id, s1, s2, version, revision, actualizado)
+                   VALUES (?, ?, ?, ?, ?, ?, ?)
+                   ON CONFLICT(torneo_id, match_id) DO UPDATE SET
+                       s1 = excluded.s1, s2 = excluded.s2, version = excluded.version,
+                       revision = excluded.revision, actualizado = excluded.actualizado""",
+                [(torneo_id, m, s1, s2, v, revision, ahora) for m, s1, s2, v in nuevos])
+            self._conn.execute("UPDATE torneos SET revision = ? WHERE torneo_id = ?", (revision, torneo_id))
+            self._revisiones[torneo_id] = revision
@@ -0,0 +1,172 @@
+"""Motor de desempate para los rankings por puntos y por sets.
+
+Criterios disponibles (se aplican en el orden dado, todos de mayor a menor):
+
+- ``puntos``: puntos (o sets) a favor totales. Criterio principal en modo puntos.
+- ``victorias``: partidos ganados. Criterio principal en modo sets.
+- ``h2h``: enfrentamiento directo, es decir el criterio principal contado solo
+  en los partidos contra rivales que siguen empatados con los criterios previos.
+- ``diferencia``: a favor menos en contra.
+- ``promedio``: puntos a favor por partido jugado (justo cuando los ayudantes
+  hacen que no todos jueguen la misma cantidad de partidos válidos).
+- ``a_favor``: puntos (o sets) a favor.
+
+Todo se calcula sobre una tabla larga (una fila por participante válido y
+partido jugado) con operaciones vectorizadas de pandas/NumPy; el
+enfrentamiento directo se resuelve con un merge por grupo de empate, sin
+comparar pares de participantes en Python.
+"""
+from typing import Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from models.fixture import MODO_PAREJAS
+
+MODO_PUNTOS = "puntos"
+MODO_SETS = "sets"
+
+CRITERIOS = ("puntos", "victorias", "h2h", "diferencia", "promedio", "a_favor")
+DEFAULT_PUNTOS = ("puntos", "h2h", "diferencia", "promedio")
+# Mismo orden que el ranking por sets original; el directo desempata al final
+DEFAULT_SETS = ("victorias", "diferencia", "a_favor", "h2h")
+
+
+def criterios_por_defecto(modo: str) -> Sequence[str]:
+    return DEFAULT_SETS if modo == MODO_SETS else DEFAULT_PUNTOS
+
+
+def tabla_larga(resultados) -> pd.DataFrame:
+    """
+    Una fila por (partido, participante válido, rival) con resultado cargado.
+    Columnas: match, participante, rival, pf, pc. Un 0-0 cuenta como no jugado.
+    """
+    filas = []
+    for partido, (s1, s2) in resultados.items():
+        if s1 == 0 and s2 == 0:
+            continue
+        validos = partido.valido_para
+        for propio, rivales, pf, pc in ((partido.pareja1, partido.pareja2, s1, s2),
+                                        (partido.pareja2, partido.pareja1, s2, s1)):
+            for p in propio:
+                if p in validos:
+                    for r in rivales:
+                        filas.append((partido.id, p, r, pf, pc))
+    return pd.DataFrame(filas, columns=["match", "participante", "rival", "pf", "pc"])
+
+
+def tabla_estadisticas(participantes: Sequence[str], stats: np.ndarray) -> pd.DataFrame:
+    """
+    Tabla por participante a partir de una matriz (n, 4) con columnas
+    a favor, en contra, jugados, ganados. Agrega una columna por criterio.
+    """
+    stats = np.asarray(stats, dtype=np.int64).reshape(len(participantes), 4)
+    tabla = pd.DataFrame(stats, index=pd.Index(participantes, name="participante"),
+                         columns=["pf", "pc", "pj", "pg"])
+    tabla["puntos"] = tabla["pf"]
+    tabla["a_favor"] = tabla["pf"]
+    tabla["victorias"] = tabla["pg"]
+    tabla["diferencia"] = tabla["pf"] - tabla["pc"]
+    tabla["promedio"] = np.divide(tabla["pf"], tabla["pj"],
+                                  out=np.zeros(len(tabla)), where=tabla["pj"].to_numpy() > 0)
+    tabla["orden"] = np.arange(len(tabla))
+    return tabla
+
+
+def head_to_head(larga: pd.DataFrame, grupos: pd.Series, criterio: str) -> pd.Series:
+    """
+    Valor del ``criterio`` contado solo en partidos entre miembros del mismo
+    grupo de empate. Participantes sin empate quedan en 0.
+    """
+    tamanos = grupos.map(grupos.value_counts())
+    empatados = tamanos[tamanos > 1].index
+    h2h = pd.Series(0.0, index=grupos.index)
+    if len(empatados) == 0 or larga.empty:
+        return h2h
+
+    sub = larga[larga["participante"].isin(empatados)]
+    sub = sub[sub["participante"].map(grupos).to_numpy() == sub["rival"].map(grupos).to_numpy()]
+    # Un partido cuenta una vez aunque ambos rivales estén en el grupo
+    sub = sub.drop_duplicates(["match", "participante"])
+    if sub.empty:
+        return h2h
+
+    if criterio == "victorias":
+        valor = (sub["pf"] > sub["pc"]).astype(np.int64)
+    elif criterio == "diferencia":
+        valor = sub["pf"] - sub["pc"]
+    else:
+        valor = sub["pf"]
+    h2h.update(valor.groupby(sub["participante"]).sum().astype(float))
+    return h2h
+
+
+def ordenar(tabla: pd.DataFrame, criterios: Sequence[str],
+            larga_fn=None) -> pd.DataFrame:
+    """
+    Ordena la tabla por los criterios dados. ``larga_fn`` devuelve la tabla
+    larga y solo se llama si hay empates que resolver por enfrentamiento directo.
+    """
+    criterios = [c for c in criterios if c in CRITERIOS]
+    tabla = tabla.copy()
+    for i, criterio in enumerate(criterios):
+        if criterio != "h2h":
+            continue
+        previos = [c for c in criterios[:i] if c != "h2h"]
+        if previos:
+            grupos = tabla.groupby(previos, sort=False).ngroup()
+        else:
+            grupos = pd.Series(0, index=tabla.index)
+        hay_empates = grupos.duplicated().any()
+        if hay_empates and larga_fn is not None:
+            principal = criterios[0] if criterios[0] != "h2h" else "puntos"
+            tabla["h2h"] = head_to_head(larga_fn(), grupos, principal)
+        else:
+            tabla["h2h"] = 0.0
+    # lexsort usa la última clave como principal; el orden de inscripción desempata al final
+    keys = [tabla["orden"].to_numpy()] + [-tabla[c].to_numpy() for c in reversed(criterios)]
+    return tabla.iloc[np.lexsort(keys)]
+
+
+def formatear(tabla: pd.DataFrame, modo: str, name_col: str) -> pd.DataFrame:
+    """Convierte la tabla ordenada al formato de columnas que usan las páginas."""
+    if modo == MODO_SETS:
+        df = pd.DataFrame({
+            'Pareja': tabla.index,
+            'Partidos Jugados': tabla["pj"].to_numpy(),
+            'Puntos': tabla["pg"].to_numpy(),
+            'Sets Ganados': tabla["pf"].to_numpy(),
+            'Sets Perdidos': tabla["pc"].to_numpy(),
+            'Diferencia de Sets': tabla["diferencia"].to_numpy(),
+        })
+        df.index = df.index + 1
+        return df
+    return pd.DataFrame({
+        name_col: tabla.index,
+        'Puntos': tabla["pf"].to_numpy(),
+        'Partidos Jugados': tabla["pj"].to_numpy(),
+        'Diferencia': tabla["diferencia"].to_numpy(),
+        'Promedio': tabla["promedio"].round(2).to_numpy(),
+    })
+
+
+def clasificar(resultados, modo: str = MODO_PUNTOS,
+               criterios: Optional[Sequence[str]] = None) -> pd.DataFrame:
+    """Ranking completo desde el store de resultados, en una pasada vectorizada."""
+    fixture = resultados.fixture
+    criterios = criterios or criterios_por_defecto(modo)
+    larga = tabla_larga(resultados)
+
+    # Las victorias y los jugados se cuentan una vez por partido, no por rival
+    por_partido = larga.drop_duplicates(["match", "participante"])
+    agregados = pd.DataFrame({
+        "pf": por_partido.groupby("participante")["pf"].sum(),
+        "pc": por_partido.groupby("participante")["pc"].sum(),
+        "pj": por_partido.groupby("participante").size(),
+        "pg": (por_partido["pf"] > por_partido["pc"]).groupby(por_partido["participante"]).sum(),
+    }).reindex(list(fixture.participantes), fill_value=0)
+
+    tabla = tabla_estadisticas(fixture.participantes, agregados.to_numpy())
+    tabla = ordenar(tabla, criterios, lambda: larga)
+    name_col = "Pareja" if fixture.modo == MODO_PAREJAS else "Jugador"
+    return formatear(tabla, modo, name_col)
@@ -1,4 +1,5 @@
 import streamlit as st
+from assets.importar_jugadores import importar_jugadores
 from assets.styles import apply_custom_css_player_setup, CLUB_THEME
 
 # -----------------------------------------------------
@@ -53,6 +54,9 @@ def app():
             
     # === ESTILOS ===
     apply_custom_css_player_setup(CLUB_THEME)
+
+    # === IMPORTACIÓN MASIVA ===
+    importar_jugadores()
     
     # === ENTRADAS DE JUGADORES (REFECTORIZADO) ===
     cols_per_row = 4
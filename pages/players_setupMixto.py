@@ -1,4 +1,5 @@
 import streamlit as st
+from assets.importar_jugadores import importar_jugadores
 from assets.styles import apply_custom_css_setup_mixto, CLUB_THEME
 
 # -----------------------------------------------------
@@ -57,6 +58,9 @@ def app():
     # === ESTILOS ===
     apply_custom_css_setup_mixto(CLUB_THEME)
 
+    # === IMPORTACIÓN MASIVA ===
+    importar_jugadores("mixto")
+
     cols_per_row = 4
 
     # === INPUTS HOMBRES (REFECTORIZADO) ===
@@ -1,233 +1,229 @@
 import streamlit as st
-from assets.helper_funcs import  calcular_ranking_parejas,initialize_vars, calcular_ranking_individual,render_nombre
-from models.AmericanoParejas.AmericanoParejasv1 import FixedPairsTournament
-from assets.analyze_funcs import build_matrices, plot_heatmap, analyze_descansos
-from models.AllvsAll_Random_modelv4 import CompleteAmericanoTournament
+from assets.helper_funcs import initialize_vars, render_nombre, registrar_resultado, rondas_a_mostrar, tabla_ronda
+from assets.exportar import botones_exportar
+from assets.mi_horario import mi_horario
+from assets.torneo_compartido import publicar_torneo, sincronizar, mostrar_codigo, vigilar_cambios
+from assets.match_cards import tarjetas_html
+from assets.fixture_cache import generar_fixture, fixture_key, semilla_sorteo, PAREJAS_FIJAS, TODOS_CONTRA_TODOS
+from models.profiling import span
+from models.results import ResultsStore
+from models.ledger import StandingsLedger
 from assets.styles import apply_custom_css_torneo, CLUB_THEME,display_ranking_table
-import pandas as pd
-import seaborn as sns
-import matplotlib.pyplot as plt
-import itertools,random
-import numpy as np
+
+# Función Callback para actualizar inmediatamente
+def actualizar_resultado(match_id, k1, k2):
+    # Leemos el valor actual de los inputs usando sus keys
+    val1 = st.session_state[k1]
+    val2 = st.session_state[k2]
+    # Store compartido + resultados (clave = id del partido) + diferencia en la tabla
+    # de posiciones; si se completó la ronda en foco, el navegador pasa a la siguiente
+    registrar_resultado(match_id, val1, val2)
+
+
+# Cada ronda es un fragmento: cambiar un puntaje solo vuelve a ejecutar su ronda,
+# no toda la página (los demás partidos, el CSS y el resumen quedan como están).
+@st.fragment
+def render_ronda_parejas(i, ronda, puntos_partido):
+    st.subheader(f"Ronda {i}")
+
+    # 1. Agrupar partidos por turno
+    partidos_por_turno = {}
+    for match in ronda.partidos:
+        turno = match.turno
+        if turno not in partidos_por_turno:
+            partidos_por_turno[turno] = []
+        partidos_por_turno[turno].append(match)
+
+    # 2. Iterar sobre los turnos dentro de la ronda
+    for turno, partidos_del_turno in partidos_por_turno.items():
+
+        # Solo mostramos el número de turno si hay más de uno
+        if len(partidos_por_turno) > 1:
+            st.markdown(f"**Turno {turno}:**", unsafe_allow_html=True)
+
+        # Tarjetas del turno en un solo bloque HTML; debajo, una columna de inputs por cancha
+        st.markdown(tarjetas_html(partidos_del_turno, st.session_state.resultados), unsafe_allow_html=True)
+        cols = st.columns(len(partidos_del_turno))
+
+        for c_i, match in enumerate(partidos_del_turno):
+            # 🎯 CLAVE: Usamos el nombre del equipo/pareja DIRECTAMENTE
+            p1_equipo_str = match.etiqueta1
+            p2_equipo_str = match.etiqueta2
+
+            with cols[c_i]:
+                # --- Input de Resultados a nivel de EQUIPO ---
+                # Las keys usan el id estable del partido.
+                k1 = f"score_{match.id}_p1"
+                k2 = f"score_{match.id}_p2"
+
+                # Recuperar resultados usando el id del partido
+                saved_s1, saved_s2 = st.session_state.resultados.get(match.id)
+
+                colA, colB = st.columns(2)
+                with colA:
+                    # Etiqueta de input con el nombre del equipo
+                    st.number_input(
+                        f"Puntos {p1_equipo_str}", 
+                        key=k1, 
+                        min_value=0,
+                        max_value=puntos_partido, 
+                        value=saved_s1,
+                        on_change=actualizar_resultado,
+                        kwargs={"match_id": match.id, "k1": k1, "k2": k2}
+                    )
+                with colB:
+                    # Etiqueta de input con el nombre del equipo
+                    st.number_input(
+                        f"Puntos {p2_equipo_str}", 
+                        key=k2, 
+                        min_value=0,
+                        max_value=puntos_partido, 
+                        value=saved_s2,
+                        on_change=actualizar_resultado,
+                        kwargs={"match_id": match.id, "k1": k1, "k2": k2})
+
+    # Mostrar parejas que descansan
+    parejas_descansando = ronda.descansan
+    if parejas_descansando:
+        st.info(f"Descansan en Ronda {i}: {', '.join(parejas_descansando)}")
+
+    # El cambio de ronda en foco necesita redibujar la página completa
+    if st.session_state.get("avanzar_ronda"):
+        st.rerun()
+
+
+@st.fragment
+def render_ronda_individual(ronda_data, puntos_partido):
+    st.subheader(f"Ronda {ronda_data.ronda}")
+    st.markdown(tarjetas_html(ronda_data.partidos, st.session_state.resultados, mostrar_ayudantes=True),
+                unsafe_allow_html=True)
+    cols = st.columns(len(ronda_data.partidos))
+
+    for c_i, partido in enumerate(ronda_data.partidos):
+        ayudantes = partido.ayudantes
+        # aplicar ícono a los nombres que son ayudantes
+        p1_render = [render_nombre(j, ayudantes) for j in partido.pareja1]
+        p2_render = [render_nombre(j, ayudantes) for j in partido.pareja2]
+
+        pareja1 = " & ".join(p1_render)
+        pareja2 = " & ".join(p2_render)
+
+        with cols[c_i]:
+            # --- keys seguras basadas en el id del partido ---
+            key_p1 = f"score_{partido.id}_p1"
+            key_p2 = f"score_{partido.id}_p2"
+
+            # --- CAMBIO: Recuperar valores guardados si existen ---
+            saved_s1, saved_s2 = st.session_state.resultados.get(partido.id)
+
+            colA, colB = st.columns(2)
+            with colA:
+                st.number_input(
+                    f"Puntos {pareja1}", 
+                    key=key_p1, 
+                    min_value=0,
+                    max_value=puntos_partido, 
+                    value=saved_s1,
+                    on_change=actualizar_resultado,
+                    kwargs={"match_id": partido.id, "k1": key_p1, "k2": key_p2}
+                )
+            with colB:
+                st.number_input(
+                    f"Puntos {pareja2}", 
+                    key=key_p2, 
+                    min_value=0,
+                    max_value=puntos_partido, 
+                    value=saved_s2,
+                    on_change=actualizar_resultado,
+                    kwargs={"match_id": partido.id, "k1": key_p1, "k2": key_p2}
+                )
+
+    if ronda_data.descansan:
+        st.info(f"Descansan: {', '.join(ronda_data.descansan)}")
+
+    if st.session_state.get("avanzar_ronda"):
+        st.rerun()
+
 
 def app():
     num_canchas = st.session_state.num_fields
     puntos_partido =st.session_state.num_pts
-    to_init = {"code_play": "", "ranking":""}
+    to_init = {"code_play": ""}
     initialize_vars(to_init)
+    # Resultados cargados desde otros dispositivos desde el último rerun
+    sincronizar()
 
-    # Función Callback para actualizar inmediatamente
-    def actualizar_resultado(p1_str, p2_str, k1, k2):
-        # Leemos el valor actual de los inputs usando sus keys
-        val1 = st.session_state[k1]
-        val2 = st.session_state[k2]
-        # Guardamos inmediatamente en el diccionario de resultados
-        st.session_state.resultados[(p1_str, p2_str)] = (val1, val2)
-    
     #divission logica parejas fijas vs aleatorias
     mod_parejas = st.session_state.mod
     if mod_parejas == "Parejas Fijas":
         st.markdown('<div class="main-title"> Torneo Americano - Parejas Fijas </div>', unsafe_allow_html=True)
         parejas = st.session_state.players
         
-        # AUTO-GENERATE fixture on first load
-        tournament_key = f"parejas_fijas_{len(parejas)}_{num_canchas}_{puntos_partido}"
+        # AUTO-GENERATE fixture on first load (clave = hash de nombres, canchas y semilla)
+        tournament_key = fixture_key(PAREJAS_FIJAS, parejas, num_canchas, semilla_sorteo())
         if 'tournament_key' not in st.session_state or st.session_state.tournament_key != tournament_key:
             with st.spinner("Generando fixture..."):
-                generator = FixedPairsTournament(parejas, num_canchas)
-                resultados_torneo = generator.generate_schedule()
-                st.session_state.fixture = resultados_torneo["rondas"]
+                _, resultados_torneo = generar_fixture(PAREJAS_FIJAS, parejas, num_canchas, semilla_sorteo())
+                st.session_state.fixture = resultados_torneo["fixture"]
                 st.session_state.code_play = "parejas_fijas"
-                st.session_state.resultados = {}
+                st.session_state.resultados = ResultsStore(st.session_state.fixture)
+                st.session_state.ledger = StandingsLedger(st.session_state.resultados)
                 st.session_state.parejas = parejas
                 st.session_state.tournament_key = tournament_key
+                publicar_torneo()
         if st.session_state.code_play == "parejas_fijas" :
-            apply_custom_css_torneo(CLUB_THEME)
+            with span("render.css"):
+                apply_custom_css_torneo(CLUB_THEME)
 
-            for i, ronda in enumerate(st.session_state.fixture, start=1):
-                st.subheader(f"Ronda {i}")
-            
-                # 1. Agrupar partidos por turno
-                partidos_por_turno = {}
-                for match in ronda['partidos']:
-                    turno = match['turno']
-                    if turno not in partidos_por_turno:
-                        partidos_por_turno[turno] = []
-                    partidos_por_turno[turno].append(match)
-
-                # 2. Iterar sobre los turnos dentro de la ronda
-                for turno, partidos_del_turno in partidos_por_turno.items():
-                    
-                    # Solo mostramos el número de turno si hay más de uno
-                    if len(partidos_por_turno) > 1:
-                        st.markdown(f"**Turno {turno}:**", unsafe_allow_html=True)
-
-                    # Usamos st.columns para visualizar los partidos de ESTE TURNO
-                    # El número de columnas es el número de canchas usadas en este turno
-                    cols = st.columns(len(partidos_del_turno))
-
-                    for c_i, match in enumerate(partidos_del_turno):
-                        # 🎯 CLAVE: Usamos el nombre del equipo/pareja DIRECTAMENTE
-                        p1_equipo_str = match['pareja1'] 
-                        p2_equipo_str = match['pareja2'] 
-
-                        with cols[c_i]:
-                            st.markdown(f"""
-                                <div class="match-card">
-                                    <div class="match-title">Cancha {match['cancha']}</div>
-                                    <div class="team-name">{p1_equipo_str}</div>
-                                    <div class="vs">VS</div>
-                                    <div class="team-name">{p2_equipo_str}</div>
-                                </div>
-                            """, unsafe_allow_html=True)
-                            
-                            # --- Input de Resultados a nivel de EQUIPO ---
-                            # Las keys y los strings de referencia usan el nombre completo de la pareja.
-                            k1 = f"{p1_equipo_str}_vs_{p2_equipo_str}_p1"
-                            k2 = f"{p1_equipo_str}_vs_{p2_equipo_str}_p2"
-                            
-                            # Recuperar resultados usando los nombres de los equipos
-                            saved_s1, saved_s2 = st.session_state.resultados.get((p1_equipo_str, p2_equipo_str), (0, 0))
-
-                            colA, colB = st.columns(2)
-                            with colA:
-                                # Etiqueta de input con el nombre del equipo
-                                st.number_input(
-                                    f"Puntos {p1_equipo_str}", 
-                                    key=k1, 
-                                    min_value=0,
-                                    max_value=puntos_partido, 
-                                    value=saved_s1,
-                                    on_change=actualizar_resultado,
-                                    kwargs={"p1_str": p1_equipo_str, "p2_str": p2_equipo_str, "k1": k1, "k2": k2}
-                                )
-                            with colB:
-                                # Etiqueta de input con el nombre del equipo
-                                st.number_input(
-                                    f"Puntos {p2_equipo_str}", 
-                                    key=k2, 
-                                    min_value=0,
-                                    max_value=puntos_partido, 
-                                    value=saved_s2,
-                                    on_change=actualizar_resultado,
-                                    kwargs={"p1_str": p1_equipo_str, "p2_str": p2_equipo_str, "k1": k1, "k2": k2})
-
-                # Mostrar parejas que descansan
-                parejas_descansando = ronda['descansan'] # Directamente del diccionario
-                if parejas_descansando:
-                    st.info(f"Descansan en Ronda {i}: {', '.join(parejas_descansando)}")
+            carga_tabla = st.toggle("Carga rápida en tabla", key="carga_tabla")
+            with span("render.rondas"):
+                for i, ronda in rondas_a_mostrar(st.session_state.fixture, st.session_state.resultados):
+                    if carga_tabla:
+                        st.subheader(f"Ronda {i}")
+                        tabla_ronda(ronda, puntos_partido)
+                    else:
+                        render_ronda_parejas(i, ronda, puntos_partido)
             # --- Ranking Final ---            
             if st.button("¿Cómo va el ranking? 👀", key="ranking_parejas",use_container_width=True):
-                ranking = calcular_ranking_parejas(st.session_state.parejas, st.session_state.resultados)
-                st.session_state.ranking = ranking
+                ranking = st.session_state.ledger.to_dataframe()
                 display_ranking_table(ranking,config=CLUB_THEME,ranking_type="parejas")
 
 
     elif mod_parejas == "Todos Contra Todos":
-        def generar_torneo_todos_contra_todos(jugadores, num_canchas, seed=None):
-            if seed:
-                random.seed(seed)
-            # stats es helpers en v3
-            tournament = CompleteAmericanoTournament(st.session_state.players, num_canchas)
-            schedule, stats = tournament.generate_tournament()
-            return tournament.format_for_streamlit(schedule, stats)
-        
         st.markdown('<div class="main-title"> Torneo Americano</div>', unsafe_allow_html=True)
 
         
         # AUTO-GENERATE fixture on first load (igual que en sets)
         jugadores = st.session_state.players
-        tournament_key = f"todos_contra_todos_{len(jugadores)}_{num_canchas}_{puntos_partido}"
+        tournament_key = fixture_key(TODOS_CONTRA_TODOS, jugadores, num_canchas, semilla_sorteo())
         
         if 'tournament_key' not in st.session_state or st.session_state.tournament_key != tournament_key:
             with st.spinner("Generando fixture optimizado..."):
-                out = generar_torneo_todos_contra_todos(jugadores, num_canchas, seed=42)
+                _, out = generar_fixture(TODOS_CONTRA_TODOS, jugadores, num_canchas, semilla_sorteo())
                 st.session_state.code_play = "AllvsAll"
-                st.session_state.fixture = out["rondas"]
+                st.session_state.fixture = out["fixture"]
                 st.session_state.out = out
-                st.session_state.resultados = {}
+                st.session_state.resultados = ResultsStore(st.session_state.fixture)
+                st.session_state.ledger = StandingsLedger(st.session_state.resultados)
                 st.session_state.tournament_key = tournament_key
+                publicar_torneo()
 
 
         # Visualización especial para Todos Contra Todos
         if st.session_state.code_play == "AllvsAll":
-            apply_custom_css_torneo(CLUB_THEME)
-
-            for ronda_data in st.session_state.fixture:
-                st.subheader(f"Ronda {ronda_data['ronda']}")
-                cols = st.columns(len(ronda_data["partidos"]))
-
-                for c_i, partido in enumerate(ronda_data["partidos"]):
-                    ayudantes = partido.get("ayudantes", []) or []
-                    # aplicar ícono a los nombres que son ayudantes
-                    p1_render = [render_nombre(j, ayudantes) for j in partido["pareja1"]]
-                    p2_render = [render_nombre(j, ayudantes) for j in partido["pareja2"]]
-
-                    pareja1 = " & ".join(p1_render)
-                    pareja2 = " & ".join(p2_render)
-                    if ayudantes:
-                        lista_ayudantes = ", ".join([render_nombre(a, ayudantes) for a in ayudantes])
-                        ayud_text = f"<div style='font-size:14px;color:#6C13BF;margin-top:5px;'>Ayudantes: {lista_ayudantes}</div>"
+            with span("render.css"):
+                apply_custom_css_torneo(CLUB_THEME)
+
+            carga_tabla = st.toggle("Carga rápida en tabla", key="carga_tabla")
+            with span("render.rondas"):
+                for _, ronda_data in rondas_a_mostrar(st.session_state.fixture, st.session_state.resultados):
+                    if carga_tabla:
+                        st.subheader(f"Ronda {ronda_data.ronda}")
+                        tabla_ronda(ronda_data, puntos_partido)
                     else:
-                        ayud_text = ""
-
-                    cancha = partido["cancha"]
-
-                    with cols[c_i]:
-                        st.markdown(f"""
-                            <div class="match-card">
-                                <div class="match-title">Cancha {cancha}</div>
-                                <div class="team-name">{pareja1}</div>
-                                <div class="vs">VS</div>
-                                <div class="team-name">{pareja2}</div>
-                                {ayud_text}
-                            </div>
-                        """, unsafe_allow_html=True)
-
-                        # --- keys seguras basadas en nombres reales ---
-                        raw_p1 = "_".join(partido["pareja1"])
-                        raw_p2 = "_".join(partido["pareja2"])
-
-                        key_p1 = f"score_r{ronda_data['ronda']}_m{c_i}_{raw_p1}_p1"
-                        key_p2 = f"score_r{ronda_data['ronda']}_m{c_i}_{raw_p2}_p2"
-
-                        # --- CAMBIO: Recuperar valores guardados si existen ---
-                        pareja1_str = " & ".join(partido["pareja1"])
-                        pareja2_str = " & ".join(partido["pareja2"])
-                        # Buscamos si ya hay un resultado guardado para este partido
-                        saved_s1, saved_s2 = st.session_state.resultados.get((pareja1_str, pareja2_str), (0, 0))
-
-                        colA, colB = st.columns(2)
-                        with colA:
-                            st.number_input(
-                                f"Puntos {pareja1}", 
-                                key=key_p1, 
-                                min_value=0,
-                                max_value=puntos_partido, 
-                                value=saved_s1,
-                                on_change=actualizar_resultado,
-                                kwargs={"p1_str": pareja1_str, "p2_str": pareja2_str, "k1": key_p1, "k2": key_p2}
-                            )
-                        with colB:
-                            st.number_input(
-                                f"Puntos {pareja2}", 
-                                key=key_p2, 
-                                min_value=0,
-                                max_value=puntos_partido, 
-                                value=saved_s2,
-                                on_change=actualizar_resultado,
-                                kwargs={"p1_str": pareja1_str, "p2_str": pareja2_str, "k1": key_p1, "k2": key_p2}
-                            )
-
-                if ronda_data["descansan"]:
-                    st.info(f"Descansan: {', '.join(ronda_data['descansan'])}")
-            
-            has_helpers = any(
-                any(partido.get("ayudantes", []) for partido in ronda["partidos"])
-                for ronda in st.session_state.fixture
-            )
-            
-            if has_helpers:
+                        render_ronda_individual(ronda_data, puntos_partido)
+
+            if st.session_state.fixture.has_helpers:
                 st.info(
                     f"🛟 **Ayudantes:** Algunos jugadores ya completaron sus {st.session_state.out['stats']['minimum_games']} "
                     "partidos mínimos y juegan como 'ayudantes' (marcados con 🛟). "
@@ -239,37 +235,43 @@ def app():
                 st.markdown("### Resumen de participación")
                 st.dataframe(st.session_state.out["resumen"])
             
-            #with st.expander("📊 Ver Análisis de Calidad (Parejas y Oponentes)"):
-            #    st.info("Este análisis permite verificar que todos jueguen con todos y contra todos.")
-            #   # Obtenemos los datos necesarios
-            #    fixture_actual = st.session_state.fixture
-            #    todos_jugadores = st.session_state.players
-                
+            # El panel de análisis carga los gráficos (y sus librerías) solo al activarlo
+            if st.toggle("📊 Ver Análisis de Calidad (Parejas y Oponentes)", key="ver_analisis"):
+                from assets.analyze_funcs import build_matrices, plot_heatmap, analyze_descansos
+                st.info("Este análisis permite verificar que todos jueguen con todos y contra todos.")
+                # Obtenemos los datos necesarios
+                fixture_actual = st.session_state.fixture
+                todos_jugadores = st.session_state.players
+
                 # Ejecutamos las visualizaciones
-            #    col_a, col_b = st.columns(2)
-                
+                col_a, col_b = st.columns(2)
+
                 # 1. Matrices de Calor (Parejas y Enfrentamientos)
-            #    m_parejas, m_enfrentamientos = build_matrices(fixture_actual, todos_jugadores)
-                
-            #    with col_a:
-            #        st.write("**¿Con quién jugaste? (Parejas)**")
-            #        plot_heatmap(m_parejas, "Distribución de Parejas", "PuBuGn", "Veces juntos")
-                
-            #    with col_b:
-            #        st.write("**¿Contra quién jugaste? (Rivales)**")
-            #        plot_heatmap(m_enfrentamientos, "Distribución de Oponentes", "OrRd", "Veces en contra")
-                
+                m_parejas, m_enfrentamientos = build_matrices(fixture_actual, todos_jugadores)
+
+                with col_a:
+                    st.write("**¿Con quién jugaste? (Parejas)**")
+                    plot_heatmap(m_parejas, "Distribución de Parejas", "PuBuGn", "Veces juntos")
+
+                with col_b:
+                    st.write("**¿Contra quién jugaste? (Rivales)**")
+                    plot_heatmap(m_enfrentamientos, "Distribución de Oponentes", "OrRd", "Veces en contra")
+
                 # 2. Análisis de descansos
-            #    st.write("---")
-            #    st.write("**Análisis de Descansos**")
-            #    analyze_descansos(fixture_actual, todos_jugadores)
-            
+                st.write("---")
+                st.write("**Análisis de Descansos**")
+                analyze_descansos(fixture_actual, todos_jugadores)
+
             # --- Ranking Final ---
             if st.button("¿Cómo va el ranking? 👀",use_container_width=True):
-                ranking = calcular_ranking_individual(st.session_state.resultados, st.session_state.fixture)
-                st.session_state.ranking = ranking
+                ranking = st.session_state.ledger.to_dataframe()
                 display_ranking_table(ranking,config=CLUB_THEME,ranking_type="individual")
             
+    with span("render.herramientas"):
+        mi_horario(st.session_state.resultados)
+        mostrar_codigo()
+        botones_exportar()
+        vigilar_cambios()
     st.markdown("<br>", unsafe_allow_html=True) # Espacio sutil
     # --- Navegación inferior ---
     col1, col2 = st.columns(2)
@@ -278,18 +280,18 @@ def app():
             # Limpiar datos del torneo al volver
             if 'tournament_key' in st.session_state:
                 del st.session_state.tournament_key
+            # Un torneo nuevo sortea otro fixture
+            st.session_state.pop("semilla", None)
             if 'fixture' in st.session_state:
                 del st.session_state.fixture
             if 'resultados' in st.session_state:
                 del st.session_state.resultados
+            if 'ledger' in st.session_state:
+                del st.session_state.ledger
+            st.session_state.pop("revision_compartida", None)
             st.session_state.page = "players_setup"
             st.rerun()
     with col2:
         if st.button("Ver Resultados Finales 🏆",use_container_width=True):
-            if mod_parejas == "Parejas Fijas":
-                ranking = calcular_ranking_parejas(st.session_state.parejas, st.session_state.resultados)
-            elif mod_parejas == "Todos Contra Todos":
-                ranking = calcular_ranking_individual(st.session_state.resultados,st.session_state.fixture)
-            st.session_state.ranking = ranking
             st.session_state.page = "z_ranking"
             st.rerun()
\ No newline at end of file
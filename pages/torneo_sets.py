@@ -1,6 +1,13 @@
 import streamlit as st
-from assets.helper_funcs import generar_fixture_parejas
-from models.sets.All_pairs_sets import calcular_ranking_parejas_sets
+from assets.match_cards import tarjetas_html
+from assets.fixture_cache import generar_fixture, fixture_key, semilla_sorteo, SETS
+from assets.helper_funcs import registrar_resultado, rondas_a_mostrar, tabla_ronda
+from assets.exportar import botones_exportar
+from assets.mi_horario import mi_horario
+from assets.torneo_compartido import publicar_torneo, sincronizar, mostrar_codigo, vigilar_cambios
+from models.profiling import span
+from models.results import ResultsStore
+from models.ledger import StandingsLedger, MODO_SETS
 from assets.styles import apply_custom_css_torneo_sets, CLUB_THEME
 
 def app():
@@ -15,8 +22,6 @@ def app():
     # 1. 📌 FIX DE SEGURIDAD Y PREPARACIÓN DE VARIABLES
     # Garantiza que estas variables existan antes de ser usadas por el resto del script
     if 'parejas' not in st.session_state: st.session_state.parejas = st.session_state.players
-    if 'resultados' not in st.session_state: st.session_state.resultados = {}
-    if 'fixture' not in st.session_state: st.session_state.fixture = []
     if 'show_final' not in st.session_state: st.session_state.show_final = False
     if 'show_ranking' not in st.session_state: st.session_state.show_ranking = False # NUEVO ESTADO PARA EL RANKING
     if 'final_match_scores' not in st.session_state: st.session_state.final_match_scores = (0, 0)
@@ -24,11 +29,12 @@ def app():
     parejas = st.session_state.parejas
     
     # 2. 🔄 FUNCIÓN CALLBACK: Actualiza el diccionario 'resultados' (Fase de Grupos)
-    def actualizar_resultado_sets(p1, p2, k1, k2):
-        """Lee los valores de los number_input (usando sus keys) y actualiza el diccionario maestro."""
+    def actualizar_resultado_sets(match_id, k1, k2):
+        """Lee los valores de los number_input (usando sus keys) y actualiza el store de resultados."""
         val1 = st.session_state.get(k1, 0)
         val2 = st.session_state.get(k2, 0)
-        st.session_state.resultados[(p1, p2)] = (val1, val2)
+        # Store compartido + resultados + diferencia en la tabla de posiciones
+        registrar_resultado(match_id, val1, val2)
         
     # 3. 🏆 FUNCIÓN CALLBACK: Actualiza el resultado de la Final
     def actualizar_final_score(k1, k2):
@@ -38,68 +44,71 @@ def app():
         st.session_state.final_match_scores = (val1, val2)
     
     # Generación de fixture
-    tournament_key = f"parejas_fijas_{len(parejas)}_{num_canchas}_{num_sets}_sets"
+    tournament_key = fixture_key(SETS, parejas, num_canchas, semilla_sorteo())
     if 'tournament_key' not in st.session_state or st.session_state.tournament_key != tournament_key:
         with st.spinner("Generando fixture optimizado..."):
-            st.session_state.fixture = generar_fixture_parejas(parejas,num_canchas)
-            st.session_state.resultados = {}
+            _, out = generar_fixture(SETS, parejas, num_canchas, semilla_sorteo())
+            st.session_state.fixture = out["fixture"]
+            st.session_state.resultados = ResultsStore(st.session_state.fixture)
+            st.session_state.ledger = StandingsLedger(st.session_state.resultados, MODO_SETS)
             st.session_state.parejas = parejas
             st.session_state.tournament_key = tournament_key
+            publicar_torneo()
+    # Resultados cargados desde otros dispositivos desde el último rerun
+    sincronizar()
             
     # --- Estilos CSS (Se mantienen sin cambios) ---
-    apply_custom_css_torneo_sets(CLUB_THEME)
+    with span("render.css"):
+        apply_custom_css_torneo_sets(CLUB_THEME)
     
     # ----------------------------------------------------------------------
     # FASE DE GRUPOS (FIXTURE)
     # ----------------------------------------------------------------------
-    for i, ronda in enumerate(st.session_state.fixture, start=1):
-        st.subheader(f"Ronda {i}")
-        cols = st.columns(len(ronda))
+    carga_tabla = st.toggle("Carga rápida en tabla", key="carga_tabla")
+    with span("render.rondas"):
+        for i, ronda in rondas_a_mostrar(st.session_state.fixture, st.session_state.resultados):
+            st.subheader(f"Ronda {i}")
+            if carga_tabla:
+                tabla_ronda(ronda, unidad="Sets")
+                continue
+            # Todas las tarjetas de la ronda en un solo bloque HTML
+            st.markdown(tarjetas_html(ronda.partidos, st.session_state.resultados), unsafe_allow_html=True)
+            cols = st.columns(len(ronda.partidos))
 
-        for c_i, match in enumerate(ronda):
-            p1, p2 = match
-            with cols[c_i]:
-                st.markdown(f"""
-                    <div class="match-card">
-                        <div class="match-title">Cancha {c_i+1}</div>
-                        <div class="team-name">{p1}</div>
-                        <div class="vs">VS</div>
-                        <div class="team-name">{p2}</div>
-                    </div>
-                """, unsafe_allow_html=True)
-
-                colA, colB = st.columns(2)
+            for c_i, match in enumerate(ronda.partidos):
+                p1, p2 = match.etiqueta1, match.etiqueta2
+                with cols[c_i]:
+                    colA, colB = st.columns(2)
                 
-                # Keys
-                match_key = f"{p1}_{p2}_ronda_{i}_cancha_{c_i}"
-                score1_key = f"{match_key}_p1"
-                score2_key = f"{match_key}_p2"
+                    # Keys
+                    score1_key = f"score_{match.id}_p1"
+                    score2_key = f"score_{match.id}_p2"
                 
-                # Recuperar valor guardado o 0
-                # st.session_state.resultados usa tuplas inmutables como clave
-                saved_s1, saved_s2 = st.session_state.resultados.get(tuple(sorted((p1, p2))), (0, 0))
+                    # Recuperar valor guardado o 0
+                    # st.session_state.resultados usa el id del partido como clave
+                    saved_s1, saved_s2 = st.session_state.resultados.get(match.id)
 
 
-                with colA:
-                    st.number_input(
-                        f"Sets {p1}", 
-                        key=score1_key, 
-                        min_value=0, 
-                        value=saved_s1, # Usa el valor guardado
-                        label_visibility="collapsed",
-                        on_change=actualizar_resultado_sets, # ✅ CALLBACK GRUPOS P1
-                        kwargs={"p1": p1, "p2": p2, "k1": score1_key, "k2": score2_key}
-                    )
-                with colB:
-                    st.number_input(
-                        f"Sets {p2}", 
-                        key=score2_key, 
-                        min_value=0, 
-                        value=saved_s2, # Usa el valor guardado
-                        label_visibility="collapsed",
-                        on_change=actualizar_resultado_sets, # ✅ CALLBACK GRUPOS P2
-                        kwargs={"p1": p1, "p2": p2, "k1": score1_key, "k2": score2_key}
-                    )
+                    with colA:
+                        st.number_input(
+                            f"Sets {p1}", 
+                            key=score1_key, 
+                            min_value=0, 
+                            value=saved_s1, # Usa el valor guardado
+                            label_visibility="collapsed",
+                            on_change=actualizar_resultado_sets, # ✅ CALLBACK GRUPOS P1
+                            kwargs={"match_id": match.id, "k1": score1_key, "k2": score2_key}
+                        )
+                    with colB:
+                        st.number_input(
+                            f"Sets {p2}", 
+                            key=score2_key, 
+                            min_value=0, 
+                            value=saved_s2, # Usa el valor guardado
+                            label_visibility="collapsed",
+                            on_change=actualizar_resultado_sets, # ✅ CALLBACK GRUPOS P2
+                            kwargs={"match_id": match.id, "k1": score1_key, "k2": score2_key}
+                        )
 
     # ----------------------------------------------------------------------
     # BOTONES DE RANKING Y FINAL (EN COLUMNAS)
@@ -115,13 +124,9 @@ def app():
             
     with colX:
         # Lógica para botón de la Final
-        df_ranking_temp = None
-        try:
-            df_ranking_temp = calcular_ranking_parejas_sets(parejas, st.session_state.resultados)
-        except Exception:
-            pass # Si hay error, df_ranking_temp será None
+        hay_finalistas = len(st.session_state.fixture.participantes) >= 2
 
-        if df_ranking_temp is not None and len(df_ranking_temp) >= 2 and not st.session_state.show_final:
+        if hay_finalistas and not st.session_state.show_final:
             if st.button("🎉 Mostrar Gran Final 🎉", use_container_width=True):
                 st.session_state.show_final = True
                 st.rerun() # Disparar un nuevo renderizado para mostrar la final
@@ -132,10 +137,10 @@ def app():
     if st.session_state.show_ranking:
         st.markdown("<hr style='border: 1px solid #ddd; margin: 30px 0;'>", unsafe_allow_html=True)
         st.header('📊 Clasificación Actual')
-        st.info(f"Regla: 1 Punto por partido ganado. Desempate por Diferencia de Sets (SG - SP).")
+        st.info(f"Regla: 1 Punto por partido ganado. Desempate por Diferencia de Sets (SG - SP), Sets Ganados y enfrentamiento directo.")
         
         try:
-            df_ranking = calcular_ranking_parejas_sets(parejas, st.session_state.resultados)
+            df_ranking = st.session_state.ledger.to_dataframe()
             
             col_config = {
                 'Pareja': st.column_config.TextColumn("Pareja"), # Asegura que la columna Pareja sea TextColumn
@@ -161,17 +166,14 @@ def app():
     # FASE FINALES: Gran Final (Top 2)
     # ----------------------------------------------------------------------
     
-    # 1. Calcular el ranking de la fase de grupos para obtener los 2 finalistas
-    df_ranking_final = None
-    try:
-        df_ranking_final = calcular_ranking_parejas_sets(parejas, st.session_state.resultados)
-    except Exception:
-        df_ranking_final = None # Se mantiene la lógica de error
+    # 1. Los 2 finalistas salen de la tabla de posiciones (con desempates completos)
+    finalists = []
+    if st.session_state.show_final:
+        finalists = st.session_state.ledger.to_dataframe().head(2)['Pareja'].tolist()
 
     # Lógica de renderizado de la final
-    if st.session_state.show_final and df_ranking_final is not None and len(df_ranking_final) >= 2:
+    if st.session_state.show_final and len(finalists) >= 2:
         
-        finalists = df_ranking_final.head(2)['Pareja'].tolist()
         final_p1 = finalists[0]
         final_p2 = finalists[1]
         
@@ -247,6 +249,11 @@ def app():
     # NAVEGACIÓN
     # ----------------------------------------------------------------------
     
+    with span("render.herramientas"):
+        mi_horario(st.session_state.resultados)
+        mostrar_codigo()
+        botones_exportar("Sets")
+        vigilar_cambios()
     col1, col2, col3 = st.columns([1, 2, 1])
     
     with col1:
@@ -254,10 +261,15 @@ def app():
             # Limpiar datos del torneo al volver
             if 'tournament_key' in st.session_state:
                 del st.session_state.tournament_key
+            # Un torneo nuevo sortea otro fixture
+            st.session_state.pop("semilla", None)
             if 'fixture' in st.session_state:
                 del st.session_state.fixture
             if 'resultados' in st.session_state:
                 del st.session_state.resultados
+            if 'ledger' in st.session_state:
+                del st.session_state.ledger
+            st.session_state.pop("revision_compartida", None)
             if 'show_final' in st.session_state:
                 del st.session_state.show_final
             if 'final_match_scores' in st.session_state:
@@ -272,10 +284,9 @@ def app():
         if st.button("🏆 Ver Resultados Finales", use_container_width=True):
             try:
                 # Calculate final ranking (based on group stage)
-                df_ranking = calcular_ranking_parejas_sets(parejas, st.session_state.resultados)
+                df_ranking = st.session_state.ledger.to_dataframe()
                 
                 if df_ranking is not None and not df_ranking.empty:
-                    st.session_state.ranking = df_ranking
                     st.session_state.page = "z_ranking"
                     st.rerun()
                 else:
@@ -1,13 +1,17 @@
 import streamlit as st
 import pandas as pd
+from assets.auth import es_admin
+from assets.ranking_club import get_rating_store
 from assets.show_rankings import define_ranking_items
+from assets.torneo_compartido import cerrar_torneo
+from models.fixture import MODO_INDIVIDUAL, MODO_PAREJAS
+from models.ratings import filas_desde_resultados
 
 
 def app():
     
-    rank = st.session_state.ranking
-    # Convert to DataFrame
-    df = rank.copy()
+    # El ranking se arma desde el ledger al mostrarlo (no se guarda en la sesión)
+    df = st.session_state.ledger.to_dataframe()
     # Display header
 
     # --- Estilos Podio ---
@@ -15,6 +19,37 @@ def app():
     define_ranking_items(df,col1,col2,col3)
     
 
+    with st.expander("Ranking del Club (Elo)"):
+        resultados = st.session_state.get("resultados")
+        # Las parejas fijas tienen su propia escala: no se mezclan con los jugadores
+        modo = resultados.fixture.modo if resultados is not None else MODO_INDIVIDUAL
+        store = get_rating_store(modo)
+        if resultados is not None and len(resultados) > 0:
+            guardado = store.has_event(resultados.torneo_id)
+            etiqueta = "Actualizar en Ranking del Club" if guardado else "Guardar en Ranking del Club"
+            if st.button(etiqueta):
+                # Ratings de la lista importada: Elo inicial de quienes todavía no jugaron en el club
+                importados = st.session_state.get("ratings_importados", {})
+                participantes = set(resultados.fixture.participantes)
+                store.seed({p: r for p, r in importados.items() if p in participantes})
+                deltas = store.apply_event(resultados.torneo_id, filas_desde_resultados(resultados))
+                if modo == MODO_PAREJAS:
+                    # Torneos de parejas guardados antes en la escala individual
+                    get_rating_store(MODO_INDIVIDUAL).remove_event(resultados.torneo_id)
+                st.success(f"Ratings actualizados para {len(deltas)} participantes.")
+        if es_admin() and st.button("Recalcular ratings desde el historial", key="recalcular_ratings"):
+            eventos = store.recompute()
+            st.success(f"Ratings recalculados a partir de {eventos} torneos guardados.")
+        ladder = store.ladder()
+        if ladder:
+            columna = "Pareja" if modo == MODO_PAREJAS else "Jugador"
+            df_club = pd.DataFrame(ladder, columns=[columna, "Rating", "Partidos"])
+            df_club["Rating"] = df_club["Rating"].round(0).astype(int)
+            df_club.index = df_club.index + 1
+            st.dataframe(df_club, use_container_width=True)
+        else:
+            st.info("Todavía no hay torneos guardados en el ranking del club.")
+
     col1, col2, col3, col4 = st.columns([1, 1, 1, 1])
     with col1:
         if st.button("Volver"):
@@ -27,6 +62,7 @@ def app():
             st.rerun()
     with col4:
         if st.button("Empezar Nuevo Torneo"):
+            cerrar_torneo()
             for key in list(st.session_state.keys()):
                 del st.session_state[key]
             st.session_state.page = "home"
@@ -1,9 +1,12 @@
 import streamlit as st
-import os,importlib
 from assets.sidebar import sidebar_style
 from assets.auth import check_login
 from assets.styles import apply_custom_css_main, CLUB_THEME
 from assets.helper_funcs import initialize_vars
+from assets.torneo_compartido import unirse_torneo, ofrecer_retomar
+from assets.paginas import HOME, PAGINAS, cargar_pagina, precargar_torneo
+from assets.panel_profiling import panel_profiling
+from models.profiling import span
 st.set_page_config(page_title=" Padel App",page_icon=":tennis:", layout="wide")
 
 hide_streamlit_style = """
@@ -14,21 +17,30 @@ hide_streamlit_style = """
     </style>
 """
 st.markdown(hide_streamlit_style, unsafe_allow_html=True)
+
+# Marcador público de solo lectura (?marcador=<código>): sin login ni sesión de torneo
+if "marcador" in st.query_params:
+    from assets.marcador import mostrar_marcador
+    mostrar_marcador(st.query_params["marcador"])
+    st.stop()
+
 if not check_login():
     st.stop()
 
-# Cargar la lista de páginas desde la carpeta "pages"
-pages_list = ["home"] + [f.replace(".py", "") for f in os.listdir("pages") if f.endswith(".py")]
-if "page" not in st.session_state:
+# Las páginas del torneo se importan en segundo plano mientras se configura
+precargar_torneo()
+if "page" not in st.session_state or (st.session_state.page != HOME and st.session_state.page not in PAGINAS):
     st.session_state.page = "home"  # Start with the homepage    
 
 def load_page(page_name):
-    if page_name == "home":
+    if page_name == HOME:
 
         apply_custom_css_main(CLUB_THEME)
 
         # Título centrado
         st.markdown('<div class="main-title">🏆 Total Zone Padel App</div>', unsafe_allow_html=True)
+        # Torneos que quedaron sin terminar (refresh, reinicio del servidor o "Volver y Reiniciar")
+        ofrecer_retomar()
 
         c1,c2 = st.columns(2)
         mixto = False
@@ -45,6 +57,9 @@ def load_page(page_name):
                 else:
                     mixto = False
         with c2:
+            # Cantidad que dejó la importación de jugadores (se aplica antes de crear el input)
+            if "select_players_pendiente" in st.session_state:
+                st.session_state.select_players = st.session_state.pop("select_players_pendiente")
             num_players = st.number_input("Número de jugadores",
                                           key="select_players",step=1,min_value=8)
             st.session_state.num_players = num_players
@@ -94,13 +109,23 @@ def load_page(page_name):
                 else:
                     st.session_state.page = "players_setup"
                     st.rerun()
+
+        # Otro dispositivo (por ejemplo un segundo árbitro) entra al mismo torneo
+        with st.expander("📲 Unirse a un torneo en curso"):
+            codigo = st.text_input("Código del torneo", value=st.query_params.get("torneo", ""), key="codigo_torneo")
+            if st.button("Unirse", key="unirse_torneo", use_container_width=True):
+                if unirse_torneo(codigo.strip()):
+                    st.rerun()
+                else:
+                    st.error("No se encontró un torneo con ese código.")
             
     
         
     else:
-        module = importlib.import_module(f"pages.{page_name}")
-        module.app()
+        cargar_pagina(page_name).app()
 current_page = st.session_state.page
-load_page(current_page)
+with span(f"pagina.{current_page}"):
+    load_page(current_page)
+panel_profiling()
 
 sidebar_style()
\ No newline at end of file
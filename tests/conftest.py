@@ -0,0 +1,5 @@
+import sys
+from pathlib import Path
+
+# Los módulos de la app se importan como en streamlit_app.py (assets.x, models.x)
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
@@ -0,0 +1,44 @@
+"""Importación de jugadores: parser de la lista/CSV y armado de parejas fijas."""
+from assets.importar_jugadores import JugadorImportado, armar_parejas, parsear_jugadores
+
+
+def test_parsea_csv_con_encabezado_alias_y_duplicados():
+    texto = ("jugador;sexo;elo;partner\n"
+             "  Ana   María ;M;1520,5;Beto\n"
+             "Beto;H;1480;Ana María\n"
+             "josé;h;;\n"
+             "Jose;H;;\n"
+             "Carla;X;abc;\n")
+    jugadores, avisos = parsear_jugadores(texto)
+
+    assert [j.nombre for j in jugadores] == ["Ana María", "Beto", "josé", "Carla"]
+    assert jugadores[0] == JugadorImportado("Ana María", "M", 1520.5, "Beto")
+    assert jugadores[3].genero is None and jugadores[3].rating is None
+    assert len(avisos) == 3
+
+
+def test_lista_simple_sin_encabezado():
+    jugadores, avisos = parsear_jugadores("Ana\n\nBeto,,,Ana\nCarla-Dani\n")
+    assert [(j.nombre, j.pareja) for j in jugadores] == [("Ana", None), ("Beto", "Ana"), ("Carla-Dani", None)]
+    assert avisos == []
+
+
+def test_companero_nombrado_despues_no_queda_en_dos_parejas():
+    jugadores = [JugadorImportado("Ana"), JugadorImportado("Carla"),
+                 JugadorImportado("Beto", pareja="Ana"), JugadorImportado("Dani")]
+    parejas, avisos = armar_parejas(jugadores)
+
+    assert parejas == ["Beto-Ana", "Carla-Dani"]
+    assert avisos == []
+
+
+def test_etiquetas_de_equipo_y_sueltos():
+    jugadores = [JugadorImportado("Ana", pareja="eq1"), JugadorImportado("Beto"),
+                 JugadorImportado("Carla", pareja="EQ1"), JugadorImportado("Dani"),
+                 JugadorImportado("Eli")]
+    parejas, avisos = armar_parejas(jugadores)
+
+    assert parejas == ["Ana-Carla", "Beto-Dani"]
+    assert avisos == ["'Eli' quedó sin pareja."]
+    nombres = [n for p in parejas for n in p.split("-")]
+    assert len(nombres) == len(set(nombres))
@@ -0,0 +1,84 @@
+"""Navegador de rondas: el avance automático espera a que cada partido tenga resultado final."""
+from pathlib import Path
+
+import pytest
+import streamlit as st
+from streamlit.testing.v1 import AppTest
+
+RAIZ = Path(__file__).resolve().parents[1]
+APP = str(RAIZ / "streamlit_app.py")
+JUGADORES = [f"J{i}" for i in range(8)]
+PAREJAS = [f"A{i}-B{i}" for i in range(6)]
+
+
+@pytest.fixture(autouse=True)
+def directorio_temporal(tmp_path, monkeypatch):
+    # El store compartido, los diarios y los ratings escriben en data/ (ruta relativa):
+    # cada test usa su propio directorio y un store nuevo, no el árbol del repo.
+    # Las imágenes también se abren con rutas relativas, así que assets/ se enlaza.
+    (tmp_path / "assets").symlink_to(RAIZ / "assets")
+    monkeypatch.chdir(tmp_path)
+    st.cache_resource.clear()
+    yield
+    st.cache_resource.clear()
+
+
+def _abrir(pagina, **estado):
+    at = AppTest.from_file(APP, default_timeout=60)
+    at.secrets["auth"] = {"users": {}}
+    at.session_state["authenticated"] = True
+    at.session_state["page"] = pagina
+    at.session_state["num_fields"] = 2
+    for clave, valor in estado.items():
+        at.session_state[clave] = valor
+    at.run()
+    assert not at.exception
+    return at
+
+
+def _torneo():
+    return _abrir("torneo", num_pts=16, mod="Todos Contra Todos", mixto_op="Aleatorio", players=JUGADORES)
+
+
+def _input(at, match_id, lado):
+    return next(n for n in at.number_input if n.key == f"score_{match_id}_{lado}")
+
+
+def test_un_solo_lado_no_avanza_la_ronda():
+    at = _torneo()
+    ronda = at.session_state["fixture"].rondas[0]
+    for match in ronda.partidos:
+        _input(at, match.id, "p1").set_value(9).run()
+
+    assert at.session_state["ronda_actual"] == 0
+    # El otro lado sigue en pantalla para cargarlo
+    for match in ronda.partidos:
+        assert _input(at, match.id, "p2").value == 0
+
+
+def test_ambos_lados_avanzan_la_ronda():
+    at = _torneo()
+    ronda = at.session_state["fixture"].rondas[0]
+    for match in ronda.partidos:
+        _input(at, match.id, "p1").set_value(9).run()
+        if match is not ronda.partidos[-1]:
+            _input(at, match.id, "p2").set_value(7).run()
+            assert at.session_state["ronda_actual"] == 0
+
+    _input(at, ronda.partidos[-1].id, "p2").set_value(7).run()
+    assert at.session_state["ronda_actual"] == 1
+
+
+def test_sets_sin_games_en_contra_avanzan_la_ronda():
+    at = _abrir("torneo_sets", num_sets=2, mod="Parejas Fijas", players=PAREJAS)
+    ronda = at.session_state["fixture"].rondas[0]
+    for match in ronda.partidos[:-1]:
+        _input(at, match.id, "p1").set_value(2).run()
+        assert at.session_state["ronda_actual"] == 0
+
+    # 1-0 todavía no llega a los sets del partido
+    ultimo = ronda.partidos[-1]
+    _input(at, ultimo.id, "p1").set_value(1).run()
+    assert at.session_state["ronda_actual"] == 0
+    _input(at, ultimo.id, "p1").set_value(2).run()
+    assert at.session_state["ronda_actual"] == 1